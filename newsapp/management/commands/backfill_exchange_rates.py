@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from datetime import date, datetime, timedelta
+import asyncio
+
+from newsapp.utils.exchanger_utils import (
+    BACKFILL_CONCURRENCY, backfill_exchange_rates
+)
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD command line date."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    """
+    Fill the exchange rate history from the PrivatBank archive.
+
+    Days that already have stored rates, or are known to have none, are
+    skipped, so the command can be re-run or scheduled safely.
+
+    Usage:
+        python manage.py backfill_exchange_rates --days 365
+        python manage.py backfill_exchange_rates --start 2024-01-01 \\
+            --end 2024-06-30 --concurrency 2
+    """
+
+    help = 'Backfill the exchange rate history from the PrivatBank archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start', type=parse_date,
+            help='First day to backfill (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--end', type=parse_date,
+            help='Last day to backfill (YYYY-MM-DD), defaults to today.'
+        )
+        parser.add_argument(
+            '--days', type=int, default=30,
+            help='Number of days up to --end, used without --start.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=BACKFILL_CONCURRENCY,
+            help='Maximum number of concurrent archive requests.'
+        )
+
+    def handle(self, *args, **options):
+        end = options['end'] or date.today()
+        start = options['start'] or end - timedelta(days=options['days'] - 1)
+        if start > end:
+            raise CommandError('The start date is after the end date.')
+        if options['concurrency'] < 1:
+            raise CommandError('The concurrency must be at least 1.')
+
+        stored, gaps, failed = asyncio.run(
+            backfill_exchange_rates(start, end, options['concurrency'])
+        )
+        self.stdout.write(
+            f"Stored rates for {stored} days from {start} to {end}, "
+            f"{gaps} days have no rates, {failed} days failed."
+        )
@@ -0,0 +1,174 @@
+from django.core.management.base import BaseCommand
+
+from datetime import datetime, timedelta
+import copy
+import time
+
+from newsapp.utils.utils import get_translated_day_and_month
+from newsapp.utils.weather_utils import process_forecast_weather_data
+
+
+def build_forecast_payload(days):
+    """
+    Build a synthetic 'forecastday' list shaped like the weather API response.
+
+    Parameters:
+    days (int): Number of forecast days, each with 24 hourly entries.
+
+    Returns:
+    list: The generated forecast days.
+    """
+    start = datetime(2024, 7, 6)
+    forecast_days = []
+    for day_index in range(days):
+        date = start + timedelta(days=day_index)
+        hours = []
+        for hour_index in range(24):
+            moment = date + timedelta(hours=hour_index)
+            hours.append({
+                'time': moment.strftime('%Y-%m-%d %H:%M'),
+                'temp_c': 18.4 + hour_index * 0.3,
+                'temp_f': 65.1 + hour_index * 0.5,
+                'wind_kph': 11.2 + hour_index * 0.7,
+                'wind_mph': 7.0 + hour_index * 0.4,
+                'pressure_mb': 1012.0 + hour_index * 0.1,
+                'pressure_in': 29.88,
+                'humidity': 60,
+                'condition': {'text': 'Sunny', 'icon': '//cdn/113.png'},
+            })
+        forecast_days.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'day': {
+                'maxtemp_c': 27.6, 'maxtemp_f': 81.7,
+                'mintemp_c': 16.2, 'mintemp_f': 61.2,
+                'condition': {'text': 'Sunny', 'icon': '//cdn/113.png'},
+            },
+            'astro': {
+                'sunrise': '04:52 AM', 'sunset': '09:10 PM',
+                'moon_phase': 'Waxing Crescent',
+            },
+            'hour': hours,
+        })
+    return forecast_days
+
+
+def process_forecast_loop(forecast_days, language, default_value):
+    """
+    Reference implementation of the original per-value forecast processing.
+
+    Every date and hourly timestamp is parsed with strptime and the rounded
+    values of every unit are computed one by one, as the weather page did
+    before the forecast was processed with NumPy and stored metric-only.
+    """
+    today_forecast = forecast_days[0]
+    today_forecast['astro'] = {
+        'sunrise': today_forecast['astro'].get('sunrise', default_value),
+        'sunset': today_forecast['astro'].get('sunset', default_value),
+        'moon_phase': today_forecast['astro'].get('moon_phase',
+                                                  default_value),
+    }
+    for day in forecast_days:
+        forecast_date_str = day.get('date')
+        if forecast_date_str:
+            forecast_date = datetime.strptime(forecast_date_str, '%Y-%m-%d')
+            translated_day, translated_month = (
+                get_translated_day_and_month(forecast_date, language)
+            )
+            day['forecast_date'] = {
+                'day': translated_day,
+                'date': forecast_date.day,
+                'month': translated_month,
+            }
+            day['max_temp_c'] = round(day.get('day', {}).get('maxtemp_c', 0))
+            day['max_temp_f'] = round(day.get('day', {}).get('maxtemp_f', 0))
+            day['min_temp_c'] = round(day.get('day', {}).get('mintemp_c', 0))
+            day['min_temp_f'] = round(day.get('day', {}).get('mintemp_f', 0))
+            day['condition'] = day.get('day', {}).get('condition',
+                                                      default_value)
+
+            for hour in day.get('hour', []):
+                hour_time_str = hour.get('time')
+                if hour_time_str:
+                    hour['time'] = (
+                        datetime.strptime(hour_time_str, '%Y-%m-%d %H:%M')
+                    )
+                    hour['temp_c'] = round(hour.get('temp_c', 0))
+                    hour['temp_f'] = round(hour.get('temp_f', 0))
+                    hour['wind_mps'] = round(hour.get('wind_kph', 0) / 3.6)
+                    hour['pressure_mb'] = round(hour.get('pressure_mb', 0))
+                    hour['pressure_mm'] = (
+                        round(hour.get('pressure_mb', 0) * 0.750062)
+                    )
+    return forecast_days
+
+
+def summarize_forecast(forecast_days):
+    """
+    Return the fields both implementations produce in the same form.
+
+    The original loop rounds every unit while the current processing keeps
+    metric floats, so only dates, conditions and timestamps are compared.
+    """
+    return [
+        (
+            day['forecast_date'], day['condition'],
+            [hour['time'] for hour in day['hour']],
+        )
+        for day in forecast_days
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Compare the original per-value forecast loop with the current processing.
+
+    Usage:
+        python manage.py benchmark_forecast_processing --days 3 --runs 200
+    """
+
+    help = 'Benchmark forecast post-processing (loop vs NumPy).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=3,
+            help='Number of forecast days in the synthetic payload.'
+        )
+        parser.add_argument(
+            '--runs', type=int, default=200,
+            help='Number of timed runs for each implementation.'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        runs = options['runs']
+        payload = build_forecast_payload(days)
+
+        loop_result = process_forecast_loop(
+            copy.deepcopy(payload), 'en', 'N/A'
+        )
+        vector_result = process_forecast_weather_data(
+            copy.deepcopy(payload), 'en', 'N/A'
+        )
+        if summarize_forecast(loop_result) != summarize_forecast(
+            vector_result
+        ):
+            self.stderr.write('Results differ between implementations.')
+            return
+
+        timings = {}
+        for name, func in (
+            ('loop', process_forecast_loop),
+            ('numpy', process_forecast_weather_data),
+        ):
+            copies = [copy.deepcopy(payload) for _ in range(runs)]
+            started = time.perf_counter()
+            for forecast_days in copies:
+                func(forecast_days, 'en', 'N/A')
+            timings[name] = (time.perf_counter() - started) / runs * 1000
+
+        self.stdout.write(
+            f"{days} days x 24 hours, {runs} runs\n"
+            f"loop:  {timings['loop']:.3f} ms per payload\n"
+            f"numpy: {timings['numpy']:.3f} ms per payload\n"
+            f"speedup: {timings['loop'] / timings['numpy']:.2f}x"
+        )
@@ -0,0 +1,189 @@
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user,
+    get_user_model
+)
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from asgiref.sync import sync_to_async
+import asyncio
+import pytz
+from importlib import import_module
+import time
+
+from newsapp.middleware import RequestContextMiddleware
+from newsapp.utils.preferences_utils import get_preference, load_preferences
+from newsapp.utils.utils import (
+    get_language, get_translated_day_and_month, get_user_context
+)
+from newsapp.views import BaseView
+
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+
+
+async def common_context_with_hops(request):
+    """
+    Reference implementation of the former per-view common context,
+    which switched to a thread for each step.
+    """
+    language = await sync_to_async(get_language)(request)
+    # Former set_timezone call
+    await sync_to_async(request.GET.get)('timezone')
+    # Former session read of the timezone
+    timezone_str = await sync_to_async(get_preference)(
+        request, 'django_timezone', 'UTC'
+    )
+    user_timezone = pytz.timezone(timezone_str)
+    now = timezone.now().astimezone(user_timezone)
+    translated_day, translated_month = (
+        await sync_to_async(get_translated_day_and_month)(
+            now, language, 'full'
+        )
+    )
+    user = await sync_to_async(lambda: request.user)()
+    user_context = await sync_to_async(get_user_context)(request)
+    return {
+        'language': language,
+        'current_date': (
+            f"{translated_day}, {now.day} {translated_month} {now.year}"
+        ),
+        'current_time': now.strftime('%H:%M'),
+        'user_timezone': user_timezone,
+        'user': user,
+        'avatar_url': user_context['avatar_url'],
+    }
+
+
+def build_request(session_key=None):
+    """
+    Build a page request as seen after the middleware that precedes
+    RequestContextMiddleware.
+
+    Parameters:
+    session_key (str): The session of a logged-in user, or None for an
+                       anonymous request.
+
+    Returns:
+    HttpRequest: The request.
+    """
+    request = RequestFactory().get('/news/general/')
+    request.COOKIES['timezone'] = 'Europe/Kyiv'
+    request.preferences = load_preferences(request)
+    if session_key is None:
+        request.user = AnonymousUser()
+        return request
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    request.session = SessionStore(session_key)
+    request.user = SimpleLazyObject(lambda: get_user(request))
+    return request
+
+
+def create_session(username):
+    """
+    Log a user in to a new session.
+
+    Parameters:
+    username (str): The name of an existing user.
+
+    Returns:
+    str: The session key.
+    """
+    user = get_user_model().objects.get(username=username)
+    session = SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return session.session_key
+
+
+class Command(BaseCommand):
+    """
+    Compare the per-view common context, resolved with one thread switch
+    per step, with the context attached lazily by
+    RequestContextMiddleware, for page, JSON API and thumbnail requests.
+
+    The user is only loaded by page views. Pass --username to measure
+    the requests of a logged-in user as well.
+
+    Usage:
+        python manage.py benchmark_request_context --runs 2000
+        python manage.py benchmark_request_context --username alice
+    """
+
+    help = 'Benchmark the per-request common context (hops vs middleware).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs', type=int, default=2000,
+            help='Number of timed requests for each implementation.'
+        )
+        parser.add_argument(
+            '--username',
+            help='Also measure the requests of this logged-in user.'
+        )
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        visitors = [('anonymous', None)]
+        if options['username']:
+            visitors.append((
+                options['username'], create_session(options['username'])
+            ))
+        try:
+            for visitor, session_key in visitors:
+                timings = asyncio.run(self.run_benchmark(runs, session_key))
+                self.stdout.write(f"{runs} requests, {visitor}")
+                for name, timing in timings.items():
+                    self.stdout.write(
+                        f"  {name + ':':<12} {timing:8.1f} us per request"
+                    )
+                self.stdout.write(
+                    f"  page speedup: "
+                    f"{timings['view hops'] / timings['page']:.1f}x"
+                )
+        finally:
+            for _, session_key in visitors[1:]:
+                SessionStore().delete(session_key)
+
+    async def run_benchmark(self, runs, session_key):
+        """
+        Time each implementation on the running event loop.
+
+        Parameters:
+        runs (int): Number of requests per implementation.
+        session_key (str): The session of a logged-in user, or None.
+
+        Returns:
+        dict: Microseconds per request by implementation.
+        """
+        async def page(request):
+            return await BaseView().get_common_context(request)
+
+        async def api(request):
+            return request.common_context['language']
+
+        async def thumbnail(request):
+            return None
+
+        cases = (
+            ('view hops', common_context_with_hops),
+            ('page', RequestContextMiddleware(page)),
+            ('api', RequestContextMiddleware(api)),
+            ('thumbnail', RequestContextMiddleware(thumbnail)),
+        )
+
+        timings = {}
+        for name, resolve in cases:
+            # Warm up the thread pool and the translation cache
+            await resolve(build_request(session_key))
+            requests = [build_request(session_key) for _ in range(runs)]
+            started = time.perf_counter()
+            for request in requests:
+                await resolve(request)
+            timings[name] = (time.perf_counter() - started) / runs * 1e6
+        return timings
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+import asyncio
+
+from newsapp.utils.favourites_utils import refresh_favourite_weather
+
+
+class Command(BaseCommand):
+    """
+    Refresh the cached weather of all favourite cities of active users once.
+
+    Useful with a shared cache backend, e.g. from a cron job:
+        python manage.py refresh_favourite_weather
+    """
+
+    help = "Refresh cached weather for active users' favourite cities."
+
+    def handle(self, *args, **options):
+        refreshed = asyncio.run(refresh_favourite_weather())
+        self.stdout.write(f"Refreshed weather for {refreshed} cities.")
@@ -0,0 +1,95 @@
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+import pytz
+
+from .utils.preferences_utils import load_preferences, save_preferences
+from .utils.utils import get_page_context
+
+
+class PreferencesMiddleware:
+    """
+    Attach the visitor's preferences to the request as
+    request.preferences, activate the visitor's timezone, and send the
+    preferences cookie back with the response when a view changed them.
+
+    The middleware supports both sync and async views, so async views
+    are not switched to a thread to run it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            timezone.deactivate()
+        save_preferences(request.preferences, response)
+        return response
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            timezone.deactivate()
+        save_preferences(request.preferences, response)
+        return response
+
+    def process_request(self, request):
+        """Load the preferences and activate the visitor's timezone."""
+        request.preferences = load_preferences(request)
+        timezone_str = request.preferences.get('django_timezone')
+        if timezone_str:
+            timezone.activate(pytz.timezone(timezone_str))
+
+
+class RequestContextMiddleware:
+    """
+    Attach the data shared by all pages to the request as
+    request.common_context: the language, timezone and current date and
+    time.
+
+    The context is resolved lazily, on first access, so requests that
+    never read it, such as thumbnails, do not pay for it. It only reads
+    the request and the preferences, so async views can access it on
+    the event loop. The user and their avatar are not part of it, since
+    loading them may query the database; page views add them, see
+    get_user_context.
+
+    Must be placed after PreferencesMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return await self.get_response(request)
+
+    def process_request(self, request):
+        """Attach the lazily resolved common context."""
+        request.common_context = SimpleLazyObject(
+            lambda: get_page_context(request)
+        )
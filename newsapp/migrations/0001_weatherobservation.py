@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=32)),
+                ('observed_at', models.DateTimeField()),
+                ('temperature_c', models.FloatField()),
+                ('feelslike_c', models.FloatField()),
+                ('humidity', models.PositiveSmallIntegerField()),
+                ('wind_kph', models.FloatField()),
+                ('pressure_mb', models.FloatField()),
+                ('visibility_km', models.FloatField()),
+                ('uv_index', models.FloatField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='weatherobservation',
+            constraint=models.UniqueConstraint(fields=('location', 'observed_at'), name='unique_weather_observation'),
+        ),
+    ]
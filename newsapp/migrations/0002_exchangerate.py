@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0001_weatherobservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('date', models.DateField()),
+                ('sale_rate_nb', models.FloatField()),
+                ('purchase_rate_nb', models.FloatField()),
+                ('purchase_rate', models.FloatField(null=True)),
+                ('sale_rate', models.FloatField(null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='exchangerate',
+            constraint=models.UniqueConstraint(fields=('currency', 'date'), name='unique_exchange_rate'),
+        ),
+    ]
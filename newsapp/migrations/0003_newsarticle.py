@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0002_exchangerate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(max_length=2)),
+                ('category', models.CharField(max_length=16)),
+                ('url', models.URLField(max_length=1000)),
+                ('title', models.TextField()),
+                ('source', models.CharField(max_length=200)),
+                ('published_at', models.DateTimeField()),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['country', 'category', '-published_at'], name='news_article_recent_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newsarticle',
+            constraint=models.UniqueConstraint(fields=('country', 'category', 'url'), name='unique_news_article'),
+        ),
+    ]
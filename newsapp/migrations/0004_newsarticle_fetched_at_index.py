@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0003_newsarticle'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='fetched_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0004_newsarticle_fetched_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(max_length=2)),
+                ('category', models.CharField(max_length=16)),
+                ('published_at', models.DateTimeField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listings', to='newsapp.newsarticle')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['country', 'category', '-published_at'], name='news_listing_recent_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newslisting',
+            constraint=models.UniqueConstraint(fields=('country', 'category', 'article'), name='unique_news_listing'),
+        ),
+        migrations.AddField(
+            model_name='newsarticle',
+            name='url_hash',
+            field=models.CharField(max_length=40, null=True),
+        ),
+    ]
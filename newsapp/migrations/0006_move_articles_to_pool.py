@@ -0,0 +1,49 @@
+import hashlib
+from django.db import migrations
+
+
+def move_articles_to_pool(apps, schema_editor):
+    """
+    Keep one article per URL and list it in all of its former listings.
+    """
+    NewsArticle = apps.get_model('newsapp', 'NewsArticle')
+    NewsListing = apps.get_model('newsapp', 'NewsListing')
+
+    pooled = {}
+    listings = {}
+    duplicates = []
+    for article in NewsArticle.objects.order_by('-fetched_at').iterator():
+        kept = pooled.setdefault(article.url, article)
+        if kept is not article:
+            duplicates.append(article.pk)
+        listings[(article.country, article.category, kept.pk)] = (
+            NewsListing(
+                article_id=kept.pk, country=article.country,
+                category=article.category, published_at=kept.published_at
+            )
+        )
+
+    NewsListing.objects.bulk_create(listings.values(), batch_size=500)
+    NewsArticle.objects.filter(pk__in=duplicates).delete()
+    for url, article in pooled.items():
+        article.url_hash = hashlib.sha1(url.encode()).hexdigest()
+    NewsArticle.objects.bulk_update(
+        pooled.values(), ['url_hash'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Runs on its own, so that on PostgreSQL the deletes are committed
+    before 0007 alters the table.
+    """
+
+    dependencies = [
+        ('newsapp', '0005_news_listing'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            move_articles_to_pool, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0006_move_articles_to_pool'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='newsarticle',
+            name='unique_news_article',
+        ),
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_article_recent_idx',
+        ),
+        migrations.RemoveField(
+            model_name='newsarticle',
+            name='category',
+        ),
+        migrations.RemoveField(
+            model_name='newsarticle',
+            name='country',
+        ),
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='url_hash',
+            field=models.CharField(max_length=40, unique=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0007_news_article_pool'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newslisting',
+            name='news_listing_recent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='newslisting',
+            index=models.Index(fields=['country', 'category', '-published_at', '-id'], name='news_listing_page_idx'),
+        ),
+    ]
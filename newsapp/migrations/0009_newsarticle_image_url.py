@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0008_news_listing_page_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='image_url',
+            field=models.URLField(blank=True, default='', max_length=1000),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0009_newsarticle_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRateGap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsapp', '0010_exchangerategap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherLocationName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('location', models.CharField(max_length=32)),
+            ],
+        ),
+    ]
@@ -1,3 +1,144 @@
 from django.db import models
 
-# Create your models here.
+
+class WeatherObservation(models.Model):
+    """
+    A current-weather observation of a canonical location.
+
+    Every row has the same fixed-width numeric columns, in the canonical
+    metric units of the weather data (°C, %, km/h, mb, km). A location is
+    identified by its rounded coordinates, so all city spellings and
+    languages that geocode to the same place share one time series.
+    """
+    location = models.CharField(max_length=32)
+    observed_at = models.DateTimeField()
+    temperature_c = models.FloatField()
+    feelslike_c = models.FloatField()
+    humidity = models.PositiveSmallIntegerField()
+    wind_kph = models.FloatField()
+    pressure_mb = models.FloatField()
+    visibility_km = models.FloatField()
+    uv_index = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # Also serves range queries of a location's time series
+            models.UniqueConstraint(
+                fields=['location', 'observed_at'],
+                name='unique_weather_observation'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.location} at {self.observed_at:%Y-%m-%d %H:%M}"
+
+
+class WeatherLocationName(models.Model):
+    """
+    A city name whose weather was recorded, with the canonical location
+    of its observations.
+
+    Names are stored case-folded, so the history of a city can be found
+    long after its geocoded data has expired from the cache.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    location = models.CharField(max_length=32)
+
+    def __str__(self):
+        return f"{self.name} ({self.location})"
+
+
+class ExchangeRate(models.Model):
+    """
+    The PrivatBank exchange rates of one currency on one day, in UAH.
+
+    The bank's purchase and sale rates are not published for every
+    currency, so they may be empty.
+    """
+    currency = models.CharField(max_length=3)
+    date = models.DateField()
+    sale_rate_nb = models.FloatField()
+    purchase_rate_nb = models.FloatField()
+    purchase_rate = models.FloatField(null=True)
+    sale_rate = models.FloatField(null=True)
+
+    class Meta:
+        constraints = [
+            # Also serves range queries of a currency's time series
+            models.UniqueConstraint(
+                fields=['currency', 'date'],
+                name='unique_exchange_rate'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.currency} on {self.date:%Y-%m-%d}"
+
+
+class ExchangeRateGap(models.Model):
+    """
+    A past day for which the PrivatBank archive has no rates, e.g. a
+    bank holiday, so that backfills do not fetch it again.
+    """
+    date = models.DateField(unique=True)
+
+    def __str__(self):
+        return f"No rates on {self.date:%Y-%m-%d}"
+
+
+class NewsArticle(models.Model):
+    """
+    A NewsAPI headline in the shared article pool.
+
+    Articles are normalized once when they are ingested, so the title is
+    stored without the trailing source name and the publication time as
+    a timezone-aware datetime. The pool holds every URL only once, however
+    many countries and categories list the article (see NewsListing).
+    """
+    url_hash = models.CharField(max_length=40, unique=True)
+    url = models.URLField(max_length=1000)
+    title = models.TextField()
+    source = models.CharField(max_length=200)
+    published_at = models.DateTimeField()
+    # The publisher's image, only ever served through the thumbnail proxy
+    image_url = models.URLField(max_length=1000, blank=True, default='')
+    # Lets the search index load only the articles changed since its sync
+    fetched_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return self.title
+
+
+class NewsListing(models.Model):
+    """
+    A reference from the top headlines of a country and category to an
+    article of the pool.
+
+    The publication time is copied from the article, so that the recent
+    articles of a listing are read with one index scan.
+    """
+    article = models.ForeignKey(
+        NewsArticle, on_delete=models.CASCADE, related_name='listings'
+    )
+    country = models.CharField(max_length=2)
+    category = models.CharField(max_length=16)
+    published_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['country', 'category', 'article'],
+                name='unique_news_listing'
+            ),
+        ]
+        indexes = [
+            # Serves the pages of a listing, newest first, with one index
+            # scan; the id breaks ties between equal publication times
+            models.Index(
+                fields=['country', 'category', '-published_at', '-id'],
+                name='news_listing_page_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article} ({self.country}/{self.category})"
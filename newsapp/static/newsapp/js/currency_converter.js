@@ -0,0 +1,76 @@
+document.addEventListener("DOMContentLoaded", function() {
+    const form = document.querySelector('.converter-form');
+    const rateTableData = document.getElementById('rate-table-data');
+    const rateTable = rateTableData ? JSON.parse(rateTableData.textContent) : null;
+
+    // Without rates the form falls back to the server-side conversion
+    if (!form || !rateTable) {
+        return;
+    }
+
+    const index = {};
+    rateTable.currencies.forEach((currency, position) => {
+        index[currency] = position;
+    });
+
+    const amountInput = form.querySelector('#amount');
+    const fromSelect = form.querySelector('#from_currency');
+    const toSelect = form.querySelector('#to_currency');
+    const resultInput = form.querySelector('#converted_amount');
+    const errorElement = form.querySelector('.conversion-error');
+
+    // Same semantics as convert_currency: the bank buys the source
+    // currency for UAH and sells the target currency for UAH
+    function convert(amount, fromCurrency, toCurrency) {
+        const buy = rateTable.buy[index[fromCurrency]];
+        const sell = rateTable.sell[index[toCurrency]];
+        if (buy === null || buy === undefined || sell === null || sell === undefined) {
+            return { error: form.getAttribute('data-trans-rate-not-found') };
+        }
+        if (sell === 0) {
+            return { error: form.getAttribute('data-trans-division-error') };
+        }
+        return { value: Math.round(amount * (buy / sell) * 100) / 100 };
+    }
+
+    function updateConversion() {
+        const amount = parseFloat(amountInput.value);
+        if (isNaN(amount)) {
+            resultInput.value = '-';
+            return;
+        }
+        const result = convert(amount, fromSelect.value, toSelect.value);
+        errorElement.textContent = result.error || '';
+        errorElement.hidden = !result.error;
+        resultInput.value = result.error ? '-' : result.value;
+    }
+
+    // Rates pushed by exchange_rates_stream.js
+    document.addEventListener('exchange-rates-updated', event => {
+        const diff = event.detail;
+        Object.entries(diff.changed).forEach(([currency, row]) => {
+            if (!(currency in index)) {
+                index[currency] = rateTable.currencies.length;
+                rateTable.currencies.push(currency);
+            }
+            rateTable.buy[index[currency]] = row[3];
+            rateTable.sell[index[currency]] = row[4];
+        });
+        diff.removed.forEach(currency => {
+            if (currency in index) {
+                rateTable.buy[index[currency]] = null;
+                rateTable.sell[index[currency]] = null;
+            }
+        });
+        rateTable.version = diff.version;
+        if (resultInput.value !== '-' && resultInput.value !== '') {
+            updateConversion();
+        }
+    });
+
+    form.addEventListener('submit', event => {
+        event.preventDefault();
+        updateConversion();
+    });
+    [amountInput, fromSelect, toSelect].forEach(el => el.addEventListener('input', updateConversion));
+});
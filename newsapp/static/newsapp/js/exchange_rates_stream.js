@@ -0,0 +1,44 @@
+document.addEventListener("DOMContentLoaded", function() {
+    const section = document.querySelector('.exchange-rates-section');
+
+    if (!section || !window.EventSource) {
+        return;
+    }
+
+    // Each event carries the changed rows of the rates as
+    // [NBU rate, purchase rate, sale rate, buy rate, sell rate]
+    let version = section.getAttribute('data-version');
+    let source = null;
+
+    function connect() {
+        source = new EventSource(`${section.getAttribute('data-stream-url')}?version=${encodeURIComponent(version)}`);
+
+        source.addEventListener('rates', event => {
+            const diff = JSON.parse(event.data);
+            version = diff.version;
+
+            Object.entries(diff.changed).forEach(([currency, row]) => {
+                const tableRow = section.querySelector(`tr[data-currency="${currency}"]`);
+                if (!tableRow) {
+                    return;
+                }
+                tableRow.querySelectorAll('[data-field]').forEach(cell => {
+                    const value = row[parseInt(cell.getAttribute('data-field'))];
+                    cell.textContent = (value === null) ? '-' : value;
+                });
+            });
+
+            // Lets the currency converter use the new rates
+            document.dispatchEvent(new CustomEvent('exchange-rates-updated', { detail: diff }));
+        });
+
+        // A closed stream reconnects with the latest version
+        source.addEventListener('error', () => {
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(connect, 60000);
+            }
+        });
+    }
+
+    connect();
+});
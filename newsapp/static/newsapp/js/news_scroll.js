@@ -0,0 +1,110 @@
+document.addEventListener("DOMContentLoaded", function() {
+    const more = document.querySelector('.news-more');
+    const list = document.querySelector('.news-list');
+
+    if (!more || !list) {
+        return;
+    }
+
+    // Articles already shown, since a page may repeat freshly added ones
+    const shownUrls = new Set(
+        Array.from(list.querySelectorAll('.news-content a'), link => link.href)
+    );
+    let cursor = more.getAttribute('data-cursor');
+    let loading = false;
+    let observer = null;
+
+    function renderArticle(article) {
+        const item = document.createElement('li');
+        item.className = 'news-item';
+
+        const time = document.createElement('div');
+        time.className = 'news-time';
+        const small = document.createElement('small');
+        small.textContent = article.published_at;
+        time.appendChild(small);
+
+        const content = document.createElement('div');
+        content.className = 'news-content';
+        const link = document.createElement('a');
+        link.href = article.url;
+        link.textContent = article.title;
+        const source = document.createElement('span');
+        source.textContent = `(${article.source})`;
+        content.append(link, ' ', source);
+
+        item.appendChild(time);
+        if (article.thumbnail_url) {
+            const thumbnail = document.createElement('img');
+            thumbnail.className = 'news-thumbnail';
+            thumbnail.src = article.thumbnail_url;
+            thumbnail.srcset = `${article.thumbnail_url}?w=240 2x`;
+            thumbnail.width = 120;
+            thumbnail.height = 90;
+            thumbnail.loading = 'lazy';
+            thumbnail.alt = '';
+            item.appendChild(thumbnail);
+        }
+        item.appendChild(content);
+        return item;
+    }
+
+    function finish() {
+        if (observer) {
+            observer.disconnect();
+        }
+        more.remove();
+    }
+
+    function loadMore() {
+        if (loading || !cursor) {
+            return;
+        }
+        loading = true;
+
+        fetch(`${more.getAttribute('data-url')}&cursor=${encodeURIComponent(cursor)}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                data.articles.forEach(article => {
+                    const item = renderArticle(article);
+                    const url = item.querySelector('a').href;
+                    if (!shownUrls.has(url)) {
+                        shownUrls.add(url);
+                        list.appendChild(item);
+                    }
+                });
+                cursor = data.next_cursor;
+                if (!cursor) {
+                    finish();
+                } else if (observer) {
+                    // Check again in case the end of the list is still visible
+                    observer.unobserve(more);
+                    observer.observe(more);
+                }
+            })
+            .catch(error => {
+                console.error('Error loading more news:', error);
+                finish();
+            })
+            .finally(() => {
+                loading = false;
+            });
+    }
+
+    if (window.IntersectionObserver) {
+        // Start loading shortly before the end of the list is reached
+        observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadMore();
+            }
+        }, { rootMargin: '300px' });
+        observer.observe(more);
+    } else {
+        more.addEventListener('click', loadMore);
+    }
+});
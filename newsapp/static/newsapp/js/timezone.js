@@ -1,4 +1,12 @@
 document.addEventListener("DOMContentLoaded", function() {
     const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
-    fetch(`/set_timezone/?timezone=${timezone}`, { method: 'GET' });
+
+    // The server reads the timezone from this cookie with every request,
+    // so it is only written when the browser's timezone changed
+    const stored = document.cookie
+        .split('; ')
+        .find((cookie) => cookie.startsWith('timezone='));
+    if (timezone && stored !== `timezone=${timezone}`) {
+        document.cookie = `timezone=${timezone}; path=/; max-age=31536000; samesite=lax`;
+    }
 });
@@ -3,6 +3,7 @@ document.addEventListener("DOMContentLoaded", function() {
     const pressureUnitRadios = document.querySelectorAll('input[name="pressure-unit"]');
     const windUnitRadios = document.querySelectorAll('input[name="wind-unit"]');
     const visibilityUnitRadios = document.querySelectorAll('input[name="visibility-unit"]');
+    const unitSelection = document.querySelector('.unit-selection');
 
     const directionMap = {
         'N': 'bi-arrow-up',
@@ -23,107 +24,175 @@ document.addEventListener("DOMContentLoaded", function() {
         'NNW': 'bi-arrow-up-left'
     };
 
-    temperatureUnitRadios.forEach(radio => radio.addEventListener('change', updateUnits));
-    pressureUnitRadios.forEach(radio => radio.addEventListener('change', updateUnits));
-    windUnitRadios.forEach(radio => radio.addEventListener('change', updateUnits));
-    visibilityUnitRadios.forEach(radio => radio.addEventListener('change', updateUnits));
+    // Conversions from the canonical metric values (°C, km/h, mb, km).
+    // Must stay in sync with UNIT_CONVERSIONS in weather_utils.py.
+    const unitConversions = {
+        'c': value => value,
+        'f': value => value * 9 / 5 + 32,
+        'kph': value => value,
+        'mps': value => value / 3.6,
+        'mph': value => value / 1.609344,
+        'mb': value => value,
+        'mmhg': value => value * 0.750062,
+        'in': value => value * 0.02953,
+        'km': value => value,
+        'miles': value => value / 1.609344
+    };
+
+    temperatureUnitRadios.forEach(radio => radio.addEventListener('change', () => updateUnits()));
+    pressureUnitRadios.forEach(radio => radio.addEventListener('change', () => updateUnits()));
+    windUnitRadios.forEach(radio => radio.addEventListener('change', () => updateUnits()));
+    visibilityUnitRadios.forEach(radio => radio.addEventListener('change', () => updateUnits()));
 
-    function updateUnits() {
+    // Convert a canonical value and round halves up, like convert_unit
+    function convert(value, unit) {
+        return Math.round(unitConversions[unit](parseFloat(value)));
+    }
+
+    function translation(unit) {
+        return unitSelection.getAttribute(`data-trans-${unit}`);
+    }
+
+    // Render measurements inside root (the whole page by default) in the selected units
+    function updateUnits(root = document) {
         const temperatureUnit = document.querySelector('input[name="temperature-unit"]:checked').value;
         const pressureUnit = document.querySelector('input[name="pressure-unit"]:checked').value;
         const windUnit = document.querySelector('input[name="wind-unit"]:checked').value;
         const visibilityUnit = document.querySelector('input[name="visibility-unit"]:checked').value;
+        const temperatureSign = (temperatureUnit === 'c') ? '°C' : '°F';
 
-        // Update temperature
-        const temperatureElements = document.querySelectorAll('.temp-value, .forecast-temp-value');
+        // Update temperature, including hourly and daily min/max values
+        const temperatureElements = root.querySelectorAll('.temp-value, .forecast-temp-value');
         temperatureElements.forEach(el => {
-            const tempC = el.getAttribute('data-temp-c');
-            const tempF = el.getAttribute('data-temp-f');
-            if (el.classList.contains('temp-value')) {
-                el.innerHTML = (temperatureUnit === 'c') ? `${tempC}<sup class="temp-unit">°C</sup>` : `${tempF}<sup class="temp-unit">°F</sup>`;
-            } else {
-                el.innerHTML = (temperatureUnit === 'c') ? `${tempC}<sup class="forecast-temp-unit">°C</sup>` : `${tempF}<sup class="forecast-temp-unit">°F</sup>`;
-            }
-            // el.innerHTML = (temperatureUnit === 'c') ? `${tempC}<sup class="temp-unit forecast-temp-unit">°C</sup>` : `${tempF}<sup class="temp-unit forecast-temp-unit">°F</sup>`;
+            const temperature = convert(el.getAttribute('data-temp-c'), temperatureUnit);
+            const unitClass = el.classList.contains('temp-value') ? 'temp-unit' : 'forecast-temp-unit';
+            el.innerHTML = `${temperature}<sup class="${unitClass}">${temperatureSign}</sup>`;
         });
 
         // Update feels like temperature
-        const feelslikeElements = document.querySelectorAll('.feelslike');
+        const feelslikeElements = root.querySelectorAll('.feelslike');
         feelslikeElements.forEach(el => {
-            const feelslikeC = el.getAttribute('data-feelslike-c');
-            const feelslikeF = el.getAttribute('data-feelslike-f');
-            const transFeelsLike = el.getAttribute('data-trans-feelslike');
-            el.textContent = (temperatureUnit === 'c') ? `${transFeelsLike} ${feelslikeC}°C` : `${transFeelsLike} ${feelslikeF}°F`;
+            const feelslike = convert(el.getAttribute('data-feelslike-c'), temperatureUnit);
+            el.textContent = `${translation('feelslike')} ${feelslike}${temperatureSign}`;
         });
 
         // Update dewpoint temperature
-        const dewpointElements = document.querySelectorAll('.dewpoint');
+        const dewpointElements = root.querySelectorAll('.dewpoint');
         dewpointElements.forEach(el => {
-            const dewpointC = el.getAttribute('data-dewpoint-c');
-            const dewpointF = el.getAttribute('data-dewpoint-f');
-            el.textContent = (temperatureUnit === 'c') ? `${dewpointC}°C` : `${dewpointF}°F`;
-        });
-
-        // 
-        const minTempElements = document.querySelectorAll('.min-temp .forecast-temp-value');
-        const maxTempElements = document.querySelectorAll('.max-temp .forecast-temp-value');
-
-        minTempElements.forEach(el => {
-            const minTempC = el.getAttribute('data-temp-c');
-            const minTempF = el.getAttribute('data-temp-f');
-            el.innerHTML = (temperatureUnit === 'c') ? `${minTempC}<sup class="temp-unit forecast-temp-unit">°C</sup>` : `${minTempF}<sup class="temp-unit forecast-temp-unit">°F</sup>`;
-        });
-
-        maxTempElements.forEach(el => {
-            const maxTempC = el.getAttribute('data-temp-c');
-            const maxTempF = el.getAttribute('data-temp-f');
-            el.innerHTML = (temperatureUnit === 'c') ? `${maxTempC}<sup class="temp-unit forecast-temp-unit">°C</sup>` : `${maxTempF}<sup class="temp-unit forecast-temp-unit">°F</sup>`;
+            const dewpoint = convert(el.getAttribute('data-dewpoint-c'), temperatureUnit);
+            el.textContent = `${dewpoint}${temperatureSign}`;
         });
 
         // Update pressure
-        const pressureElements = document.querySelectorAll('.pressure');
+        const pressureElements = root.querySelectorAll('.pressure');
         pressureElements.forEach(el => {
-            const pressureMMHG = el.getAttribute('data-pressure-mmhg');
-            const pressureMB = el.getAttribute('data-pressure-mb');
-            const transMMHG = el.getAttribute('data-trans-mmhg');
-            const transMB = el.getAttribute('data-trans-mb');
-            el.innerHTML = (pressureUnit === 'mmhg') ? `${pressureMMHG} ${transMMHG}` : `${pressureMB}  ${transMB}`;
+            const pressure = convert(el.getAttribute('data-pressure-mb'), pressureUnit);
+            el.innerHTML = `${pressure} ${translation(pressureUnit)}`;
         });
 
         // Update wind
-        const windElements = document.querySelectorAll('.wind');
+        const windElements = root.querySelectorAll('.wind');
         windElements.forEach(el => {
-            const windKPH = el.getAttribute('data-wind-kph');
-            const windMPS = el.getAttribute('data-wind-mps');
-            const windMPH = el.getAttribute('data-wind-mph');
-            const windDir = el.getAttribute('data-wind-dir');
-            const transMPS = el.getAttribute('data-trans-mps');
-            const transKPH = el.getAttribute('data-trans-kph');
-            const transMPH = el.getAttribute('data-trans-mph');
-            const directionClass = directionMap[windDir] || 'bi-question';
-            let value;
-            if (windUnit === 'mps') {
-                value = `<i class="bi ${directionClass}"></i> ${windMPS} ${transMPS}`;
-            } else if (windUnit === 'mph') {
-                value = `<i class="bi ${directionClass}"></i> ${windMPH} ${transMPH}`;
-            } else {
-                value = `<i class="bi ${directionClass}"></i> ${windKPH} ${transKPH}`;
-            }
-            el.innerHTML = value;
+            const wind = convert(el.getAttribute('data-wind-kph'), windUnit);
+            const directionClass = directionMap[el.getAttribute('data-wind-dir')] || 'bi-question';
+            el.innerHTML = `<i class="bi ${directionClass}"></i> ${wind} ${translation(windUnit)}`;
         });
 
         // Update visibility
-        const visibilityElements = document.querySelectorAll('.visibility');
+        const visibilityElements = root.querySelectorAll('.visibility');
         visibilityElements.forEach(el => {
-            const visibilityKM = el.getAttribute('data-visibility-km');
-            const visibilityMiles = el.getAttribute('data-visibility-miles');
-            const numberMiles = parseInt(visibilityMiles);
-            const lang = el.getAttribute('data-lang');
-            const visibilityUnitText = getVisibilityUnit(numberMiles, lang);
-            el.textContent = (visibilityUnit === 'km') ? `${visibilityKM} ${el.getAttribute('data-trans-km')}` : `${visibilityMiles} ${visibilityUnitText}`;
+            const visibility = convert(el.getAttribute('data-visibility-km'), visibilityUnit);
+            const visibilityUnitText = (visibilityUnit === 'km')
+                ? translation('km')
+                : getVisibilityUnit(visibility, unitSelection.getAttribute('data-lang'));
+            el.textContent = `${visibility} ${visibilityUnitText}`;
         });
     }
 
+    // Hourly forecast strip, rendered from the compact columnar forecast
+    const hourlyTable = document.querySelector('.hourly-forecast');
+    const hourlyData = document.getElementById('hourly-forecast-data');
+    const forecastTabs = document.querySelectorAll('.forecast-tab');
+    const loadedDays = {};
+
+    function renderHourlyForecast(hours) {
+        const row = hourlyTable.querySelector('tr');
+        row.innerHTML = '';
+        hours.time.forEach((time, index) => {
+            const cell = document.createElement('td');
+            cell.className = (index % 2 === 0) ? 'odd-column' : 'even-column';
+
+            const timeElement = document.createElement('p');
+            timeElement.className = 'time';
+            timeElement.textContent = time;
+
+            const icon = document.createElement('img');
+            icon.src = hours.icon[index];
+            icon.alt = hours.condition[index];
+
+            const temperature = document.createElement('div');
+            temperature.className = 'temperature';
+            const temperatureValue = document.createElement('span');
+            temperatureValue.className = 'forecast-temp-value';
+            temperatureValue.setAttribute('data-temp-c', hours.temp_c[index]);
+            temperature.appendChild(temperatureValue);
+
+            const pressure = document.createElement('div');
+            pressure.className = 'pressure';
+            pressure.setAttribute('data-pressure-mb', hours.pressure_mb[index]);
+
+            const humidity = document.createElement('div');
+            humidity.className = 'humidity';
+            humidity.textContent = `${hours.humidity[index]}%`;
+
+            const wind = document.createElement('div');
+            wind.className = 'wind';
+            wind.setAttribute('data-wind-kph', hours.wind_kph[index]);
+            wind.setAttribute('data-wind-dir', hours.wind_dir[index]);
+
+            cell.append(timeElement, icon, temperature, pressure, humidity, wind);
+            row.appendChild(cell);
+        });
+        updateUnits(row);
+    }
+
+    // Load a forecast day once from the forecast API, then reuse it
+    function loadForecastDay(day) {
+        if (!loadedDays[day]) {
+            loadedDays[day] = fetch(`${hourlyTable.getAttribute('data-url')}&day=${day}`)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Forecast request failed: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(data => data.hours)
+                .catch(error => {
+                    delete loadedDays[day];
+                    throw error;
+                });
+        }
+        return loadedDays[day];
+    }
+
+    if (hourlyTable && hourlyData) {
+        const todayHours = JSON.parse(hourlyData.textContent);
+        if (todayHours) {
+            loadedDays[0] = Promise.resolve(todayHours);
+            renderHourlyForecast(todayHours);
+        }
+
+        forecastTabs.forEach(tab => tab.addEventListener('click', () => {
+            const day = tab.getAttribute('data-day');
+            loadForecastDay(day)
+                .then(hours => {
+                    forecastTabs.forEach(other => other.classList.toggle('active', other === tab));
+                    renderHourlyForecast(hours);
+                })
+                .catch(error => console.error(error));
+        }));
+    }
+
     // JavaScript function to get the correct visibility unit
     function getVisibilityUnit(number, lang) {
         if (lang === 'uk') {
@@ -1,6 +1,7 @@
 from django import template
 from datetime import datetime
 from ..utils.utils import format_time
+from ..utils.weather_utils import convert_unit
 
 register = template.Library()
 
@@ -30,3 +31,14 @@ def format_time_24h(date_string):
         return dt.strftime("%H:%M")
     except ValueError:
         return date_string  # Return original if there is an error
+
+
+@register.filter
+def unit(value, target_unit):
+    """
+    Converts a canonical metric weather value to the given display unit.
+    """
+    try:
+        return convert_unit(value, target_unit)
+    except (TypeError, ValueError, KeyError):
+        return value
@@ -1,3 +1,999 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+    override_settings
+)
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from PIL import Image
+from unittest import mock
+import asyncio
+import json
+import numpy as np
+import pytz
+import tempfile
+
+from .middleware import RequestContextMiddleware
+from .models import ExchangeRateGap, NewsArticle, NewsListing
+from .utils import exchanger_utils, thumbnail_utils, weather_utils
+from .utils.exceptions import APIError, GeocodingError, ThumbnailError
+from .utils.news_store_utils import (
+    get_articles_page, get_url_hash, normalize_article
+)
+from .utils.favourites_utils import get_active_favourite_cities
+from .utils.news_search_utils import NewsSearchIndex
+from .utils.news_utils import encode_news_cursor, get_articles_hash
+from .utils.preferences_utils import (
+    PREFERENCES_COOKIE, TIMEZONE_COOKIE, Preferences
+)
+from .utils.translations import translations
+from .utils.utils import generate_cache_key
+from .utils.weather_history_utils import (
+    prune_weather_history, record_weather_observations
+)
+
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+
+
+class PreferencesTests(TestCase):
+    """
+    Visitor preferences live in a signed cookie that is only sent back
+    when one of them changes, and page views never write the session.
+    """
+
+    def setUp(self):
+        patcher = mock.patch(
+            'newsapp.views.get_news_page',
+            new=mock.AsyncMock(return_value=([], None))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse(
+            'newsapp:news_by_category', kwargs={'category': 'general'}
+        )
+
+    def get_with_saves(self, *args, **kwargs):
+        """Request a page and return it with the number of session saves."""
+        with mock.patch.object(
+            SessionStore, 'save', autospec=True, side_effect=SessionStore.save
+        ) as save:
+            response = self.client.get(*args, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return response, save.call_count
+
+    def test_first_view_stores_the_preferences(self):
+        response, saves = self.get_with_saves(self.url)
+        self.assertEqual(saves, 0)
+        self.assertIn(PREFERENCES_COOKIE, response.cookies)
+        self.assertEqual(response.wsgi_request.preferences, {
+            'language': 'en', 'selected_country': 'us',
+        })
+
+    def test_steady_state_view_does_not_write(self):
+        self.client.get(self.url)
+        for query in ({}, {'country': 'us', 'lang': 'en'}):
+            response, saves = self.get_with_saves(self.url, query)
+            self.assertEqual(saves, 0)
+            self.assertNotIn(PREFERENCES_COOKIE, response.cookies)
+
+    def test_anonymous_view_makes_no_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'country': 'gb'})
+
+    def test_changed_preference_updates_the_cookie(self):
+        self.client.get(self.url)
+        response, saves = self.get_with_saves(self.url, {'country': 'gb'})
+        self.assertEqual(saves, 0)
+        self.assertIn(PREFERENCES_COOKIE, response.cookies)
+        response, _ = self.get_with_saves(self.url)
+        self.assertEqual(
+            response.wsgi_request.preferences['selected_country'], 'gb'
+        )
+        self.assertNotIn(PREFERENCES_COOKIE, response.cookies)
+
+    def test_tampered_cookie_is_ignored(self):
+        self.client.cookies[PREFERENCES_COOKIE] = '{"language":"uk"}'
+        response, _ = self.get_with_saves(self.url)
+        self.assertEqual(response.wsgi_request.preferences['language'], 'en')
+
+    def test_timezone_is_read_from_the_browser_cookie(self):
+        self.client.get(self.url)
+        self.client.cookies[TIMEZONE_COOKIE] = 'Europe/Kyiv'
+        response, saves = self.get_with_saves(self.url)
+        self.assertEqual(saves, 0)
+        self.assertNotIn(PREFERENCES_COOKIE, response.cookies)
+        self.assertEqual(
+            response.wsgi_request.preferences['django_timezone'],
+            'Europe/Kyiv'
+        )
+        self.assertEqual(
+            str(response.context['user_timezone']), 'Europe/Kyiv'
+        )
+
+    def test_unknown_timezone_is_ignored(self):
+        self.client.cookies[TIMEZONE_COOKIE] = 'Mars/Olympus'
+        response, _ = self.get_with_saves(self.url)
+        self.assertNotIn(
+            'django_timezone', response.wsgi_request.preferences
+        )
+        self.assertEqual(str(response.context['user_timezone']), 'UTC')
+
+
+class RequestContextTests(TestCase):
+    """
+    The common context is resolved lazily, and only page views load the
+    user.
+    """
+
+    def setUp(self):
+        patcher = mock.patch(
+            'newsapp.views.get_news_page',
+            new=mock.AsyncMock(return_value=([], None))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse(
+            'newsapp:news_by_category', kwargs={'category': 'general'}
+        )
+
+    def test_page_view_adds_the_user(self):
+        User.objects.create_user('reader', password='secret-123')
+        self.client.login(username='reader', password='secret-123')
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['is_authenticated'])
+        self.assertEqual(response.context['user'].username, 'reader')
+        self.assertNotIn('user', response.wsgi_request.common_context)
+
+    def test_context_is_resolved_on_first_access(self):
+        request = RequestFactory().get(self.url)
+        request.preferences = Preferences()
+        RequestContextMiddleware(lambda request: None)(request)
+        with mock.patch(
+            'newsapp.middleware.get_page_context', return_value={}
+        ) as get_page_context:
+            get_page_context.assert_not_called()
+            dict(request.common_context)
+        get_page_context.assert_called_once_with(request)
+
+
+class NewsPageTests(TestCase):
+    """
+    Further pages of news are only fetched for known listings and
+    valid cursors.
+    """
+
+    def setUp(self):
+        patcher = mock.patch(
+            'newsapp.views.get_news_page',
+            new=mock.AsyncMock(return_value=([], None))
+        )
+        self.get_news_page = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse(
+            'newsapp:news_page', kwargs={'category': 'general'}
+        )
+
+    def test_unknown_country_is_rejected(self):
+        response = self.client.get(self.url, {'country': 'us&page=9'})
+        self.assertEqual(response.status_code, 400)
+        self.get_news_page.assert_not_called()
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {'cursor': 'tampered'})
+        self.assertEqual(response.status_code, 400)
+        self.get_news_page.assert_not_called()
+
+    def test_valid_cursor_is_decoded(self):
+        published_at = timezone.now()
+        cursor = encode_news_cursor((published_at, 7))
+        response = self.client.get(
+            self.url, {'country': 'gb', 'cursor': cursor}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.get_news_page.assert_awaited_once_with(
+            'general', 'gb', mock.ANY, (published_at, 7)
+        )
+
+
+class NormalizeArticleTests(SimpleTestCase):
+    """
+    Articles whose URL the article table cannot store are dropped.
+    """
+
+    def get_article(self, url):
+        """Return a NewsAPI article with the given URL."""
+        return {
+            'title': 'Headline - Example', 'url': url,
+            'publishedAt': '2026-10-19T06:17:00Z',
+            'urlToImage': url,
+        }
+
+    def test_too_long_url_is_dropped(self):
+        url = 'https://example.com/' + 'a' * 1000
+        self.assertIsNone(normalize_article(self.get_article(url)))
+
+    def test_article_is_normalized(self):
+        article = normalize_article(
+            self.get_article('https://example.com/1')
+        )
+        self.assertEqual(article['title'], 'Headline')
+        self.assertEqual(article['source'], 'Example')
+        self.assertEqual(article['image_url'], 'https://example.com/1')
+
+
+class ArticlesHashTests(SimpleTestCase):
+    """
+    The cached article list is keyed by every field it renders.
+    """
+
+    def get_hash(self, thumbnail):
+        """Return the hash of one article with the given thumbnail."""
+        return get_articles_hash([{
+            'title': 'Headline', 'url': 'https://example.com/1',
+            'source': 'Example', 'published_at': '19 10 06:17',
+            'thumbnail': thumbnail,
+        }])
+
+    def test_same_articles_keep_the_hash(self):
+        self.assertEqual(self.get_hash('a' * 40), self.get_hash('a' * 40))
+
+    def test_thumbnail_changes_the_hash(self):
+        self.assertNotEqual(self.get_hash(None), self.get_hash('a' * 40))
+
+
+class ArticlesPageTests(TestCase):
+    """
+    Pages of stored news are refilled when duplicate headlines are
+    collapsed, so only the last page is shorter than the limit.
+    """
+
+    def setUp(self):
+        now = timezone.now()
+        titles = ['A', 'B', 'B', 'B', 'C', 'D', 'E']
+        for index, title in enumerate(titles):
+            url = f'https://example.com/{index}'
+            published_at = now - timedelta(minutes=index)
+            article = NewsArticle.objects.create(
+                url_hash=get_url_hash(url), url=url, title=title,
+                source='Example', published_at=published_at
+            )
+            NewsListing.objects.create(
+                article=article, country='us', category='general',
+                published_at=published_at
+            )
+
+    def get_titles(self, limit, after=None):
+        """Return the titles of a page and the position after it."""
+        articles, after = get_articles_page('us', 'general', limit, after)
+        return [article['title'] for article in articles], after
+
+    def test_collapsed_page_is_refilled(self):
+        titles, after = self.get_titles(3)
+        self.assertEqual(titles, ['A', 'B', 'C'])
+        titles, after = self.get_titles(3, after)
+        self.assertEqual(titles, ['D', 'E'])
+        self.assertIsNone(after)
+
+    def test_full_last_page_has_no_next_position(self):
+        titles, after = self.get_titles(5)
+        self.assertEqual(titles, ['A', 'B', 'C', 'D', 'E'])
+        self.assertIsNone(after)
+
+
+class NewsSearchIndexTests(TestCase):
+    """
+    Headlines are found by word prefixes, newest first, and the index
+    follows the news store through syncs and rebuilds.
+    """
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.index = NewsSearchIndex()
+        self.create_article(1, 'Economy grows again', 'us', 'business', 3)
+        self.create_article(2, 'Economic outlook', 'gb', 'business', 1)
+        self.create_article(3, 'Election results are in', 'us', 'general', 2)
+
+    def create_article(self, number, title, country, category, age):
+        """Store an article published the given hours ago."""
+        url = f'https://example.com/{number}'
+        published_at = self.now - timedelta(hours=age)
+        article = NewsArticle.objects.create(
+            url_hash=get_url_hash(url), url=url, title=title,
+            source='Example', published_at=published_at
+        )
+        NewsListing.objects.create(
+            article=article, country=country, category=category,
+            published_at=published_at
+        )
+        return article
+
+    def get_titles(self, query, **filters):
+        """Return the titles of the articles matching a query."""
+        return [
+            article['title']
+            for article in self.index.search(query, **filters)
+        ]
+
+    def test_prefix_matches_newest_first(self):
+        self.assertEqual(
+            self.get_titles('econ'),
+            ['Economic outlook', 'Economy grows again']
+        )
+
+    def test_every_word_must_match(self):
+        self.assertEqual(
+            self.get_titles('ECON gro'), ['Economy grows again']
+        )
+        self.assertEqual(self.get_titles('econ election'), [])
+
+    def test_listing_filters(self):
+        self.assertEqual(
+            self.get_titles('econ', country='us'), ['Economy grows again']
+        )
+        self.assertEqual(
+            self.get_titles('e', category='general'),
+            ['Election results are in']
+        )
+
+    def test_sync_picks_up_new_articles(self):
+        self.assertEqual(self.get_titles('budget'), [])
+        self.create_article(4, 'Budget approved', 'us', 'general', 0)
+        self.assertEqual(self.get_titles('budget'), [])
+        self.index.invalidate()
+        self.assertEqual(self.get_titles('budget'), ['Budget approved'])
+
+    def test_rebuild_drops_pruned_articles(self):
+        self.assertEqual(len(self.get_titles('econ')), 2)
+        NewsArticle.objects.filter(url='https://example.com/1').delete()
+        self.index.invalidate()
+        self.assertEqual(len(self.get_titles('econ')), 2)
+        self.assertEqual(self.index.rebuild(), 2)
+        self.assertEqual(
+            self.get_titles('econ'), ['Economic outlook']
+        )
+
+
+class RolloverDatetime(datetime):
+    """A clock standing five minutes after midnight on 19 October 2026."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return tz.localize(datetime(2026, 10, 19, 0, 5))
+
+
+@mock.patch.object(exchanger_utils, 'datetime', RolloverDatetime)
+@mock.patch('asyncio.sleep', new_callable=mock.AsyncMock)
+class RolloverPrefetchTests(SimpleTestCase):
+    """
+    The rollover prefetch retries until the new day's rates are
+    published, instead of caching the previous day's ones until the next
+    visitor.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            exchanger_utils, 'get_kyiv_today', return_value=date(2026, 10, 19)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def patch_rates(self, *results):
+        """Patch get_rate_matrix to return or raise the given results."""
+        patcher = mock.patch.object(
+            exchanger_utils, 'get_rate_matrix',
+            new=mock.AsyncMock(side_effect=results)
+        )
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    async def test_unpublished_rates_are_retried(self, sleep):
+        get_rate_matrix = self.patch_rates(
+            mock.Mock(date='18.10.2026'), APIError('Unavailable'),
+            mock.Mock(date='18.10.2026'), mock.Mock(date='19.10.2026')
+        )
+        await exchanger_utils.prefetch_rollover_rates()
+        self.assertEqual(get_rate_matrix.await_count, 4)
+        self.assertEqual(
+            [call.args[0] for call in sleep.await_args_list], [60, 120, 240]
+        )
+
+    async def test_published_rates_are_not_retried(self, sleep):
+        get_rate_matrix = self.patch_rates(mock.Mock(date='19.10.2026'))
+        await exchanger_utils.prefetch_rollover_rates()
+        get_rate_matrix.assert_awaited_once_with(
+            date(2026, 10, 19), refresh=True
+        )
+        sleep.assert_not_awaited()
+
+
+class ThumbnailSourceTests(SimpleTestCase):
+    """
+    Publisher images are only fetched from public web servers, and
+    thumbnails that cannot be written give a ThumbnailError.
+    """
+
+    def test_non_public_addresses_are_refused(self):
+        for url in (
+            'http://127.0.0.1/image.jpg', 'http://10.0.0.1/image.jpg',
+            'http://169.254.169.254/latest/meta-data',
+            'http://[::1]/image.jpg', 'http://[::ffff:192.168.0.1]/image.jpg',
+            'file:///etc/passwd',
+        ):
+            with self.subTest(url=url):
+                with self.assertRaises(ThumbnailError):
+                    thumbnail_utils.check_source_url(url)
+        thumbnail_utils.check_source_url('https://93.184.215.14/image.jpg')
+        thumbnail_utils.check_source_url('https://example.com/image.jpg')
+
+    async def test_host_resolving_to_a_private_address_is_refused(self):
+        with self.assertRaises(ThumbnailError):
+            await thumbnail_utils.fetch_source_image(
+                'http://localhost:9/image.jpg'
+            )
+
+    def test_write_error_raises_thumbnail_error(self):
+        image = BytesIO()
+        Image.new('RGB', (300, 200)).save(image, 'PNG')
+        with tempfile.NamedTemporaryFile() as blocker:
+            # A file where the thumbnail directory would be created
+            with override_settings(NEWS_THUMBNAIL_ROOT=blocker.name):
+                with self.assertRaises(ThumbnailError):
+                    thumbnail_utils.render_thumbnails(
+                        'a' * 40, image.getvalue()
+                    )
+
+
+class ExchangeRateHistoryTests(TestCase):
+    """
+    The history API rejects ranges it cannot serve, and backfills
+    remember the days the archive has no rates for.
+    """
+
+    def test_out_of_range_days_are_rejected(self):
+        url = reverse('newsapp:exchange_rate_history')
+        for query in (
+            {'days': 10 ** 12}, {'days': 0},
+            {'days': 30, 'end': '0001-01-02'},
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(url, query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_range_ends_on_the_kyiv_rate_date(self):
+        url = reverse('newsapp:exchange_rate_history')
+        with mock.patch(
+            'newsapp.views.get_kyiv_today', return_value=date(2026, 1, 10)
+        ):
+            response = self.client.get(url, {'days': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['start'], '2026-01-08')
+        self.assertEqual(response.json()['end'], '2026-01-10')
+
+    async def test_days_without_rates_are_recorded_as_gaps(self):
+        fetch_rates_payload = mock.AsyncMock(return_value={
+            'date': '01.01.2026', 'exchangeRate': [],
+        })
+        with mock.patch.object(
+            exchanger_utils, 'fetch_rates_payload', fetch_rates_payload
+        ), mock.patch.object(exchanger_utils, 'BACKFILL_REQUEST_INTERVAL', 0):
+            day = date(2026, 1, 1)
+            self.assertEqual(
+                await exchanger_utils.backfill_exchange_rates(day, day),
+                (0, 1, 0)
+            )
+            self.assertEqual(
+                await exchanger_utils.backfill_exchange_rates(day, day),
+                (0, 0, 0)
+            )
+        fetch_rates_payload.assert_awaited_once()
+        self.assertTrue(
+            await ExchangeRateGap.objects.filter(date=day).aexists()
+        )
+
+
+class AstroDataTests(SimpleTestCase):
+    """
+    Sunrise, sunset and moon phase are calculated locally; the expected
+    times are within a minute of published almanac values.
+    """
+
+    def test_kyiv_at_the_solstices(self):
+        self.assertEqual(
+            weather_utils.calculate_astro_data(
+                50.45, 30.52, ['2026-06-21', date(2026, 12, 21)],
+                'Europe/Kyiv'
+            ),
+            [
+                {'sunrise': '04:46 AM', 'sunset': '09:13 PM',
+                 'moon_phase': 'First Quarter'},
+                {'sunrise': '07:55 AM', 'sunset': '03:55 PM',
+                 'moon_phase': 'Waxing Gibbous'},
+            ]
+        )
+
+    def test_southern_hemisphere(self):
+        winter, summer = weather_utils.calculate_astro_data(
+            -33.87, 151.21, ['2026-06-21', '2026-12-21'], 'Australia/Sydney'
+        )
+        self.assertEqual(
+            (winter['sunrise'], winter['sunset']), ('06:59 AM', '04:53 PM')
+        )
+        self.assertEqual(
+            (summer['sunrise'], summer['sunset']), ('05:40 AM', '08:05 PM')
+        )
+
+    def test_polar_day_and_night_use_the_default_value(self):
+        for astro in weather_utils.calculate_astro_data(
+            78.22, 15.65, ['2026-06-21', '2026-12-21'],
+            'Arctic/Longyearbyen', default_value='-'
+        ):
+            self.assertEqual((astro['sunrise'], astro['sunset']), ('-', '-'))
+
+    def test_moon_phases(self):
+        # New moon, first quarter, full moon and last quarter of 2026
+        phases = weather_utils.calculate_astro_data(
+            0, 0, ['2026-01-18', '2026-01-26', '2026-02-01', '2026-02-09']
+        )
+        self.assertEqual(
+            [astro['moon_phase'] for astro in phases],
+            ['New Moon', 'First Quarter', 'Full Moon', 'Last Quarter']
+        )
+        self.assertTrue(
+            {astro['moon_phase'] for astro in phases}
+            <= set(weather_utils.MOON_PHASES)
+        )
+
+    def test_local_time_formatting(self):
+        timestamp = datetime(2026, 7, 1, 12, 30, tzinfo=pytz.utc).timestamp()
+        for tz_id, expected in (
+            ('UTC', '12:30 PM'), ('Europe/Kyiv', '03:30 PM'),
+            ('America/New_York', '08:30 AM'),
+        ):
+            self.assertEqual(
+                weather_utils._format_astro_time(
+                    timestamp, pytz.timezone(tz_id)
+                ),
+                expected
+            )
+
+
+class RateMatrixTests(SimpleTestCase):
+    """
+    Cross rates are derived through UAH: the bank buys the source
+    currency at its purchase rate and sells the target currency at its
+    sale rate.
+    """
+
+    def setUp(self):
+        self.rate_matrix = exchanger_utils.RateMatrix([
+            {'currency': 'EUR', 'purchaseRate': 44.0, 'saleRate': 45.0},
+            {'currency': 'USD', 'purchaseRate': 40.0, 'saleRate': 41.0},
+            {'currency': 'PLN', 'saleRateNB': 10.0, 'purchaseRateNB': 10.0,
+             'saleRate': 10.5},
+            {'currency': 'UAH', 'purchaseRate': 1.0, 'saleRate': 1.0},
+        ], '19.10.2026')
+
+    def test_uah_to_currency(self):
+        self.assertAlmostEqual(
+            self.rate_matrix.cross_rate('UAH', 'USD'), 1 / 41.0
+        )
+
+    def test_currency_to_uah(self):
+        self.assertEqual(self.rate_matrix.cross_rate('USD', 'UAH'), 40.0)
+
+    def test_cross_rate_between_currencies(self):
+        self.assertAlmostEqual(
+            self.rate_matrix.cross_rate('EUR', 'USD'), 44.0 / 41.0
+        )
+        # A missing purchase rate falls back to the sale rate
+        self.assertAlmostEqual(
+            self.rate_matrix.cross_rate('PLN', 'EUR'), 10.5 / 45.0
+        )
+        self.assertEqual(self.rate_matrix.cross_rate('USD', 'USD'), 40 / 41)
+
+    def test_unknown_currency(self):
+        self.assertIsNone(self.rate_matrix.cross_rate('XYZ', 'UAH'))
+        self.assertIsNone(self.rate_matrix.cross_rate('UAH', 'XYZ'))
+        converted = self.rate_matrix.convert_many(
+            [100, 100, 100], ['USD', 'XYZ', 'UAH'], ['UAH', 'USD', 'XYZ']
+        )
+        self.assertEqual(converted[0], 4000.0)
+        self.assertTrue(np.isnan(converted[1:]).all())
+
+    def test_convert_many_matches_convert_currency(self):
+        pairs = [('USD', 'EUR'), ('EUR', 'UAH'), ('UAH', 'PLN')]
+        converted = self.rate_matrix.convert_many(
+            [123.45] * len(pairs), *zip(*pairs)
+        ).tolist()
+        for (from_currency, to_currency), amount in zip(pairs, converted):
+            expected, error = asyncio.run(exchanger_utils.convert_currency(
+                123.45, from_currency, to_currency, self.rate_matrix,
+                translations['en']
+            ))
+            self.assertIsNone(error)
+            self.assertEqual(amount, expected)
+
+    def test_compact_round_trip(self):
+        compact = json.loads(json.dumps(self.rate_matrix.compact()))
+        self.assertEqual(compact['version'], self.rate_matrix.version)
+        self.assertEqual(compact['currencies'], ['USD', 'EUR', 'PLN', 'UAH'])
+        index = {
+            currency: position
+            for position, currency in enumerate(compact['currencies'])
+        }
+        # currency_converter.js computes buy[from] / sell[to]
+        for from_currency in compact['currencies']:
+            for to_currency in compact['currencies']:
+                self.assertAlmostEqual(
+                    compact['buy'][index[from_currency]]
+                    / compact['sell'][index[to_currency]],
+                    self.rate_matrix.cross_rate(from_currency, to_currency)
+                )
+
+    def test_table(self):
+        self.assertEqual(
+            [rate['currency'] for rate in self.rate_matrix.table()],
+            ['USD', 'EUR', 'PLN']
+        )
+        self.assertEqual(
+            [rate['currency'] for rate in self.rate_matrix.table(
+                {'PLN', 'USD', 'UAH', 'XYZ'}
+            )],
+            ['USD', 'PLN']
+        )
+
+
+class ConvertCurrencyApiTests(SimpleTestCase):
+    """
+    Conversions only accept finite amounts and report why a conversion
+    failed.
+    """
+
+    def setUp(self):
+        rate_matrix = exchanger_utils.RateMatrix([
+            {'currency': 'USD', 'purchaseRate': 41.0, 'saleRate': 41.5},
+            {'currency': 'CZK', 'purchaseRate': 1.7, 'saleRate': 0.0},
+        ], '19.10.2026')
+        patcher = mock.patch(
+            'newsapp.views.get_rate_matrix',
+            new=mock.AsyncMock(return_value=rate_matrix)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('newsapp:convert_currency_api')
+
+    def convert(self, amount, from_currency, to_currency):
+        """Request one conversion and return the response."""
+        return self.client.get(self.url, {
+            'amount': amount, 'from_currency': from_currency,
+            'to_currency': to_currency,
+        })
+
+    def test_non_finite_amounts_are_rejected(self):
+        for amount in ('inf', '-inf', 'nan'):
+            with self.subTest(amount=amount):
+                response = self.convert(amount, 'USD', 'UAH')
+                self.assertEqual(response.status_code, 400)
+
+    def test_failed_conversions_report_their_reason(self):
+        transl = translations['en']
+        for amount, to_currency, error in (
+            (0, 'CZK', transl['conversion_division_error']),
+            (10, 'CZK', transl['conversion_division_error']),
+            (10, 'XYZ', transl['conversion_rate_not_found']),
+            (1e308, 'UAH', transl['conversion_amount_too_large']),
+        ):
+            with self.subTest(amount=amount, to_currency=to_currency):
+                conversion = self.convert(
+                    amount, 'USD', to_currency
+                ).json()['conversions'][0]
+                self.assertIsNone(conversion['converted_amount'])
+                self.assertEqual(conversion['error'], error)
+
+    def test_conversion(self):
+        conversion = self.convert(10, 'USD', 'UAH').json()['conversions'][0]
+        self.assertEqual(conversion['converted_amount'], 410.0)
+
+
+class NewsOverviewApiTests(SimpleTestCase):
+    """
+    Formatting the overview leaves the fetch result shared with
+    concurrent requests untouched.
+    """
+
+    def test_shared_articles_are_not_modified(self):
+        article = {
+            'title': 'Headline', 'url': 'https://example.com/1',
+            'source': 'Example', 'thumbnail': 'a' * 40,
+            'published_at': '19 10 06:17',
+        }
+        shared = Future()
+        shared.set_result([article])
+        original = dict(article)
+        with mock.patch(
+            'newsapp.utils.news_utils.get_cached_headlines', return_value={}
+        ), mock.patch(
+            'newsapp.utils.news_utils.run_shared', return_value=shared
+        ):
+            for _ in range(2):
+                response = self.client.get(
+                    reverse('newsapp:news_overview_api')
+                )
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(article, original)
+
+
+class WeatherHistoryTests(TestCase):
+    """
+    The weather history resolves cities from the names recorded with
+    their observations or from the geocoding cache, never the API.
+    """
+
+    def setUp(self):
+        patcher = mock.patch(
+            'newsapp.utils.location_utils.aiohttp.ClientSession',
+            side_effect=AssertionError('Geocoding API called')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('newsapp:weather_history')
+
+    def test_unknown_city_is_not_geocoded(self):
+        response = self.client.get(self.url, {'city': 'Atlantis'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_city_is_served(self):
+        cache.set(generate_cache_key('geocode', 'Lviv'), {
+            'lat': 49.8397, 'lon': 24.0297,
+        })
+        self.addCleanup(cache.delete, generate_cache_key('geocode', 'Lviv'))
+        response = self.client.get(self.url, {'city': 'Lviv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['location'], '49.84,24.03')
+
+    def test_recorded_city_is_served_without_the_cache(self):
+        geo_data = {'lat': 49.8397, 'lon': 24.0297, 'city_en': 'Lviv'}
+        weather_data = {
+            'tz_id': 'Europe/Kyiv',
+            'current': {
+                'update_time': '2026-10-19 09:00', 'temperature_c': 11.0,
+                'feelslike_c': 10.0, 'humidity': 70, 'wind_kph': 9.0,
+                'pressure_mb': 1015.0, 'visibility_km': 10.0,
+                'uv_index': 2.0,
+            },
+        }
+        with mock.patch(
+            'newsapp.utils.weather_history_utils.'
+            'ensure_weather_history_retention'
+        ):
+            record_weather_observations(
+                [('Львів', geo_data, weather_data)]
+            )
+        for city in ('львів', 'LVIV'):
+            with self.subTest(city=city):
+                response = self.client.get(self.url, {'city': city})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['location'], '49.84,24.03')
+
+        prune_weather_history(days=0)
+        response = self.client.get(self.url, {'city': 'Lviv'})
+        self.assertEqual(response.status_code, 404)
+
+
+class WeatherBulkTests(TestCase):
+    """
+    A bulk weather request reports the status of every city and sends
+    all geocoded cities to the weather API in one request.
+    """
+
+    geo_data = {
+        'Kyiv': {
+            'lat': 50.45, 'lon': 30.52, 'city_en': 'Kyiv',
+            'region': 'Kyiv City', 'country_name': 'Ukraine',
+            'country_code': 'UA',
+        },
+        'Lviv': {
+            'lat': 49.84, 'lon': 24.03, 'city_en': 'Lviv',
+            'region': 'Lviv Oblast', 'country_name': 'Ukraine',
+            'country_code': 'UA',
+        },
+    }
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+        self.url = reverse('newsapp:weather_bulk')
+        patcher = mock.patch(
+            'newsapp.utils.weather_utils.geocode_city',
+            new=mock.AsyncMock(side_effect=self.geocode_city)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            'newsapp.utils.weather_utils.schedule_weather_observations'
+        )
+        self.schedule_observations = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        response = mock.MagicMock(status=200)
+        response.json = mock.AsyncMock(return_value={'bulk': [
+            {'query': {
+                'custom_id': '0', 'q': '50.45,30.52',
+                'location': {
+                    'name': 'Kyiv', 'region': 'Kyiv City',
+                    'country': 'Ukraine', 'tz_id': 'Europe/Kyiv',
+                    'localtime': '2026-10-19 12:00',
+                },
+                'current': {
+                    'temp_c': 11.0, 'condition': {'text': 'Sunny'},
+                },
+            }},
+            {'query': {
+                'custom_id': '1', 'q': '49.84,24.03',
+                'error': {'code': 9999, 'message': 'Internal error'},
+            }},
+        ]})
+        self.session = mock.MagicMock()
+        self.session.post.return_value.__aenter__.return_value = response
+        patcher = mock.patch(
+            'newsapp.utils.weather_utils.aiohttp.ClientSession'
+        )
+        self.client_session = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client_session.return_value.__aenter__.return_value = (
+            self.session
+        )
+
+    async def geocode_city(self, city_name, transl=None):
+        """Geocode the known cities and reject all others."""
+        if city_name not in self.geo_data:
+            raise GeocodingError(f'{city_name} not found')
+        return self.geo_data[city_name]
+
+    def test_mixed_batch(self):
+        response = self.client.get(self.url, {'city': 'Kyiv,Atlantis,Lviv'})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['cities']
+        self.assertEqual(
+            [(result['city'], result['status']) for result in results],
+            [('Kyiv', 'ok'), ('Atlantis', 'not_found'), ('Lviv', 'error')]
+        )
+        self.assertEqual(
+            results[0]['weather']['current']['temperature_c'], 11.0
+        )
+        self.assertIn('Atlantis', results[1]['error'])
+        self.assertNotIn('weather', results[2])
+        [entries], _ = self.schedule_observations.call_args
+        self.assertEqual(
+            [(city, geo_data) for city, geo_data, _ in entries],
+            [('Kyiv', self.geo_data['Kyiv'])]
+        )
+
+        self.session.post.assert_called_once()
+        self.assertEqual(
+            self.session.post.call_args.kwargs['json']['locations'],
+            [
+                {'q': '50.45,30.52', 'custom_id': '0'},
+                {'q': '49.84,24.03', 'custom_id': '1'},
+            ]
+        )
+
+    def test_cached_city_is_not_fetched_again(self):
+        self.client.get(self.url, {'city': 'Kyiv'})
+        response = self.client.get(self.url, {'city': 'Kyiv'})
+        self.assertEqual(response.json()['cities'][0]['status'], 'ok')
+        self.session.post.assert_called_once()
+
+    def test_city_limit(self):
+        limit = weather_utils.BULK_WEATHER_LIMIT
+        cities = [f'City {index}' for index in range(limit + 1)]
+        response = self.client.get(self.url, {'city': cities})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(limit), response.json()['error'])
+        self.client_session.assert_not_called()
+
+
+class FavouriteWeatherTests(TransactionTestCase):
+    """
+    The weather of active users' favourite cities is refreshed in every
+    language with the bulk weather API. The command reads the
+    favourites from a worker thread, so the test data is committed.
+    """
+
+    def setUp(self):
+        now = timezone.now()
+        for username, cities, last_login in (
+            ('active', ['Kyiv', 'Lviv'], now),
+            ('other', ['kyiv', 'Odesa'], now - timedelta(days=1)),
+            ('inactive', ['Kharkiv'], now - timedelta(days=30)),
+        ):
+            user = User.objects.create_user(username, last_login=last_login)
+            user.profile.favourite_cities = cities
+            user.profile.save()
+
+    def test_active_cities_are_collected_once(self):
+        self.assertEqual(
+            sorted(get_active_favourite_cities()), ['Kyiv', 'Lviv', 'Odesa']
+        )
+
+    def test_command_refreshes_every_language(self):
+        async def fetch_bulk(cities, transl, language, data_type, refresh):
+            return [
+                {'city': city, 'status': 'ok' if city != 'Odesa' else 'error'}
+                for city in cities
+            ]
+
+        fetch = mock.AsyncMock(side_effect=fetch_bulk)
+        stdout = StringIO()
+        with mock.patch(
+            'newsapp.utils.favourites_utils.fetch_weather_data_bulk', new=fetch
+        ):
+            call_command('refresh_favourite_weather', stdout=stdout)
+
+        self.assertEqual(fetch.await_count, len(translations))
+        for call, language in zip(fetch.await_args_list, translations):
+            self.assertEqual(sorted(call.args[0]), ['Kyiv', 'Lviv', 'Odesa'])
+            self.assertEqual(call.args[2], language)
+            self.assertEqual(
+                call.kwargs, {'data_type': 'both', 'refresh': True}
+            )
+        self.assertIn('Refreshed weather for 2 cities', stdout.getvalue())
+
+
+class EmptyForecastTests(TestCase):
+    """
+    The weather page and the forecast API handle weather data without
+    any forecast days.
+    """
+
+    def setUp(self):
+        weather_data = weather_utils.process_current_weather_data({
+            'location': {
+                'name': 'Kyiv', 'region': 'Kyiv City', 'country': 'Ukraine',
+                'tz_id': 'Europe/Kyiv', 'localtime': '2026-10-19 12:00',
+            },
+            'current': {
+                'temp_c': 11.0, 'last_updated': '2026-10-19 11:45',
+                'condition': {'text': 'Sunny', 'icon': '//cdn/113.png'},
+            },
+        }, 'N/A')
+        weather_utils.add_location_data(weather_data, {
+            'lat': 50.45, 'lon': 30.52, 'city_en': 'Kyiv',
+            'region': 'Kyiv City', 'country_name': 'Ukraine',
+            'country_code': 'UA',
+        }, 'N/A')
+        weather_data['forecast'] = []
+
+        for target, new in (
+            ('newsapp.views.fetch_weather_data',
+             mock.AsyncMock(return_value=weather_data)),
+            ('newsapp.views.process_city_info',
+             mock.AsyncMock(return_value=(
+                 'Kyiv', 'Kyiv City', 'Ukraine', 'Weather in'
+             ))),
+        ):
+            patcher = mock.patch(target, new=new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_weather_page_is_rendered(self):
+        response = self.client.get(
+            reverse('newsapp:weather'), {'city': 'Kyiv'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['hourly_forecast'])
+        self.assertIsNone(response.context['error_message'])
+
+    def test_forecast_day_is_rejected(self):
+        response = self.client.get(
+            reverse('newsapp:weather_forecast'), {'city': 'Kyiv', 'day': 0}
+        )
+        self.assertEqual(response.status_code, 400)
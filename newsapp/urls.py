@@ -10,6 +10,31 @@ urlpatterns = [
         views.NewsView.as_view(),
         name='news_by_category'
     ),
+    path(
+        'news-overview/',
+        views.NewsOverviewView.as_view(),
+        name='news_overview'
+    ),
+    path(
+        'api/news/overview/',
+        views.NewsOverviewApiView.as_view(),
+        name='news_overview_api'
+    ),
+    path(
+        'api/news/search/',
+        views.NewsSearchView.as_view(),
+        name='news_search'
+    ),
+    path(
+        'api/news/<str:category>/',
+        views.NewsPageView.as_view(),
+        name='news_page'
+    ),
+    path(
+        'news/thumbnail/<str:url_hash>/',
+        views.NewsThumbnailView.as_view(),
+        name='news_thumbnail'
+    ),
     path(
         'exchange-rates/',
         views.ExchangeRatesView.as_view(),
@@ -20,14 +45,39 @@ urlpatterns = [
         views.ConvertCurrencyView.as_view(),
         name='convert_currency'
     ),
+    path(
+        'api/exchange-rates/convert/',
+        views.ConvertCurrencyApiView.as_view(),
+        name='convert_currency_api'
+    ),
+    path(
+        'api/exchange-rates/stream/',
+        views.ExchangeRatesStreamView.as_view(),
+        name='exchange_rates_stream'
+    ),
+    path(
+        'api/exchange-rates/history/',
+        views.ExchangeRateHistoryView.as_view(),
+        name='exchange_rate_history'
+    ),
     path(
         'weather/',
         views.WeatherView.as_view(),
         name='weather'
     ),
     path(
-        'set_timezone/',
-        views.set_timezone,
-        name='set_timezone'
+        'api/weather/forecast/',
+        views.WeatherForecastView.as_view(),
+        name='weather_forecast'
+    ),
+    path(
+        'api/weather/history/',
+        views.WeatherHistoryView.as_view(),
+        name='weather_history'
+    ),
+    path(
+        'api/weather/bulk/',
+        views.WeatherBulkView.as_view(),
+        name='weather_bulk'
     ),
 ]
@@ -0,0 +1,214 @@
+import contextvars
+import threading
+import logging
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+# Limits for deduplicated background tasks (e.g. prefetches)
+MAX_PENDING_TASKS = 20
+MAX_CONCURRENT_TASKS = 4
+
+_loop = None
+_lock = threading.Lock()
+_periodic_jobs = set()
+_in_flight = set()
+_shared = {}
+_semaphore = None
+
+
+def get_background_loop():
+    """
+    Return the event loop used for background work, starting it if needed.
+
+    The loop runs forever in a daemon thread, so coroutines scheduled on it
+    outlive the request that scheduled them, both under WSGI and ASGI.
+
+    Returns:
+    AbstractEventLoop: The running background event loop.
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever,
+                name='newsapp-background',
+                daemon=True
+            )
+            thread.start()
+    return _loop
+
+
+def run_in_background(coro):
+    """
+    Schedule a coroutine on the background event loop.
+
+    The coroutine runs in an empty context rather than in a copy of the
+    caller's, so it does not inherit the executor of the request that
+    scheduled it, which is shut down once the request is finished.
+
+    Parameters:
+    coro (coroutine): The coroutine to run.
+
+    Returns:
+    concurrent.futures.Future: Future holding the coroutine's result.
+    """
+    return _submit(coro, get_background_loop())
+
+
+def _submit(coro, loop):
+    """Schedule a coroutine on a loop in an empty context."""
+    return contextvars.Context().run(
+        asyncio.run_coroutine_threadsafe, coro, loop
+    )
+
+
+def schedule_periodic(name, coro_func, interval):
+    """
+    Run a coroutine function on the background loop every `interval` seconds.
+
+    A job is started only once per process; later calls with the same name
+    are ignored.
+
+    Parameters:
+    name (str): Unique name of the job.
+    coro_func (callable): Coroutine function called without arguments.
+    interval (int): Number of seconds between two runs.
+
+    Returns:
+    bool: True if the job was started by this call, otherwise False.
+    """
+    with _lock:
+        if name in _periodic_jobs:
+            return False
+        _periodic_jobs.add(name)
+    run_in_background(_run_periodically(name, coro_func, interval))
+    return True
+
+
+def schedule_daily(name, coro_func, get_delay):
+    """
+    Run a coroutine function on the background loop at a daily moment.
+
+    A job is started only once per process; later calls with the same name
+    are ignored.
+
+    Parameters:
+    name (str): Unique name of the job.
+    coro_func (callable): Coroutine function called without arguments.
+    get_delay (callable): Returns the number of seconds until the next run.
+
+    Returns:
+    bool: True if the job was started by this call, otherwise False.
+    """
+    with _lock:
+        if name in _periodic_jobs:
+            return False
+        _periodic_jobs.add(name)
+    run_in_background(_run_daily(name, coro_func, get_delay))
+    return True
+
+
+def run_deduplicated(key, coro_func, *args, **kwargs):
+    """
+    Run a coroutine function in the background unless it is already running.
+
+    Tasks with the same key are deduplicated while one is pending or
+    running. At most MAX_PENDING_TASKS tasks are accepted at a time and
+    at most MAX_CONCURRENT_TASKS of them run concurrently, so bursts of
+    requests cannot overload upstream services.
+
+    Parameters:
+    key (str): Key identifying the work, e.g. the prefetched resource.
+    coro_func (callable): Coroutine function to call.
+    *args, **kwargs: Arguments passed to the coroutine function.
+
+    Returns:
+    bool: True if the task was scheduled, False if it was a duplicate
+          or the limit of pending tasks was reached.
+    """
+    with _lock:
+        if key in _in_flight or len(_in_flight) >= MAX_PENDING_TASKS:
+            return False
+        _in_flight.add(key)
+    run_in_background(_run_limited(key, coro_func, args, kwargs))
+    return True
+
+
+def run_shared(key, coro_func, *args, **kwargs):
+    """
+    Run a coroutine function in the background and share its result.
+
+    Callers asking for the same key while the task is pending or running
+    get the same future, so concurrent requests start the work only once.
+    The task runs under the same concurrency limit as run_deduplicated
+    and keeps running when a caller stops waiting for it, e.g. after a
+    deadline.
+
+    Parameters:
+    key (str): Key identifying the work, e.g. the fetched resource.
+    coro_func (callable): Coroutine function to call.
+    *args, **kwargs: Arguments passed to the coroutine function.
+
+    Returns:
+    concurrent.futures.Future: Future holding the coroutine's result.
+    """
+    loop = get_background_loop()
+    with _lock:
+        future = _shared.get(key)
+        if future is None:
+            future = _submit(_run_shared(key, coro_func, args, kwargs), loop)
+            _shared[key] = future
+    return future
+
+
+def _get_semaphore():
+    """Return the concurrency limit of the background tasks."""
+    global _semaphore
+    # Only ever touched from the background loop's thread
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+    return _semaphore
+
+
+async def _run_shared(key, coro_func, args, kwargs):
+    """Run a shared task under the concurrency limit."""
+    try:
+        async with _get_semaphore():
+            return await coro_func(*args, **kwargs)
+    finally:
+        with _lock:
+            _shared.pop(key, None)
+
+
+async def _run_limited(key, coro_func, args, kwargs):
+    """Run a deduplicated task under the concurrency limit."""
+    try:
+        async with _get_semaphore():
+            await coro_func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task '{key}' failed")
+    finally:
+        with _lock:
+            _in_flight.discard(key)
+
+
+async def _run_periodically(name, coro_func, interval):
+    """Call a coroutine function forever, logging but surviving errors."""
+    while True:
+        try:
+            await coro_func()
+        except Exception:
+            logger.exception(f"Background job '{name}' failed")
+        await asyncio.sleep(interval)
+
+
+async def _run_daily(name, coro_func, get_delay):
+    """Sleep until every next run of a daily job, surviving errors."""
+    while True:
+        await asyncio.sleep(get_delay())
+        try:
+            await coro_func()
+        except Exception:
+            logger.exception(f"Background job '{name}' failed")
@@ -189,6 +189,11 @@ class IncompleteWeatherDataError(APIError):
     pass
 
 
+class ThumbnailError(Exception):
+    """Raised when a news thumbnail cannot be provided."""
+    pass
+
+
 async def handle_news_api_error(response):
     """
     Handle errors based on the response status code and error code
@@ -0,0 +1,214 @@
+from django.db import DatabaseError
+
+from datetime import timedelta
+import numpy as np
+import logging
+
+from ..models import ExchangeRate, ExchangeRateGap
+
+logger = logging.getLogger(__name__)
+
+# Rate columns of the history, named after the model fields
+EXCHANGE_HISTORY_FIELDS = (
+    'sale_rate_nb', 'purchase_rate_nb', 'purchase_rate', 'sale_rate',
+)
+
+# PrivatBank field names of the rate columns
+PRIVATBANK_FIELDS = {
+    'sale_rate_nb': 'saleRateNB',
+    'purchase_rate_nb': 'purchaseRateNB',
+    'purchase_rate': 'purchaseRate',
+    'sale_rate': 'saleRate',
+}
+
+# Upper limits of the days and points of one history query
+MAX_EXCHANGE_HISTORY_DAYS = 10 * 366
+MAX_EXCHANGE_HISTORY_POINTS = 400
+
+
+def record_exchange_rates(rate_date, rates):
+    """
+    Store the exchange rates of one day.
+
+    Rates already stored for the day are updated, since PrivatBank may
+    still adjust the current day's rates. Storage errors are logged and
+    never affect the exchange rates response.
+
+    Parameters:
+    rate_date (date): The day the rates apply to.
+    rates (list): Rate entries of the PrivatBank 'exchangeRate' list.
+
+    Returns:
+    int: Number of stored currencies.
+    """
+    rows = [
+        ExchangeRate(
+            currency=rate['currency'],
+            date=rate_date,
+            **{
+                field: rate.get(api_field)
+                for field, api_field in PRIVATBANK_FIELDS.items()
+            }
+        )
+        for rate in rates
+        if rate.get('currency') and rate['currency'] != 'UAH'
+        and rate.get('saleRateNB') is not None
+        and rate.get('purchaseRateNB') is not None
+    ]
+    if not rows:
+        return 0
+
+    try:
+        ExchangeRate.objects.bulk_create(
+            rows, update_conflicts=True,
+            unique_fields=['currency', 'date'],
+            update_fields=list(EXCHANGE_HISTORY_FIELDS)
+        )
+    except DatabaseError as e:
+        logger.error(f"Error storing exchange rates for {rate_date}: {e}")
+        return 0
+    return len(rows)
+
+
+def get_stored_rate_dates(start, end):
+    """
+    Return the days of a range that already have stored rates.
+
+    Parameters:
+    start (date): First day of the range.
+    end (date): Last day of the range.
+
+    Returns:
+    set: The stored days.
+    """
+    return set(
+        ExchangeRate.objects.filter(
+            date__range=(start, end)
+        ).values_list('date', flat=True).distinct()
+    )
+
+
+def record_exchange_rate_gap(rate_date):
+    """
+    Remember a past day for which the PrivatBank archive has no rates.
+
+    Parameters:
+    rate_date (date): The day without rates.
+    """
+    try:
+        ExchangeRateGap.objects.get_or_create(date=rate_date)
+    except DatabaseError as e:
+        logger.error(f"Error storing exchange rate gap {rate_date}: {e}")
+
+
+def get_rate_gap_dates(start, end):
+    """
+    Return the days of a range that are known to have no rates.
+
+    Parameters:
+    start (date): First day of the range.
+    end (date): Last day of the range.
+
+    Returns:
+    set: The days without rates.
+    """
+    return set(
+        ExchangeRateGap.objects.filter(
+            date__range=(start, end)
+        ).values_list('date', flat=True)
+    )
+
+
+def get_exchange_rate_history(currencies, start, end, points):
+    """
+    Return the daily rates of several currencies in a date range.
+
+    This function:
+    - Loads the rates of the range with one indexed query into a
+      day × currency × field array, with NaN for missing values.
+    - Downsamples it on the server if the range holds more than `points`
+      days: the range is split into `points` equal buckets of days and
+      every non-empty bucket is reduced to the mean of its values.
+
+    Parameters:
+    currencies (list): Currency codes to include.
+    start (date): First day of the range.
+    end (date): Last day of the range.
+    points (int): Maximum number of points to return.
+
+    Returns:
+    dict: The list of 'date' values (ISO 8601, the first day of each
+          bucket when downsampled) and, per currency, a list per field
+          in EXCHANGE_HISTORY_FIELDS with None for missing values.
+    """
+    rows = list(
+        ExchangeRate.objects.filter(
+            currency__in=currencies, date__range=(start, end)
+        ).values_list('currency', 'date', *EXCHANGE_HISTORY_FIELDS)
+    )
+    history = {
+        'date': [],
+        'rates': {
+            currency: {field: [] for field in EXCHANGE_HISTORY_FIELDS}
+            for currency in currencies
+        },
+    }
+    if not rows:
+        return history
+
+    dates = sorted({row[1] for row in rows})
+    date_index = {day: index for index, day in enumerate(dates)}
+    currency_index = {
+        currency: index for index, currency in enumerate(currencies)
+    }
+
+    values = np.full(
+        (len(dates), len(currencies), len(EXCHANGE_HISTORY_FIELDS)), np.nan
+    )
+    for currency, day, *rates in rows:
+        values[date_index[day], currency_index[currency]] = [
+            np.nan if rate is None else rate for rate in rates
+        ]
+
+    if len(dates) > points:
+        offsets = np.array(
+            [(day - start).days for day in dates], dtype=float
+        )
+        span = (end - start).days + 1
+        buckets = (offsets / span * points).astype(int)
+        bucket_ids, first_positions = np.unique(buckets, return_index=True)
+
+        sums = np.zeros((len(bucket_ids),) + values.shape[1:])
+        counts = np.zeros_like(sums)
+        positions = np.searchsorted(bucket_ids, buckets)
+        present = ~np.isnan(values)
+        np.add.at(sums, positions, np.where(present, values, 0.0))
+        np.add.at(counts, positions, present)
+        with np.errstate(invalid='ignore'):
+            values = sums / counts
+        dates = [dates[position] for position in first_positions]
+
+    history['date'] = [day.isoformat() for day in dates]
+    rounded = np.round(values, 4)
+    for currency, currency_position in currency_index.items():
+        for field_position, field in enumerate(EXCHANGE_HISTORY_FIELDS):
+            column = rounded[:, currency_position, field_position]
+            history['rates'][currency][field] = [
+                None if np.isnan(rate) else rate for rate in column.tolist()
+            ]
+    return history
+
+
+def date_range(start, end):
+    """
+    Return every day from start to end, both inclusive.
+
+    Parameters:
+    start (date): First day.
+    end (date): Last day.
+
+    Returns:
+    list: The days in ascending order.
+    """
+    return [start + timedelta(days=offset)
+            for offset in range((end - start).days + 1)]
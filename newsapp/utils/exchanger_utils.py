@@ -1,10 +1,26 @@
 from django.core.cache import cache
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from asgiref.sync import sync_to_async
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
+import numpy as np
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import pytz
+import weakref
 
-from .exceptions import handle_exchange_api_error
+from .background import schedule_daily
+from .exceptions import APIError, handle_exchange_api_error
+from .exchange_history_utils import (
+    date_range, get_rate_gap_dates, get_stored_rate_dates,
+    record_exchange_rate_gap, record_exchange_rates
+)
+from .utils import generate_cache_key
+
+logger = logging.getLogger(__name__)
 
 # Currency name mappings for different languages
 CURRENCY_MAP = {
@@ -30,112 +46,492 @@ CURRENCY_MAP = {
 
 API_URL = 'https://api.privatbank.ua/p24api/exchange_rates?json&date='
 
+# Limits of the archive backfill: concurrent requests and the pause
+# in seconds each of them takes before the next request
+BACKFILL_CONCURRENCY = 3
+BACKFILL_REQUEST_INTERVAL = 1.0
 
-async def fetch_exchange_rates(filter_currencies=None):
+# PrivatBank sets its rates for Kyiv dates
+KYIV_TZ = pytz.timezone('Europe/Kyiv')
+
+# The day's rates are updated until this hour in Kyiv and are
+# re-checked every RATES_PUBLISHING_TIMEOUT seconds until then
+RATES_PUBLISHED_HOUR = 10
+RATES_PUBLISHING_TIMEOUT = 30 * 60
+
+# Timeout in seconds while the day's rates are not published yet
+RATES_RETRY_TIMEOUT = 5 * 60
+
+# Seconds after midnight in Kyiv before the new day's rates are fetched
+ROLLOVER_PREFETCH_DELAY = 60
+
+# First pause in seconds before the rollover prefetch retries unpublished
+# rates; it doubles up to RATES_RETRY_TIMEOUT, so the rates are refreshed
+# before the previous day's cached fallback expires
+ROLLOVER_RETRY_DELAY = 60
+
+# Cache key prefix of the rate matrices, changed whenever RateMatrix
+# changes, so that matrices cached by an older release are not read
+RATE_MATRIX_CACHE_PREFIX = 'rate_matrix_v2'
+
+# Callbacks notified of freshly fetched rates, see add_rate_listener
+_rate_listeners = []
+
+# Display order of the currencies in the exchange rates table
+CURRENCY_ORDER = {
+    'USD': 1, 'EUR': 2, 'GBP': 3, 'CHF': 4, 'PLN': 5, 'CZK': 6
+}
+
+
+class RateMatrix:
     """
-    Fetches and caches exchange rates data from PrivatBank API.
+    Exchange rates of one PrivatBank payload, indexed for conversions.
+
+    The payload is turned once into a currency→index map and the cross
+    rates of every pair, including UAH, so conversions, batch conversions
+    and the rates table are plain lookups.
+
+    Attributes:
+    date (str): The rate date of the payload, e.g. '19.10.2026'.
+    version (str): Stamp identifying the rates, changes with any rate.
+    rates (list): Rate entries in display order, without UAH.
+    currencies (tuple): Currency codes of the matrix rows and columns.
+    index (dict): Position of every currency in `currencies`.
+    buy (ndarray): Bank purchase rate of every currency in UAH.
+    sell (ndarray): Bank sale rate of every currency in UAH.
+    cross (ndarray): cross[i, j] is the amount of currency j received for
+                     one unit of currency i: the bank buys currency i for
+                     UAH and sells currency j for UAH. Missing rates are
+                     NaN, a zero sale rate gives infinity.
+    """
+
+    def __init__(self, rates, date=None):
+        self.date = date
+        self.rates = sorted(
+            (
+                rate for rate in rates
+                if 'currency' in rate and rate['currency'] != 'UAH'
+            ),
+            key=lambda rate: CURRENCY_ORDER.get(rate['currency'], 999)
+        )
+        self.currencies = tuple(
+            rate['currency'] for rate in self.rates
+        ) + ('UAH',)
+        self.index = {
+            currency: index for index, currency in enumerate(self.currencies)
+        }
+
+        # The bank buys at the purchase rate and sells at the sale rate,
+        # each falling back to the other one if it is not published
+        self.buy = np.array([
+            _rate_value(rate, 'purchaseRate', 'saleRate')
+            for rate in self.rates
+        ] + [1.0])
+        self.sell = np.array([
+            _rate_value(rate, 'saleRate', 'purchaseRate')
+            for rate in self.rates
+        ] + [1.0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.cross = self.buy[:, np.newaxis] / self.sell[np.newaxis, :]
+
+        digest = hashlib.sha1(json.dumps(
+            [self.currencies, self.buy.tolist(), self.sell.tolist()]
+        ).encode()).hexdigest()[:8]
+        self.version = f"{date}-{digest}" if date else digest
+
+    def compact(self):
+        """
+        Return the rates in the compact form used by the browser converter.
+
+        The browser computes buy[from] / sell[to] like `cross`, so it gives
+        the same results as convert_currency.
+
+        Returns:
+        dict: The version stamp, the currency codes and their buy and sell
+              rates in UAH, with None for missing rates.
+        """
+        return {
+            'version': self.version,
+            'currencies': list(self.currencies),
+            'buy': [None if np.isnan(rate) else rate
+                    for rate in self.buy.tolist()],
+            'sell': [None if np.isnan(rate) else rate
+                     for rate in self.sell.tolist()],
+        }
+
+    @property
+    def has_rates(self):
+        """Whether the payload contained the rates of any currency."""
+        return len(self.currencies) > 1
+
+    def table(self, currencies=None):
+        """
+        Return the rate entries of the given currencies in display order.
+
+        Parameters:
+        currencies (set, optional): Currency codes to include.
+                                    Defaults to all currencies.
+
+        Returns:
+        list: The rate entries, without UAH.
+        """
+        if not currencies:
+            return list(self.rates)
+        positions = sorted(
+            self.index[currency] for currency in currencies
+            if currency in self.index and currency != 'UAH'
+        )
+        return [self.rates[position] for position in positions]
+
+    def cross_rate(self, from_currency, to_currency):
+        """
+        Return the rate for converting one currency to another.
+
+        Parameters:
+        from_currency (str): The currency code of the source currency.
+        to_currency (str): The currency code of the target currency.
+
+        Returns:
+        float: The cross rate, infinity if the target sale rate is zero,
+               or None if a currency or one of its rates is missing.
+        """
+        try:
+            rate = self.cross[
+                self.index[from_currency], self.index[to_currency]
+            ]
+        except KeyError:
+            return None
+        return None if np.isnan(rate) else float(rate)
+
+    def convert_many(self, amounts, from_currencies, to_currencies):
+        """
+        Convert several amounts at once.
+
+        Parameters:
+        amounts (list): The amounts to convert.
+        from_currencies (list): The source currency of every amount.
+        to_currencies (list): The target currency of every amount.
+
+        Returns:
+        ndarray: The converted amounts rounded to 2 decimal places, NaN
+                 where no rate is available or the sale rate is zero
+                 (see cross_rate for the reason), and infinity where the
+                 amount is too large.
+        """
+        rows = np.array(
+            [self.index.get(currency, -1) for currency in from_currencies]
+        )
+        columns = np.array(
+            [self.index.get(currency, -1) for currency in to_currencies]
+        )
+        rates = self.cross[rows, columns]
+        rates[(rows < 0) | (columns < 0) | np.isinf(rates)] = np.nan
+        # Amounts too large to convert overflow to infinity
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.round(np.asarray(amounts, dtype=float) * rates, 2)
 
-    This function retrieves the exchange rates for the required currencies
-    from the PrivatBank API. The data is cached for 10 minutes to improve
-    performance.
+
+def _rate_value(rate, key, fallback_key):
+    """Return a rate of an entry as a float, or NaN if it is missing."""
+    value = rate.get(key, rate.get(fallback_key))
+    return np.nan if value is None else float(value)
+
+
+async def fetch_rates_payload(session, rate_date):
+    """
+    Fetches the PrivatBank exchange rates payload of one day.
 
     Parameters:
-    filter_currencies (set, optional): A set of currency codes to filter the
-                                       exchange rates. Defaults to None.
+    session (ClientSession): The HTTP session to use.
+    rate_date (date): The day to fetch the rates for.
 
     Returns:
-    list: A list of exchange rates for the required currencies.
+    dict: The PrivatBank response with its 'date' and 'exchangeRate' list.
+    """
+    url = f"{API_URL}{rate_date.strftime('%d.%m.%Y')}"
+
+    async with session.get(url) as response:
+        if response.status != 200:
+            await handle_exchange_api_error(response)
+
+        return await response.json()
+
+
+def get_kyiv_today():
+    """Return the current date in Kyiv, where PrivatBank sets its rates."""
+    return datetime.now(KYIV_TZ).date()
+
+
+def get_rates_cache_timeout(rate_date, has_rates):
+    """
+    Return how long the rates of a day may be cached.
+
+    This function:
+    - Keeps past days for a day, as their rates no longer change.
+    - Retries soon if the day's rates are not published yet.
+    - Re-checks the current day's rates regularly until PrivatBank's
+      morning update is over, then keeps them until the next midnight
+      in Kyiv, when the rollover prefetch replaces them.
+
+    Parameters:
+    rate_date (date): The day of the rates.
+    has_rates (bool): Whether the payload contained any rates.
+
+    Returns:
+    int: The cache timeout in seconds.
+    """
+    now = datetime.now(KYIV_TZ)
+    if rate_date < now.date():
+        return 24 * 60 * 60
+    if not has_rates:
+        return RATES_RETRY_TIMEOUT
+    if now.hour < RATES_PUBLISHED_HOUR:
+        return RATES_PUBLISHING_TIMEOUT
+    return max(int(get_seconds_until_rollover(now)), RATES_RETRY_TIMEOUT)
+
+
+def get_seconds_until_rollover(now=None):
+    """
+    Return the number of seconds until the next midnight in Kyiv.
+
+    Parameters:
+    now (datetime, optional): The current time. Defaults to now in Kyiv.
+
+    Returns:
+    float: The seconds left until the rate date changes.
+    """
+    now = now or datetime.now(KYIV_TZ)
+    next_midnight = KYIV_TZ.localize(
+        datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    )
+    return (next_midnight - now).total_seconds()
+
+
+async def get_rate_matrix(rate_date=None, refresh=False):
+    """
+    Fetches and caches the exchange rates from PrivatBank API.
+
+    The payload is turned into a RateMatrix once per refresh and cached
+    under its rate date, with a timeout that follows PrivatBank's
+    publishing schedule (see get_rates_cache_timeout). If the day's rates
+    are not published yet, the previous day's rates are served meanwhile.
+    Every fetched payload is also added to the exchange rate history.
+
+    Parameters:
+    rate_date (date, optional): The day of the rates. Defaults to today
+                                in Kyiv.
+    refresh (bool): If True, cached rates are ignored and fetched again
+                    (default: False).
+
+    Returns:
+    RateMatrix: The indexed exchange rates.
     """
-    cache_key = 'exchange_rates'
-    exchange_rates = await sync_to_async(cache.get)(cache_key)
+    ensure_exchange_rates_rollover()
 
-    if not exchange_rates:
-        today = datetime.today().strftime('%d.%m.%Y')
-        url = f'{API_URL}{today}'
+    rate_date = rate_date or get_kyiv_today()
+    cache_key = generate_cache_key(
+        RATE_MATRIX_CACHE_PREFIX, rate_date.isoformat()
+    )
+    rate_matrix = None if refresh else await sync_to_async(cache.get)(
+        cache_key
+    )
 
+    if not rate_matrix:
         async with ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    await handle_exchange_api_error(response)
-
-                data = await response.json()
-
-                exchange_rates = [
-                    rate for rate in data['exchangeRate']
-                    if 'currency' in rate and rate['currency'] != 'UAH'
-                ]
-
-                # Sort exchange rates by custom order
-                custom_order = {
-                    'USD': 1, 'EUR': 2, 'GBP': 3, 'CHF': 4, 'PLN': 5, 'CZK': 6
-                }
-                exchange_rates.sort(
-                    key=lambda x: custom_order.get(x['currency'], 999)
+            data = await fetch_rates_payload(session, rate_date)
+
+        rate_matrix = RateMatrix(data['exchangeRate'], data.get('date'))
+        has_rates = rate_matrix.has_rates
+
+        if has_rates:
+            await sync_to_async(record_exchange_rates)(
+                rate_date, data['exchangeRate']
+            )
+        elif rate_date == get_kyiv_today():
+            logger.info(f"Exchange rates for {rate_date} not published yet")
+            rate_matrix = await get_rate_matrix(
+                rate_date - timedelta(days=1)
+            )
+
+        await sync_to_async(cache.set)(
+            cache_key, rate_matrix,
+            get_rates_cache_timeout(rate_date, has_rates)
+        )
+
+        for listener_ref in list(_rate_listeners):
+            listener = listener_ref()
+            if listener is None:
+                _rate_listeners.remove(listener_ref)
+            else:
+                listener(rate_matrix)
+
+    return rate_matrix
+
+
+def add_rate_listener(listener):
+    """
+    Register a callback for freshly fetched exchange rates.
+
+    The callback is called with the new RateMatrix in the thread that
+    fetched it, so it must be thread-safe and return quickly.
+
+    Parameters:
+    listener (method): The callback, a bound method that is referenced
+                       weakly and dropped with its object.
+    """
+    _rate_listeners.append(weakref.WeakMethod(listener))
+
+
+async def prefetch_rollover_rates():
+    """
+    Fetch the new day's exchange rates right after midnight in Kyiv,
+    so that no visitor waits for the PrivatBank archive call.
+
+    Until the new day's rates are published, the previous day's rates
+    are served and the fetch is retried with a growing pause, until
+    PrivatBank's morning update is over. Visitors then fetch them again
+    whenever the cached fallback expires.
+    """
+    rate_date = get_kyiv_today()
+    published_date = rate_date.strftime('%d.%m.%Y')
+    delay = ROLLOVER_RETRY_DELAY
+    while True:
+        try:
+            rate_matrix = await get_rate_matrix(rate_date, refresh=True)
+        except (APIError, ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error prefetching exchange rates: {e}")
+        else:
+            if rate_matrix.date == published_date:
+                logger.info(
+                    f"Prefetched exchange rates {rate_matrix.version}"
                 )
+                return
 
-                # Cache the exchange rates for 10 minutes (600 seconds)
-                await sync_to_async(cache.set)(cache_key, exchange_rates, 600)
+        now = datetime.now(KYIV_TZ)
+        if now.date() != rate_date or now.hour >= RATES_PUBLISHED_HOUR:
+            logger.info(f"Exchange rates for {rate_date} not prefetched")
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RATES_RETRY_TIMEOUT)
 
-    # Apply filtering if filter_currencies is provided
-    if filter_currencies:
-        exchange_rates = [
-            rate for rate in exchange_rates
-            if rate['currency'] in filter_currencies
-        ]
 
-    return exchange_rates
+def ensure_exchange_rates_rollover():
+    """
+    Start the daily rollover prefetch of the exchange rates in this process.
+    """
+    schedule_daily(
+        'exchange_rates_rollover', prefetch_rollover_rates,
+        lambda: get_seconds_until_rollover() + ROLLOVER_PREFETCH_DELAY
+    )
+
+
+async def backfill_exchange_rates(
+        start, end, concurrency=BACKFILL_CONCURRENCY
+):
+    """
+    Fills the exchange rate history for a range of days.
+
+    This function:
+    - Skips the days that already have stored rates, and the past days
+      known to have none.
+    - Fetches the remaining days from the PrivatBank archive concurrently,
+      with at most `concurrency` requests in flight and each slot pausing
+      BACKFILL_REQUEST_INTERVAL seconds between requests.
+    - Stores every fetched day as soon as it arrives, and records past
+      days the archive has no rates for (e.g. bank holidays) as gaps.
+
+    Parameters:
+    start (date): First day to backfill.
+    end (date): Last day to backfill.
+    concurrency (int): Maximum number of concurrent requests.
+
+    Returns:
+    tuple: Numbers of stored days, of days without rates and of days
+           that failed.
+    """
+    known_dates = await sync_to_async(get_stored_rate_dates)(start, end)
+    known_dates |= await sync_to_async(get_rate_gap_dates)(start, end)
+    missing = [
+        day for day in date_range(start, end) if day not in known_dates
+    ]
+    today = get_kyiv_today()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def backfill_day(session, day):
+        async with semaphore:
+            try:
+                data = await fetch_rates_payload(session, day)
+                rates = data.get('exchangeRate') or []
+                if not rates and day < today:
+                    await sync_to_async(record_exchange_rate_gap)(day)
+                    return 'gap'
+                stored = await sync_to_async(record_exchange_rates)(
+                    day, rates
+                )
+            except (APIError, ClientError, ValueError) as e:
+                logger.error(
+                    f"Error backfilling exchange rates for {day}: {e}"
+                )
+                stored = 0
+            finally:
+                await asyncio.sleep(BACKFILL_REQUEST_INTERVAL)
+        return 'stored' if stored > 0 else 'failed'
+
+    async with ClientSession() as session:
+        results = await asyncio.gather(
+            *(backfill_day(session, day) for day in missing)
+        )
+
+    return (
+        results.count('stored'), results.count('gap'),
+        results.count('failed')
+    )
+
+
+async def fetch_exchange_rates(filter_currencies=None):
+    """
+    Fetches the exchange rates for the rates table.
+
+    Parameters:
+    filter_currencies (set, optional): A set of currency codes to filter the
+                                       exchange rates. Defaults to None.
+
+    Returns:
+    list: A list of exchange rates for the required currencies.
+    """
+    rate_matrix = await get_rate_matrix()
+    return rate_matrix.table(filter_currencies)
 
 
 async def convert_currency(
-        amount, from_currency, to_currency, exchange_rates, transl
+        amount, from_currency, to_currency, rate_matrix, transl
 ):
     """
     Converts an amount from one currency to another using exchange rates.
 
     This function converts the given amount from the source currency to the
-    target currency using the provided exchange rates. It handles UAH as the
-    base currency.
+    target currency using the precomputed cross rates. UAH is the base
+    currency: the bank buys the source currency for UAH and sells the
+    target currency for UAH.
 
     Parameters:
     amount (float): The amount of money to be converted.
     from_currency (str): The currency code of the source currency.
     to_currency (str): The currency code of the target currency.
-    exchange_rates (list): A list of exchange rates.
+    rate_matrix (RateMatrix): The indexed exchange rates.
 
     Returns:
     float: The converted amount in the target currency, rounded to 2 decimal
            places. Returns None if conversion rates are not found.
     """
-    from_currency_buy_rate = None
-    to_currency_sale_rate = None
-
-    # Handling UAH as the base currency
-    if from_currency == 'UAH':
-        from_currency_buy_rate = 1
-    if to_currency == 'UAH':
-        to_currency_sale_rate = 1
+    rate = rate_matrix.cross_rate(from_currency, to_currency)
 
-    for rate in exchange_rates:
-        if rate['currency'] == from_currency:
-            from_currency_buy_rate = rate.get(
-                'purchaseRate', rate.get('saleRate')
-            )
-        if rate['currency'] == to_currency:
-            to_currency_sale_rate = rate.get(
-                'saleRate', rate.get('purchaseRate')
-            )
-
-    if from_currency_buy_rate is None or to_currency_sale_rate is None:
+    if rate is None:
         error_message = transl['conversion_rate_not_found']
         return None, error_message
 
-    try:
-        amount_in_uah = amount * from_currency_buy_rate
-        converted_amount = amount_in_uah / to_currency_sale_rate
-        return round(converted_amount, 2), None
-    except ZeroDivisionError:
+    if math.isinf(rate):
         error_message = transl['conversion_division_error']
         return None, error_message
-    except Exception as e:
-        error_message = str(e)
-        return None, error_message
+
+    return round(amount * rate, 2), None
@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.utils import timezone
+
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+import logging
+
+from users.models import Profile
+
+from .background import schedule_periodic
+from .translations import translations
+from .utils import generate_cache_key
+from .weather_utils import BULK_WEATHER_LIMIT, fetch_weather_data_bulk
+
+logger = logging.getLogger(__name__)
+
+# Users who logged in within this period count as recently active
+FAVOURITES_ACTIVE_DAYS = 14
+
+# Refresh interval in seconds, shorter than the 1 hour weather cache timeout
+FAVOURITES_REFRESH_INTERVAL = 30 * 60
+
+
+def get_active_favourite_cities():
+    """
+    Collect the favourite cities of all recently active users.
+
+    Returns:
+    list: Distinct city names, compared case-insensitively.
+    """
+    since = timezone.now() - timedelta(days=FAVOURITES_ACTIVE_DAYS)
+    favourites = Profile.objects.filter(
+        user__last_login__gte=since
+    ).exclude(favourite_cities=[]).values_list('favourite_cities', flat=True)
+
+    cities = {}
+    for city_list in favourites:
+        for city in city_list:
+            cities.setdefault(city.lower(), city)
+    return list(cities.values())
+
+
+async def refresh_favourite_weather():
+    """
+    Fetch fresh weather data for the favourite cities of active users.
+
+    The data is fetched in every supported language with the bulk weather
+    API and stored under the keys used by the weather page, so that
+    favourite cities are always served from the cache.
+
+    Returns:
+    int: Number of cities whose weather data was refreshed.
+    """
+    cities = await sync_to_async(get_active_favourite_cities)()
+    refreshed = set()
+
+    for language, transl in translations.items():
+        for start in range(0, len(cities), BULK_WEATHER_LIMIT):
+            results = await fetch_weather_data_bulk(
+                cities[start:start + BULK_WEATHER_LIMIT], transl, language,
+                data_type='both', refresh=True
+            )
+            refreshed.update(
+                result['city'] for result in results
+                if result['status'] == 'ok'
+            )
+
+    logger.info(f"Refreshed weather for {len(refreshed)} favourite cities")
+    return len(refreshed)
+
+
+def ensure_favourite_weather_refresh():
+    """
+    Start the periodic refresh of favourite cities' weather in this process.
+    """
+    schedule_periodic(
+        'favourite_weather', refresh_favourite_weather,
+        FAVOURITES_REFRESH_INTERVAL
+    )
+
+
+def get_cached_favourites_weather(cities, language):
+    """
+    Build the favourites strip data from the cache only.
+
+    Parameters:
+    cities (list): The user's favourite city names.
+    language (str): Language code of the cached weather data.
+
+    Returns:
+    list: A dictionary per city with its name and, if cached,
+          the current temperature and weather icon.
+    """
+    keys = {
+        city: generate_cache_key('weather_data', city, language, 'both')
+        for city in cities
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    strip = []
+    for city, key in keys.items():
+        current = cached.get(key, {}).get('current')
+        strip.append({
+            'city': city,
+            'temperature_c': current['temperature_c'] if current else None,
+            'icon_url': current['icon_url'] if current else None,
+        })
+    return strip
@@ -54,6 +54,20 @@ COUNTRIES_GENITIVE_UA = {
 }
 
 
+def get_cached_geocode(city_name):
+    """
+    Return the geocoded data of a city if it is cached.
+
+    Parameters:
+    city_name (str): The name of the city.
+
+    Returns:
+    dict: The geocoded data as returned by geocode_city, or None if the
+          city was not geocoded recently.
+    """
+    return cache.get(generate_cache_key('geocode', city_name))
+
+
 async def geocode_city(city_name, country_code=None, transl=None):
     """
     Geocode the city name to get latitude and longitude.
@@ -78,8 +92,7 @@ async def geocode_city(city_name, country_code=None, transl=None):
     CityNotFoundError: If the city cannot be found.
     GeocodingServiceError: For general geocoding service errors.
     """
-    cache_key = generate_cache_key('geocode', city_name)
-    cached_data = await sync_to_async(cache.get)(cache_key)
+    cached_data = await sync_to_async(get_cached_geocode)(city_name)
     if cached_data:
         return cached_data
 
@@ -130,7 +143,9 @@ async def geocode_city(city_name, country_code=None, transl=None):
             'lon': lon
         }
 
-        await sync_to_async(cache.set)(cache_key, geo_data, 3600)
+        await sync_to_async(cache.set)(
+            generate_cache_key('geocode', city_name), geo_data, 3600
+        )
         return geo_data
 
     error_msg = f"Geocoding error: Could not geocode city '{city_name}'"
@@ -239,7 +254,7 @@ async def get_translated_name(
     - Attempts to retrieve the translated name from the cache.
     - Calls the translate_to_ukrainian function to get the translation.
     - Tries alternative names if the initial translation fails.
-    - Stores the translated name in the cache.
+    - Stores the translated name in the cache for 1 day.
 
     Parameters:
     name (str): The original name.
@@ -256,16 +271,25 @@ async def get_translated_name(
     if cached_translation:
         return cached_translation
 
+    translated_name = None
     try:
-        return await translate_to_ukrainian(name, transl, source)
+        translated_name = await translate_to_ukrainian(name, transl, source)
     except NameNotFoundError:
         for alt_name in name_alternatives:
             try:
-                return await translate_to_ukrainian(alt_name, transl, source)
+                translated_name = await translate_to_ukrainian(
+                    alt_name, transl, source
+                )
+                break
             except NameNotFoundError:
                 continue
+
+    if not translated_name:
         return name  # Default to the original name if translation fails
 
+    await sync_to_async(cache.set)(cache_key, translated_name, 60*60*24)
+    return translated_name
+
 
 async def process_city_info(
         city, geo_city, country_code, country_name_en, region_en,
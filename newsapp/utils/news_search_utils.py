@@ -0,0 +1,264 @@
+from asgiref.sync import sync_to_async
+from bisect import bisect_left
+from collections import defaultdict
+import logging
+import re
+import threading
+import time
+
+from ..models import NewsArticle, NewsListing
+from .background import schedule_periodic
+from .news_store_utils import NEWS_PRUNE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two checks of the news store for changed articles
+NEWS_SEARCH_SYNC_INTERVAL = 60
+
+# Seconds between two full rebuilds, which drop pruned articles
+NEWS_SEARCH_REBUILD_INTERVAL = NEWS_PRUNE_INTERVAL
+
+# Default and upper limit of results returned by one search
+NEWS_SEARCH_LIMIT = 20
+MAX_NEWS_SEARCH_RESULTS = 50
+
+# Apostrophes inside words, e.g. in Ukrainian "м'ята" or "п’ять"
+APOSTROPHES = re.compile(r"['’ʼ`]")
+WORD = re.compile(r'\w+')
+
+# Columns of the pooled articles kept by the index
+NEWS_SEARCH_FIELDS = (
+    'id', 'title', 'url', 'source', 'published_at', 'fetched_at',
+)
+
+
+def tokenize(text):
+    """
+    Split a text into the case-folded words used by the search index.
+
+    Words of any script are kept, so English and Ukrainian headlines
+    share one index; apostrophes do not split words.
+
+    Parameters:
+    text (str): A headline, source name or search query.
+
+    Returns:
+    list: The words of the text.
+    """
+    return WORD.findall(APOSTROPHES.sub('', text.casefold()))
+
+
+class NewsSearchIndex:
+    """
+    In-process inverted index over the headlines of the news store.
+
+    The index maps every word of a title and source name to the pooled
+    articles containing it, and keeps the countries and categories that
+    list each article for filtering. A sorted vocabulary gives prefix
+    matches with a binary search, so queries are answered from memory.
+
+    Searches bring the index up to date incrementally, loading only the
+    articles fetched since its last sync. To drop pruned articles, a
+    fresh index is built on the background loop every
+    NEWS_SEARCH_REBUILD_INTERVAL seconds and swapped in when it is
+    complete, so searches never wait for a full rebuild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop all indexed articles."""
+        self._documents = {}
+        self._document_words = {}
+        self._postings = defaultdict(set)
+        self._vocabulary = []
+        self._synced_until = None
+        self._next_sync = 0
+
+    def invalidate(self):
+        """Make the next search load the articles changed since the sync."""
+        self._next_sync = 0
+
+    def _add(self, row):
+        """Index one stored article, replacing its previous version."""
+        article_id = row['id']
+        self._remove(article_id)
+        words = set(tokenize(row['title'])) | set(tokenize(row['source']))
+        self._documents[article_id] = row
+        self._document_words[article_id] = words
+        for word in words:
+            self._postings[word].add(article_id)
+
+    def _remove(self, article_id):
+        """Remove an article from the postings of its words."""
+        for word in self._document_words.pop(article_id, ()):
+            self._postings[word].discard(article_id)
+            if not self._postings[word]:
+                del self._postings[word]
+        self._documents.pop(article_id, None)
+
+    def sync(self):
+        """
+        Bring the index up to date with the news store if a sync is due.
+
+        Returns:
+        int: Number of articles (re)indexed by this call.
+        """
+        now = time.monotonic()
+        if now < self._next_sync:
+            return 0
+
+        articles = NewsArticle.objects.all()
+        listings = NewsListing.objects.all()
+        if self._synced_until is not None:
+            # Rows written in the same instant may commit after the sync
+            articles = articles.filter(fetched_at__gte=self._synced_until)
+            listings = listings.filter(
+                article__fetched_at__gte=self._synced_until
+            )
+        rows = list(articles.values(*NEWS_SEARCH_FIELDS))
+        article_listings = defaultdict(set)
+        for article_id, country, category in listings.values_list(
+            'article_id', 'country', 'category'
+        ):
+            article_listings[article_id].add((country, category))
+
+        for row in rows:
+            row['listings'] = article_listings[row['id']]
+            self._add(row)
+            if self._synced_until is None or (
+                row['fetched_at'] > self._synced_until
+            ):
+                self._synced_until = row['fetched_at']
+        if rows:
+            self._vocabulary = sorted(self._postings)
+
+        self._next_sync = now + NEWS_SEARCH_SYNC_INTERVAL
+        return len(rows)
+
+    def rebuild(self):
+        """
+        Build a fresh index from the news store and swap it in.
+
+        Searches keep using the current index while the fresh one is
+        loaded. Articles changed during the rebuild are picked up by the
+        sync that follows the swap.
+
+        Returns:
+        int: Number of indexed articles.
+        """
+        fresh = NewsSearchIndex()
+        fresh.sync()
+        with self._lock:
+            self._documents = fresh._documents
+            self._document_words = fresh._document_words
+            self._postings = fresh._postings
+            self._vocabulary = fresh._vocabulary
+            self._synced_until = fresh._synced_until
+            self._next_sync = 0
+        return len(fresh._documents)
+
+    def _match_prefix(self, prefix):
+        """Return the articles with a word starting with the prefix."""
+        matches = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while (
+            position < len(self._vocabulary)
+            and self._vocabulary[position].startswith(prefix)
+        ):
+            matches |= self._postings.get(self._vocabulary[position], set())
+            position += 1
+        return matches
+
+    def search(self, query, country=None, category=None,
+               limit=NEWS_SEARCH_LIMIT):
+        """
+        Find the stored articles matching every word of a query.
+
+        Each query word matches the headline words it is a prefix of,
+        e.g. 'econ' matches 'economy' and 'війн' matches 'війна'.
+
+        Parameters:
+        query (str): The search query.
+        country (str): Only return articles of this country (optional).
+        category (str): Only return articles of this category (optional).
+        limit (int): Maximum number of results.
+
+        Returns:
+        list: Matching articles, newest first, with the country and
+              category pairs that list them.
+        """
+        words = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not words:
+            return []
+
+        with self._lock:
+            self.sync()
+            matches = None
+            for word in words:
+                word_matches = self._match_prefix(word)
+                matches = (
+                    word_matches if matches is None
+                    else matches & word_matches
+                )
+                if not matches:
+                    return []
+            documents = [
+                self._documents[article_id] for article_id in matches
+                if any(
+                    country in (None, listed_country)
+                    and category in (None, listed_category)
+                    for listed_country, listed_category
+                    in self._documents[article_id]['listings']
+                )
+            ]
+
+        documents.sort(key=lambda row: row['published_at'], reverse=True)
+        return [
+            {
+                'title': row['title'],
+                'url': row['url'],
+                'source': row['source'],
+                'published_at': row['published_at'].isoformat(),
+                'listings': sorted(row['listings']),
+            }
+            for row in documents[:limit]
+        ]
+
+
+news_search_index = NewsSearchIndex()
+
+
+def search_news(query, country=None, category=None, limit=NEWS_SEARCH_LIMIT):
+    """
+    Search the headlines of all stored news with the shared index.
+
+    Parameters:
+    query (str): The search query.
+    country (str): Only return articles of this country (optional).
+    category (str): Only return articles of this category (optional).
+    limit (int): Maximum number of results (default: NEWS_SEARCH_LIMIT).
+
+    Returns:
+    list: Matching articles, newest first.
+    """
+    ensure_news_search_rebuild()
+    return news_search_index.search(query, country, category, limit)
+
+
+async def _rebuild_news_search_index():
+    """Run the index rebuild from the background loop."""
+    indexed = await sync_to_async(news_search_index.rebuild)()
+    logger.info(f"Rebuilt the news search index with {indexed} articles")
+
+
+def ensure_news_search_rebuild():
+    """
+    Start the periodic rebuild of the news search index in this process.
+    """
+    schedule_periodic(
+        'news_search_rebuild', _rebuild_news_search_index,
+        NEWS_SEARCH_REBUILD_INTERVAL
+    )
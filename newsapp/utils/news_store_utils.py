@@ -0,0 +1,291 @@
+from django.db import DatabaseError
+from django.db.models import Q
+from django.utils import timezone
+
+from asgiref.sync import sync_to_async
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import pytz
+import re
+
+from ..models import NewsArticle, NewsListing
+from .background import schedule_periodic
+
+logger = logging.getLogger(__name__)
+
+# Articles published before this period are deleted
+NEWS_RETENTION_DAYS = 30
+
+# Interval in seconds between two runs of the retention job
+NEWS_PRUNE_INTERVAL = 6 * 60 * 60
+
+# Columns of a pooled article that are shown in the news listings
+NEWS_ARTICLE_FIELDS = ('title', 'url', 'source', 'published_at', 'image_url')
+
+# Longest article and image URL the article table can store
+MAX_ARTICLE_URL_LENGTH = NewsArticle._meta.get_field('url').max_length
+
+
+def get_url_hash(url):
+    """
+    Compute the key of an article in the shared article pool.
+
+    Parameters:
+    url (str): The article URL.
+
+    Returns:
+    str: The hexadecimal SHA-1 hash of the URL.
+    """
+    return hashlib.sha1(url.encode()).hexdigest()
+
+
+def normalize_article(article):
+    """
+    Normalize an article of the NewsAPI response.
+
+    This function:
+    - Moves a source name at the end of the title into the source.
+    - Parses the publication time into a timezone-aware datetime.
+    - Skips articles without a title, URL or publication time, and
+      articles whose URL is too long to be stored.
+
+    Parameters:
+    article (dict): An entry of the NewsAPI 'articles' list.
+
+    Returns:
+    dict: The article's title, url, source, published_at and image_url
+          (empty unless it is an HTTP(S) URL), or None if the article
+          is unusable.
+    """
+    try:
+        title = article['title']
+        source = (article.get('source') or {}).get('name') or ''
+        published_at = datetime.fromisoformat(
+            article['publishedAt'][:-1]
+        ).replace(tzinfo=pytz.utc)
+        url = article['url']
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not title or not url or len(url) > MAX_ARTICLE_URL_LENGTH:
+        return None
+
+    image_url = article.get('urlToImage') or ''
+    if not image_url.startswith(('http://', 'https://')) or (
+        len(image_url) > MAX_ARTICLE_URL_LENGTH
+    ):
+        image_url = ''
+
+    # Extract source from title if it exists at the end
+    match = re.search(r' - ([^-]+)$', title)
+    if match:
+        title = title[:match.start()]
+        source = match.group(1).strip()
+
+    return {
+        'title': title,
+        'url': url,
+        'source': source[:200],
+        'published_at': published_at,
+        'image_url': image_url,
+    }
+
+
+def format_article(article):
+    """
+    Format a normalized article for the news templates.
+
+    Parameters:
+    article (dict): A normalized or stored article.
+
+    Returns:
+    dict: The article with its publication time as 'DD MM HH:MM' in UTC
+          and, instead of the image URL, the 'thumbnail' key of the image
+          in the thumbnail proxy (None if the article has no image).
+    """
+    formatted = {
+        field: article[field] for field in NEWS_ARTICLE_FIELDS
+        if field != 'image_url'
+    }
+    formatted['published_at'] = article['published_at'].astimezone(
+        pytz.utc
+    ).strftime('%d %m %H:%M')
+    formatted['thumbnail'] = (
+        get_url_hash(article['url']) if article['image_url'] else None
+    )
+    return formatted
+
+
+def collapse_duplicates(articles, seen=None):
+    """
+    Drop articles whose URL or headline already appeared in a list.
+
+    NewsAPI often lists the same story more than once, e.g. from several
+    sources that syndicate it under the same headline.
+
+    Parameters:
+    articles (list): Normalized or formatted articles, in display order.
+    seen (set): URLs and casefolded headlines of articles listed before,
+                updated with the given ones (default: a new set).
+
+    Returns:
+    list: The first occurrence of every article.
+    """
+    if seen is None:
+        seen = set()
+    collapsed = []
+    for article in articles:
+        keys = {article['url'], article['title'].casefold()}
+        if seen.isdisjoint(keys):
+            collapsed.append(article)
+        seen |= keys
+    return collapsed
+
+
+def store_articles(country, category, articles):
+    """
+    Store the normalized articles of one listing.
+
+    This function:
+    - Upserts the articles into the shared pool, matched by URL hash, so
+      an article listed by several countries or categories is stored once.
+    - Upserts the listing's references to the pooled articles.
+
+    Storage errors are logged and never affect the news response.
+
+    Parameters:
+    country (str): The country code.
+    category (str): The news category.
+    articles (list): Articles as returned by normalize_article.
+
+    Returns:
+    int: Number of stored articles.
+    """
+    pooled = {
+        get_url_hash(article['url']): NewsArticle(
+            url_hash=get_url_hash(article['url']), **article
+        )
+        for article in articles
+    }
+    if not pooled:
+        return 0
+
+    try:
+        NewsArticle.objects.bulk_create(
+            pooled.values(), update_conflicts=True,
+            unique_fields=['url_hash'],
+            update_fields=[
+                'title', 'source', 'published_at', 'image_url', 'fetched_at'
+            ]
+        )
+        article_ids = dict(
+            NewsArticle.objects.filter(
+                url_hash__in=pooled.keys()
+            ).values_list('url_hash', 'id')
+        )
+        NewsListing.objects.bulk_create(
+            [
+                NewsListing(
+                    article_id=article_ids[url_hash], country=country,
+                    category=category, published_at=article.published_at
+                )
+                for url_hash, article in pooled.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['country', 'category', 'article'],
+            update_fields=['published_at']
+        )
+    except DatabaseError as e:
+        logger.error(
+            f"Error storing {category} news for {country}: {e}"
+        )
+        return 0
+
+    ensure_news_retention()
+    return len(pooled)
+
+
+def get_articles_page(country, category, limit, after=None):
+    """
+    Return a page of the stored articles of a listing, newest first.
+
+    The page is read with one query served by the
+    (country, category, published_at, id) index of the listings, joined
+    to the shared article pool. Pages are delimited by the position of
+    their last listing (keyset pagination), so they stay stable while
+    new articles are ingested. Duplicate headlines within the page are
+    collapsed, and the page is refilled from the following listings, so
+    it is only shorter than the limit if it is the last one.
+
+    Parameters:
+    country (str): The country code.
+    category (str): The news category.
+    limit (int): Maximum number of articles to return.
+    after (tuple): Publication time and id of the last listing of the
+                   previous page, or None for the first page.
+
+    Returns:
+    tuple: Articles formatted for the news templates, and the position
+           after the page, or None if no stored articles follow.
+    """
+    listings = NewsListing.objects.filter(
+        country=country, category=category
+    ).order_by('-published_at', '-id')
+    articles = []
+    seen = set()
+    while True:
+        page = listings
+        if after is not None:
+            published_at, listing_id = after
+            page = page.filter(
+                Q(published_at__lt=published_at)
+                | Q(published_at=published_at, id__lt=listing_id)
+            )
+        # One row more than needed tells whether more listings follow
+        rows = list(page.values_list(
+            'id', 'published_at',
+            *(f'article__{field}' for field in NEWS_ARTICLE_FIELDS)
+        )[:limit + 1])
+
+        for index, row in enumerate(rows[:limit]):
+            after = (row[1], row[0])
+            article = format_article(dict(zip(NEWS_ARTICLE_FIELDS, row[2:])))
+            articles += collapse_duplicates([article], seen)
+            if len(articles) == limit:
+                return articles, after if index + 1 < len(rows) else None
+        if len(rows) <= limit:
+            return articles, None
+
+
+def prune_news_articles(days=NEWS_RETENTION_DAYS):
+    """
+    Delete articles published before the retention period, together
+    with their listings.
+
+    Parameters:
+    days (int): Number of days of articles to keep.
+
+    Returns:
+    int: Number of deleted articles.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    NewsListing.objects.filter(published_at__lt=cutoff).delete()
+    deleted, _ = NewsArticle.objects.filter(
+        published_at__lt=cutoff
+    ).delete()
+    return deleted
+
+
+async def _prune_news_articles():
+    """Run the retention job from the background loop."""
+    deleted = await sync_to_async(prune_news_articles)()
+    logger.info(f"Pruned {deleted} news articles")
+
+
+def ensure_news_retention():
+    """
+    Start the periodic retention job of the stored news in this process.
+    """
+    schedule_periodic(
+        'news_retention', _prune_news_articles, NEWS_PRUNE_INTERVAL
+    )
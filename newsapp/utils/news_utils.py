@@ -1,12 +1,26 @@
+from django.core import signing
 from django.core.cache import cache
+from django.db import DatabaseError
 
-from datetime import datetime
 from asgiref.sync import sync_to_async
+from datetime import datetime
 import aiohttp
-import re
+import asyncio
+import hashlib
+import json
+import logging
 import os
 
-from .exceptions import handle_news_api_error
+from .background import run_deduplicated, run_shared
+from .exceptions import APIError, handle_news_api_error
+from .news_search_utils import news_search_index
+from .news_store_utils import (
+    collapse_duplicates, format_article, get_articles_page, get_url_hash,
+    normalize_article, store_articles
+)
+from .utils import generate_cache_key
+
+logger = logging.getLogger(__name__)
 
 # Map categories to their identifiers
 CATEGORY_MAP = {
@@ -21,13 +35,95 @@ CATEGORY_MAP = {
 
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 
+# Number of articles of a page of the news listings
+NEWS_PAGE_SIZE = 10
+
+# Number of articles of a NewsAPI page, and the pages available per
+# listing (NewsAPI returns at most 100 results per query)
+NEWS_API_PAGE_SIZE = 20
+NEWS_API_MAX_PAGES = 5
+
+# Number of headlines per country and seconds the news overview waits
+# for countries that are not cached
+NEWS_OVERVIEW_SIZE = 5
+NEWS_OVERVIEW_DEADLINE = 3
 
-async def fetch_news_by_category(category, country, transl):
+# Salt of the signed cursors of the news listings
+NEWS_CURSOR_SALT = 'newsapp.news_cursor'
+
+# Cache timeout in seconds of the news listings and the article pool
+NEWS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def pool_articles(articles):
+    """
+    Store articles in the cached article pool.
+
+    Every article is cached once under the hash of its URL, so listings
+    of several countries and categories only hold references to it.
+
+    Parameters:
+    articles (list): Articles formatted for the news templates.
+
+    Returns:
+    list: The URL hashes referencing the articles, in the same order.
+    """
+    refs = [get_url_hash(article['url']) for article in articles]
+    cache.set_many(
+        {
+            generate_cache_key('news_article', ref): article
+            for ref, article in zip(refs, articles)
+        },
+        timeout=NEWS_CACHE_TIMEOUT
+    )
+    return refs
+
+
+def get_pooled_articles(refs):
+    """
+    Read referenced articles from the cached article pool.
+
+    Parameters:
+    refs (list): URL hashes of the articles.
+
+    Returns:
+    list: The articles in the order of the references, or None if any
+          of them has left the cache.
+    """
+    keys = [generate_cache_key('news_article', ref) for ref in refs]
+    pooled = cache.get_many(keys)
+    if len(pooled) < len(set(keys)):
+        return None
+    return [pooled[key] for key in keys]
+
+
+def get_news_cache_key(category, country, page=1):
+    """
+    Build the cache key of a fetched NewsAPI page of a listing.
+
+    Parameters:
+    category (str): The news category.
+    country (str): The country code.
+    page (int): The NewsAPI page number (default: 1).
+
+    Returns:
+    str: The cache key.
+    """
+    if page == 1:
+        return f'news_{category}_{country}'
+    return f'news_{category}_{country}_{page}'
+
+
+async def fetch_news_by_category(category, country, transl, refresh=False,
+                                 page=1):
     """
     Fetches news data from NewsAPI.
 
     This function retrieves news data for the specified category and country
-    from the NewsAPI. The data is cached for 1 day to improve performance.
+    from the NewsAPI. The articles are normalized once, stored in the news
+    article table and cached for 1 day to improve performance. The cache
+    holds the articles once in a shared pool and the listing only as
+    references to it (see pool_articles).
     If there's an error fetching the news, it raises a ValueError
     with an appropriate error message.
 
@@ -35,6 +131,10 @@ async def fetch_news_by_category(category, country, transl):
     category (str): The news category.
     country (str): The country code.
     transl (dict): The translation dictionary.
+    refresh (bool): If True, cached news are ignored and fetched again
+                    (default: False).
+    page (int): The NewsAPI page of NEWS_API_PAGE_SIZE articles
+                (default: 1).
 
     Returns:
     list: A list of news articles with titles, URLs, sources,
@@ -43,15 +143,20 @@ async def fetch_news_by_category(category, country, transl):
     Raises:
     ValueError: If there's an error fetching the news data.
     """
-    cache_key = f'news_{category}_{country}'
-    cached_news = await sync_to_async(cache.get)(cache_key)
+    cache_key = get_news_cache_key(category, country, page)
+    cached_refs = None if refresh else await sync_to_async(cache.get)(
+        cache_key
+    )
 
-    if cached_news:
-        return cached_news
+    if cached_refs:
+        cached_news = await sync_to_async(get_pooled_articles)(cached_refs)
+        if cached_news:
+            return cached_news
 
     url = (
         f'https://newsapi.org/v2/top-headlines?country={country}'
-        f'&category={category}&apiKey={NEWS_API_KEY}'
+        f'&category={category}&pageSize={NEWS_API_PAGE_SIZE}&page={page}'
+        f'&apiKey={NEWS_API_KEY}'
     )
 
     async with aiohttp.ClientSession() as session:
@@ -60,28 +165,375 @@ async def fetch_news_by_category(category, country, transl):
                 await handle_news_api_error(response)
             data = await response.json()
 
-    articles = []
-    for article in data['articles']:
-        # Convert to datetime object
-        published_at = datetime.fromisoformat(article['publishedAt'][:-1])
-
-        title = article['title']
-        source = article['source']['name']
-
-        # Extract source from title if it exists at the end
-        match = re.search(r' - ([^-]+)$', title)
-        if match:
-            title = title[:match.start()]
-            source = match.group(1).strip()
-
-        articles.append({
-            'title': title,
-            'url': article['url'],
-            'source': source,
-            'published_at': published_at.strftime('%d %m %H:%M')
-        })
+    normalized = [
+        article for article in map(normalize_article, data['articles'])
+        if article is not None
+    ]
+    if await sync_to_async(store_articles)(country, category, normalized):
+        news_search_index.invalidate()
+    articles = collapse_duplicates(
+        [format_article(article) for article in normalized]
+    )
 
-    # Cache the news data for 1 day
-    await sync_to_async(cache.set)(cache_key, articles, timeout=60*60*24)
+    # Cache the references to the pooled articles for 1 day
+    refs = await sync_to_async(pool_articles)(articles)
+    await sync_to_async(cache.set_many)(
+        {
+            cache_key: refs,
+            generate_cache_key('news_total', category, country):
+                data.get('totalResults', 0),
+        },
+        timeout=NEWS_CACHE_TIMEOUT
+    )
 
     return articles
+
+
+def get_articles_hash(articles):
+    """
+    Compute a content hash of a list of articles.
+
+    The hash only depends on the rendered fields of the headlines,
+    including their thumbnail, so a refresh that returns the same
+    articles keeps the same hash.
+
+    Parameters:
+    articles (list): News articles as returned by fetch_news_by_category.
+
+    Returns:
+    str: A short hexadecimal hash.
+    """
+    content = json.dumps(
+        [
+            [article['title'], article['url'], article['source'],
+             article['published_at'], article.get('thumbnail')]
+            for article in articles
+        ],
+        ensure_ascii=False
+    )
+    return hashlib.sha1(content.encode()).hexdigest()[:12]
+
+
+async def get_news_bundle(country, transl, refresh=False):
+    """
+    Fetches the news of all categories for a country as one cached bundle.
+
+    This function:
+    - Returns the country's bundle from the cache, resolving the cached
+      listings of all categories with one read of the article pool.
+    - Otherwise fetches all categories concurrently and stores the bundle
+      for 1 day as a content hash per category (see get_articles_hash).
+    - Leaves a bundle with failed categories uncached, so that the next
+      request tries again.
+
+    Parameters:
+    country (str): The country code.
+    transl (dict): The translation dictionary.
+    refresh (bool): If True, the news are fetched again (default: False).
+
+    Returns:
+    dict: Per category, its 'articles' and their 'hash', or None for the
+          categories that could not be fetched.
+    """
+    cache_key = generate_cache_key('news_bundle', country)
+    cached_bundle = None if refresh else await sync_to_async(cache.get)(
+        cache_key
+    )
+
+    if cached_bundle:
+        listing_keys = {
+            category: f'news_{category}_{country}'
+            for category in cached_bundle
+        }
+        listings = await sync_to_async(cache.get_many)(
+            list(listing_keys.values())
+        )
+        if len(listings) == len(listing_keys):
+            refs = [ref for key in listing_keys.values()
+                    for ref in listings[key]]
+            pooled = await sync_to_async(get_pooled_articles)(refs)
+            if pooled is not None:
+                articles = dict(zip(refs, pooled))
+                return {
+                    category: {
+                        'articles': [
+                            articles[ref] for ref in listings[key]
+                        ],
+                        'hash': cached_bundle[category],
+                    }
+                    for category, key in listing_keys.items()
+                }
+
+    categories = list(CATEGORY_MAP.keys())
+    results = await asyncio.gather(
+        *(
+            fetch_news_by_category(category, country, transl, refresh)
+            for category in categories
+        ),
+        return_exceptions=True
+    )
+
+    bundle = {}
+    for category, articles in zip(categories, results):
+        if isinstance(articles, APIError):
+            logger.error(f"Error fetching {category} news: {articles}")
+            bundle[category] = None
+        elif isinstance(articles, Exception):
+            raise articles
+        else:
+            bundle[category] = {
+                'articles': articles,
+                'hash': get_articles_hash(articles),
+            }
+
+    if all(bundle.values()):
+        # Cache the content hashes of the bundle for 1 day; its articles
+        # are referenced by the cached listings
+        await sync_to_async(cache.set)(
+            cache_key,
+            {category: entry['hash'] for category, entry in bundle.items()},
+            timeout=NEWS_CACHE_TIMEOUT
+        )
+
+    return bundle
+
+
+async def schedule_news_refresh(country, transl):
+    """
+    Refresh the stored news of a country in the background if needed.
+
+    The news are fetched again once the country's bundle has left the
+    cache, so that pages keep being served from the stored articles
+    while the refresh runs.
+
+    Parameters:
+    country (str): The country code.
+    transl (dict): The translation dictionary.
+
+    Returns:
+    bool: True if a refresh was scheduled, otherwise False.
+    """
+    cache_key = generate_cache_key('news_bundle', country)
+    if await sync_to_async(cache.get)(cache_key) is not None:
+        return False
+    return run_deduplicated(cache_key, get_news_bundle, country, transl)
+
+
+def encode_news_cursor(position):
+    """
+    Encode the position after a page of a news listing as a cursor.
+
+    Parameters:
+    position (tuple): Publication time and id of the last listing.
+
+    Returns:
+    str: The opaque, signed cursor.
+    """
+    published_at, listing_id = position
+    return signing.dumps(
+        [published_at.isoformat(), listing_id], salt=NEWS_CURSOR_SALT
+    )
+
+
+def decode_news_cursor(cursor):
+    """
+    Decode a cursor created by encode_news_cursor.
+
+    Parameters:
+    cursor (str): The cursor sent by the client.
+
+    Returns:
+    tuple: Publication time and id of the last listing of the page.
+
+    Raises:
+    ValueError: If the cursor is invalid or was tampered with.
+    """
+    try:
+        published_at, listing_id = signing.loads(
+            cursor, salt=NEWS_CURSOR_SALT
+        )
+        return datetime.fromisoformat(published_at), int(listing_id)
+    except (signing.BadSignature, TypeError) as e:
+        raise ValueError(f"Invalid news cursor: {e}")
+
+
+def get_unfetched_news_page(category, country):
+    """
+    Find the next NewsAPI page of a listing that is not cached yet.
+
+    Parameters:
+    category (str): The news category.
+    country (str): The country code.
+
+    Returns:
+    int: The page number, or None if all available pages are cached.
+    """
+    keys = {
+        page: get_news_cache_key(category, country, page)
+        for page in range(1, NEWS_API_MAX_PAGES + 1)
+    }
+    total_key = generate_cache_key('news_total', category, country)
+    cached = cache.get_many([*keys.values(), total_key])
+    total = cached.get(total_key)
+
+    for page, key in keys.items():
+        if total is not None and (page - 1) * NEWS_API_PAGE_SIZE >= total:
+            return None
+        if key not in cached:
+            return page
+    return None
+
+
+async def get_news_page(category, country, transl, after=None,
+                        limit=NEWS_PAGE_SIZE):
+    """
+    Returns a page of the articles of a category from the news store.
+
+    This function:
+    - Reads the page after the cursor with one indexed query.
+    - Fetches the next NewsAPI page of the listing only when the stored
+      articles run out, so upstream pages are fetched lazily as users
+      scroll and only the pages actually viewed are fetched.
+    - Falls back to a live fetch of the first page if the store cannot
+      be read.
+    - Schedules a background refresh of the country's news when due,
+      see schedule_news_refresh.
+
+    Parameters:
+    category (str): The news category.
+    country (str): The country code.
+    transl (dict): The translation dictionary.
+    after (tuple): The position after the previous page, as decoded by
+                   decode_news_cursor, or None for the first page.
+    limit (int): Maximum number of articles (default: NEWS_PAGE_SIZE).
+
+    Returns:
+    tuple: News articles with titles, URLs, sources and published time,
+           newest first, and the cursor of the next page, or None if
+           this is the last page.
+
+    Raises:
+    APIError: If nothing is stored and the live fetch fails.
+    """
+    if after is None:
+        await schedule_news_refresh(country, transl)
+
+    for _ in range(NEWS_API_MAX_PAGES + 1):
+        try:
+            articles, next_position = await sync_to_async(
+                get_articles_page
+            )(country, category, limit, after)
+        except DatabaseError as e:
+            logger.error(f"Error reading stored {category} news: {e}")
+            if after is not None:
+                return [], None
+            articles = await fetch_news_by_category(category, country, transl)
+            return articles[:limit], None
+
+        if next_position is not None:
+            return articles, encode_news_cursor(next_position)
+
+        page = await sync_to_async(get_unfetched_news_page)(
+            category, country
+        )
+        if page is None:
+            break
+        try:
+            await fetch_news_by_category(category, country, transl, page=page)
+        except APIError:
+            if articles or after is not None:
+                break
+            raise
+
+    return articles, None
+
+
+def get_cached_headlines(countries):
+    """
+    Read the cached general headlines of several countries.
+
+    Parameters:
+    countries (list): Country codes.
+
+    Returns:
+    dict: The cached articles per country; countries whose listing or
+          any of its articles left the cache are omitted.
+    """
+    keys = {
+        country: get_news_cache_key('general', country)
+        for country in countries
+    }
+    listings = cache.get_many(list(keys.values()))
+    headlines = {}
+    for country, key in keys.items():
+        if key in listings:
+            articles = get_pooled_articles(listings[key])
+            if articles is not None:
+                headlines[country] = articles
+    return headlines
+
+
+async def get_news_overview(countries, transl, limit=NEWS_OVERVIEW_SIZE):
+    """
+    Collects the top general headlines of several countries.
+
+    This function:
+    - Takes the headlines of every cached country from the cache.
+    - Fetches the other countries concurrently in the background, under
+      the shared concurrency limit of background tasks and sharing
+      fetches with concurrent requests (see run_shared).
+    - Waits for them at most NEWS_OVERVIEW_DEADLINE seconds; countries
+      that miss the deadline or fail are served from the news store and
+      marked as stale, while their fetch keeps running for later requests.
+
+    Parameters:
+    countries (list): Country codes, in display order.
+    transl (dict): The translation dictionary.
+    limit (int): Maximum number of headlines per country
+                 (default: NEWS_OVERVIEW_SIZE).
+
+    Returns:
+    list: Per country, a dictionary with its 'country' code, 'articles'
+          and whether they are 'stale'. The articles are copies, since
+          shared fetches hand the same result to concurrent requests, so
+          callers may format them in place.
+    """
+    headlines = await sync_to_async(get_cached_headlines)(countries)
+
+    fetches = {
+        country: asyncio.wrap_future(run_shared(
+            f'news_general_{country}', fetch_news_by_category,
+            'general', country, transl
+        ))
+        for country in countries if country not in headlines
+    }
+    if fetches:
+        await asyncio.wait(fetches.values(), timeout=NEWS_OVERVIEW_DEADLINE)
+
+    overview = []
+    for country in countries:
+        stale = False
+        if country in headlines:
+            articles = headlines[country]
+        elif fetches[country].done() and not fetches[country].exception():
+            articles = fetches[country].result()
+        else:
+            if fetches[country].done():
+                logger.error(
+                    f"Error fetching general news for {country}: "
+                    f"{fetches[country].exception()}"
+                )
+            stale = True
+            try:
+                articles, _ = await sync_to_async(get_articles_page)(
+                    country, 'general', limit
+                )
+            except DatabaseError as e:
+                logger.error(f"Error reading stored news of {country}: {e}")
+                articles = []
+        overview.append({
+            'country': country,
+            'articles': [dict(article) for article in articles[:limit]],
+            'stale': stale,
+        })
+    return overview
@@ -0,0 +1,140 @@
+import json
+import pytz
+
+# Name and signing salt of the cookie holding the visitor's preferences
+PREFERENCES_COOKIE = 'preferences'
+PREFERENCES_SALT = 'newsapp.preferences'
+
+# Seconds the preferences cookie is kept by browsers
+PREFERENCES_MAX_AGE = 365 * 24 * 60 * 60
+
+# Name of the cookie in which timezone.js stores the browser's timezone
+TIMEZONE_COOKIE = 'timezone'
+
+# Preferences that may be stored, and the maximum length of a value
+PREFERENCE_KEYS = ('language', 'selected_city', 'selected_country')
+MAX_PREFERENCE_LENGTH = 100
+
+
+class Preferences(dict):
+    """
+    The preferences of a visitor, read from a signed cookie.
+
+    Preferences are kept on the client, so remembering the language,
+    city and country of a visitor needs no session and hence no session
+    store query. The cookie is signed against tampering and only sent
+    back when a preference changed. The visitor's timezone is available
+    as 'django_timezone'; it comes from the cookie set by the browser
+    and cannot be changed by views.
+    """
+
+    def __init__(self, values=None):
+        super().__init__(values or {})
+        self.modified = False
+
+    def set(self, key, value):
+        """
+        Store a preference if it differs from the stored one.
+
+        Parameters:
+        key (str): One of PREFERENCE_KEYS.
+        value (str): The new value.
+
+        Returns:
+        bool: True if the preference changed.
+        """
+        if key not in PREFERENCE_KEYS:
+            raise KeyError(f"Unknown preference: {key}")
+        value = str(value)[:MAX_PREFERENCE_LENGTH]
+        if self.get(key) == value:
+            return False
+        self[key] = value
+        self.modified = True
+        return True
+
+
+def load_preferences(request):
+    """
+    Read the preferences of a visitor from the request's cookies.
+
+    Cookies that are missing, tampered with or malformed give empty
+    preferences; unknown keys, non-string values and unknown timezones
+    are dropped.
+
+    Parameters:
+    request (HttpRequest): The request.
+
+    Returns:
+    Preferences: The visitor's preferences.
+    """
+    value = request.get_signed_cookie(
+        PREFERENCES_COOKIE, default=None, salt=PREFERENCES_SALT
+    )
+    try:
+        values = json.loads(value) if value else {}
+    except ValueError:
+        values = {}
+    if not isinstance(values, dict):
+        values = {}
+    preferences = Preferences({
+        key: value[:MAX_PREFERENCE_LENGTH] for key, value in values.items()
+        if key in PREFERENCE_KEYS and isinstance(value, str)
+    })
+
+    timezone_str = request.COOKIES.get(TIMEZONE_COOKIE)
+    if timezone_str in pytz.all_timezones_set:
+        preferences['django_timezone'] = timezone_str
+    return preferences
+
+
+def save_preferences(preferences, response):
+    """
+    Send the preferences cookie with a response if a preference changed.
+
+    Parameters:
+    preferences (Preferences): The visitor's preferences.
+    response (HttpResponse): The response to the visitor.
+    """
+    if not preferences.modified:
+        return
+    values = {
+        key: value for key, value in preferences.items()
+        if key in PREFERENCE_KEYS
+    }
+    response.set_signed_cookie(
+        PREFERENCES_COOKIE, json.dumps(values, separators=(',', ':')),
+        salt=PREFERENCES_SALT, max_age=PREFERENCES_MAX_AGE,
+        httponly=True, samesite='Lax'
+    )
+
+
+def get_preference(request, key, default=None):
+    """
+    Return a preference of the visitor.
+
+    Parameters:
+    request (HttpRequest): The request.
+    key (str): One of PREFERENCE_KEYS, or 'django_timezone'.
+    default: The value returned if the preference is not set.
+
+    Returns:
+    str: The preference, or the default.
+    """
+    return request.preferences.get(key, default)
+
+
+def set_preference(request, key, value):
+    """
+    Store a preference of the visitor if it changed.
+
+    The cookie is updated with the response, see PreferencesMiddleware.
+
+    Parameters:
+    request (HttpRequest): The request.
+    key (str): One of PREFERENCE_KEYS.
+    value (str): The new value.
+
+    Returns:
+    bool: True if the preference changed.
+    """
+    return request.preferences.set(key, value)
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import weakref
+
+from .exceptions import APIError
+from .exchanger_utils import add_rate_listener, get_rate_matrix
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two heartbeat comments on an idle stream
+RATE_STREAM_HEARTBEAT = 15
+
+# Seconds between two checks of the cached rates while clients listen
+RATE_STREAM_CHECK_INTERVAL = 60
+
+# Seconds before browsers reconnect to a stream that was closed
+RATE_STREAM_RETRY = 5 * 60
+
+# Rate versions whose snapshots are kept for computing diffs
+RATE_STREAM_SNAPSHOTS = 3
+
+_streams = weakref.WeakKeyDictionary()
+
+
+def get_rate_rows(rate_matrix):
+    """
+    Build the compact per-currency rows sent to the exchange rates page.
+
+    Parameters:
+    rate_matrix (RateMatrix): The indexed exchange rates.
+
+    Returns:
+    dict: Per currency code, the NBU rate, the bank's purchase and sale
+          rates, and the buy and sell rates used for conversions.
+    """
+    compact = rate_matrix.compact()
+    rows = {}
+    for position, rate in enumerate(rate_matrix.rates):
+        rows[rate['currency']] = [
+            rate.get('saleRateNB'),
+            rate.get('purchaseRate'),
+            rate.get('saleRate'),
+            compact['buy'][position],
+            compact['sell'][position],
+        ]
+    return rows
+
+
+def diff_rate_rows(old_rows, new_rows):
+    """
+    Return the rows that changed between two rate snapshots.
+
+    Parameters:
+    old_rows (dict): The rows known to the client.
+    new_rows (dict): The current rows.
+
+    Returns:
+    dict: The changed or added rows and the codes of removed currencies.
+    """
+    return {
+        'changed': {
+            currency: row for currency, row in new_rows.items()
+            if old_rows.get(currency) != row
+        },
+        'removed': [
+            currency for currency in old_rows if currency not in new_rows
+        ],
+    }
+
+
+def format_rate_event(version, old_rows, new_rows):
+    """
+    Format the server-sent event that brings a client to a rate version.
+
+    Parameters:
+    version (str): The new rate version.
+    old_rows (dict): The rows known to the client.
+    new_rows (dict): The rows of the new version.
+
+    Returns:
+    str: The 'rates' event with the compact diff as JSON data.
+    """
+    diff = diff_rate_rows(old_rows, new_rows)
+    diff['version'] = version
+    return (
+        f"event: rates\ndata: {json.dumps(diff, separators=(',', ':'))}\n\n"
+    )
+
+
+class RateStream:
+    """
+    One shared subscription to exchange rate changes for all stream clients
+    of an event loop.
+
+    A single watcher task checks the cached rates while clients are
+    connected and is woken up early whenever new rates are fetched.
+    Each change is turned into one server-sent event per client version,
+    which is computed once and shared by every client on that version.
+    """
+
+    def __init__(self, loop):
+        self.version = None
+        self._loop = weakref.ref(loop)
+        self._clients = 0
+        self._snapshots = {}
+        self._events = {}
+        self._changed = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        add_rate_listener(self._on_rates_fetched)
+
+    async def connect(self):
+        """Register a client, starting the watcher if needed."""
+        self._clients += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._watch()
+            )
+        if self.version is None:
+            try:
+                await self._refresh()
+            except APIError as e:
+                logger.error(f"Error loading streamed exchange rates: {e}")
+
+    def disconnect(self):
+        """Unregister a client; the watcher stops with the last one."""
+        self._clients -= 1
+        if not self._clients:
+            self._wakeup.set()
+
+    def get_event(self, client_version):
+        """
+        Return the event bringing a client up to the current version.
+
+        Clients on an unknown version receive all rows.
+
+        Parameters:
+        client_version (str): The rate version the client has.
+
+        Returns:
+        str: The formatted server-sent event.
+        """
+        if client_version not in self._events:
+            self._events[client_version] = format_rate_event(
+                self.version,
+                self._snapshots.get(client_version, {}),
+                self._snapshots[self.version]
+            )
+        return self._events[client_version]
+
+    async def wait_for_change(self, client_version, timeout):
+        """
+        Wait until rates that differ from a client's version are loaded.
+
+        Parameters:
+        client_version (str): The rate version the client has.
+        timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+        bool: True if the rates changed, False on timeout.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(
+                        lambda: self.version not in (None, client_version)
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _on_rates_fetched(self, rate_matrix):
+        """Wake the watcher up from any thread when new rates arrive."""
+        loop = self._loop()
+        if (
+            rate_matrix.version != self.version
+            and loop is not None and not loop.is_closed()
+        ):
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _refresh(self):
+        """Load the cached rates and notify clients if they changed."""
+        rate_matrix = await get_rate_matrix()
+        if rate_matrix.version == self.version:
+            return
+
+        self._snapshots[rate_matrix.version] = get_rate_rows(rate_matrix)
+        while len(self._snapshots) > RATE_STREAM_SNAPSHOTS:
+            del self._snapshots[next(iter(self._snapshots))]
+        self._events = {}
+
+        async with self._changed:
+            self.version = rate_matrix.version
+            self._changed.notify_all()
+
+    async def _watch(self):
+        """Check the rates until the last client disconnects."""
+        while self._clients:
+            try:
+                await self._refresh()
+            except APIError as e:
+                logger.error(f"Error refreshing streamed exchange rates: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), RATE_STREAM_CHECK_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+def get_rate_stream():
+    """
+    Return the shared rate stream of the running event loop.
+
+    Under ASGI all clients of a process share one loop and therefore
+    one subscription.
+
+    Returns:
+    RateStream: The stream of the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _streams:
+        _streams[loop] = RateStream(loop)
+    return _streams[loop]
+
+
+async def stream_rate_events(client_version):
+    """
+    Generate the server-sent events of one client.
+
+    This function:
+    - Sends the rows that differ from the client's version right away.
+    - Sends a compact diff on every later change of the rates.
+    - Sends a heartbeat comment after RATE_STREAM_HEARTBEAT idle seconds.
+
+    Parameters:
+    client_version (str): The rate version embedded in the client's page.
+
+    Yields:
+    str: Formatted server-sent events.
+    """
+    stream = get_rate_stream()
+    try:
+        await stream.connect()
+        version = client_version
+        while True:
+            if stream.version not in (None, version):
+                event = stream.get_event(version)
+                version = stream.version
+                yield event
+            elif not await stream.wait_for_change(
+                    version, RATE_STREAM_HEARTBEAT
+            ):
+                yield ": heartbeat\n\n"
+    finally:
+        stream.disconnect()
@@ -0,0 +1,428 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from asgiref.sync import sync_to_async
+from io import BytesIO
+from PIL import Image, ImageOps
+from urllib.parse import urljoin, urlsplit
+import aiohttp
+import asyncio
+import ipaddress
+import logging
+import os
+import re
+import socket
+import tempfile
+
+from ..models import NewsArticle
+from .background import run_shared, schedule_periodic
+from .exceptions import ThumbnailError
+from .utils import generate_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Pool keys of articles, see get_url_hash
+URL_HASH = re.compile(r'[0-9a-f]{40}')
+
+# Widths in pixels of the thumbnail variants (1x and 2x of the news cards)
+THUMBNAIL_WIDTHS = (120, 240)
+
+# Aspect ratio (height / width) the thumbnails are cropped to
+THUMBNAIL_ASPECT = 3 / 4
+
+# Encoded formats: file extension, Pillow format, content type, options
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 70, 'method': 4}),
+    'jpg': ('JPEG', 'image/jpeg', {'quality': 75, 'optimize': True,
+                                   'progressive': True}),
+}
+
+# Limits of the publisher images that are fetched
+MAX_SOURCE_IMAGE_BYTES = 10 * 1024 * 1024
+SOURCE_IMAGE_TIMEOUT = 10
+MAX_SOURCE_IMAGE_REDIRECTS = 3
+
+# Response statuses whose Location header is followed
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Seconds before an image that could not be fetched is tried again
+THUMBNAIL_FAILURE_TIMEOUT = 60 * 60
+
+# Seconds browsers may keep a thumbnail; its content never changes
+THUMBNAIL_MAX_AGE = 30 * 24 * 60 * 60
+
+# Interval in seconds between two runs of the size limit job, and the
+# share of the limit the disk cache is reduced to when it is exceeded
+THUMBNAIL_CLEANUP_INTERVAL = 10 * 60
+THUMBNAIL_CLEANUP_TARGET = 0.9
+
+
+def get_thumbnail_path(url_hash, width, extension):
+    """
+    Build the disk path of a thumbnail variant.
+
+    Parameters:
+    url_hash (str): The pool key of the article.
+    width (int): The thumbnail width in pixels.
+    extension (str): The format key, see THUMBNAIL_FORMATS.
+
+    Returns:
+    str: The file path below NEWS_THUMBNAIL_ROOT.
+    """
+    return os.path.join(
+        settings.NEWS_THUMBNAIL_ROOT, url_hash[:2],
+        f'{url_hash}-{width}.{extension}'
+    )
+
+
+def read_thumbnail(path):
+    """
+    Read a cached thumbnail and mark it as recently used.
+
+    Parameters:
+    path (str): The thumbnail path.
+
+    Returns:
+    bytes: The encoded thumbnail, or None if it is not cached.
+    """
+    try:
+        with open(path, 'rb') as thumbnail:
+            content = thumbnail.read()
+        # The modification time orders the disk cache for eviction
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return content
+
+
+def write_thumbnail(thumbnail, image_format, options, directory, path):
+    """
+    Encode a thumbnail to a temporary file and rename it to its path.
+
+    The temporary file is removed if the thumbnail cannot be written.
+
+    Parameters:
+    thumbnail (Image): The resized image.
+    image_format (str): The Pillow format.
+    options (dict): The encoder options.
+    directory (str): The directory of the thumbnail.
+    path (str): The thumbnail path.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, suffix='.tmp'
+    )
+    try:
+        with os.fdopen(file_descriptor, 'wb') as output:
+            thumbnail.save(output, image_format, **options)
+        os.replace(temporary_path, path)
+    except Exception:
+        try:
+            os.remove(temporary_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def render_thumbnails(url_hash, source):
+    """
+    Resize a publisher image into every thumbnail variant on disk.
+
+    Each variant is written to a temporary file and renamed, so readers
+    never see partially written thumbnails.
+
+    Parameters:
+    url_hash (str): The pool key of the article.
+    source (bytes): The publisher image.
+
+    Raises:
+    ThumbnailError: If the image cannot be decoded or the thumbnails
+                    cannot be written.
+    """
+    try:
+        image = Image.open(BytesIO(source))
+        # Lets JPEG decoding skip detail the thumbnails cannot show
+        image.draft('RGB', (max(THUMBNAIL_WIDTHS),) * 2)
+        image = ImageOps.exif_transpose(image).convert('RGB')
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f"Invalid image: {e}")
+
+    directory = os.path.dirname(get_thumbnail_path(url_hash, 0, 'jpg'))
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for width in THUMBNAIL_WIDTHS:
+            thumbnail = ImageOps.fit(
+                image, (width, round(width * THUMBNAIL_ASPECT)),
+                Image.Resampling.LANCZOS
+            )
+            for extension, (image_format, _, options) in (
+                THUMBNAIL_FORMATS.items()
+            ):
+                write_thumbnail(
+                    thumbnail, image_format, options, directory,
+                    get_thumbnail_path(url_hash, width, extension)
+                )
+    except (OSError, ValueError) as e:
+        raise ThumbnailError(f"Error writing thumbnails of {url_hash}: {e}")
+
+    ensure_thumbnail_cache_limit()
+
+
+def is_public_address(address):
+    """
+    Check whether an IP address belongs to the public internet.
+
+    Parameters:
+    address (str): The IPv4 or IPv6 address.
+
+    Returns:
+    bool: False for private, loopback, link-local, reserved and
+          multicast addresses.
+    """
+    ip = ipaddress.ip_address(address.split('%')[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_source_url(url):
+    """
+    Refuse image URLs that do not point to a public web server.
+
+    Host names are checked when they are resolved, see
+    PublicHostResolver; this checks the scheme and literal addresses,
+    which are connected to without resolving.
+
+    Parameters:
+    url (str): The image URL.
+
+    Raises:
+    ThumbnailError: If the URL is not a public HTTP(S) URL.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ThumbnailError(f"Unsupported image URL: {url}")
+    try:
+        public = is_public_address(parts.hostname)
+    except ValueError:
+        return
+    if not public:
+        raise ThumbnailError(f"Image URL of a non-public address: {url}")
+
+
+class PublicHostResolver(aiohttp.ThreadedResolver):
+    """
+    Resolver that refuses host names with addresses outside the public
+    internet, so that publisher image URLs cannot reach internal
+    services. The check applies to the addresses that are actually
+    connected to, so a host cannot resolve differently on a second
+    lookup.
+    """
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        addresses = await super().resolve(host, port, family)
+        for address in addresses:
+            if not is_public_address(address['host']):
+                raise OSError(
+                    f"{host} resolves to the non-public address "
+                    f"{address['host']}"
+                )
+        return addresses
+
+
+async def fetch_source_image(image_url):
+    """
+    Download a publisher image.
+
+    Only public web servers are contacted, see check_source_url and
+    PublicHostResolver. Redirects are followed up to
+    MAX_SOURCE_IMAGE_REDIRECTS times and each target is checked again.
+
+    Parameters:
+    image_url (str): The image URL of the article.
+
+    Returns:
+    bytes: The image.
+
+    Raises:
+    ThumbnailError: If the image cannot be downloaded, is too large or
+                    is not on a public web server.
+    """
+    timeout = aiohttp.ClientTimeout(total=SOURCE_IMAGE_TIMEOUT)
+    connector = aiohttp.TCPConnector(resolver=PublicHostResolver())
+    url = image_url
+    try:
+        async with aiohttp.ClientSession(
+            timeout=timeout, connector=connector
+        ) as session:
+            for _ in range(MAX_SOURCE_IMAGE_REDIRECTS + 1):
+                check_source_url(url)
+                async with session.get(
+                    url, allow_redirects=False
+                ) as response:
+                    location = response.headers.get('Location')
+                    if response.status in REDIRECT_STATUSES and location:
+                        url = urljoin(str(response.url), location)
+                        continue
+                    content_type = response.headers.get('Content-Type', '')
+                    if (
+                        response.status != 200
+                        or not content_type.startswith('image/')
+                    ):
+                        raise ThumbnailError(
+                            f"Unexpected response {response.status} "
+                            f"({content_type}) for {image_url}"
+                        )
+                    source = await response.content.read(
+                        MAX_SOURCE_IMAGE_BYTES + 1
+                    )
+                    break
+            else:
+                raise ThumbnailError(f"Too many redirects for {image_url}")
+    except (aiohttp.ClientError, TimeoutError) as e:
+        raise ThumbnailError(f"Error fetching {image_url}: {e}")
+
+    if len(source) > MAX_SOURCE_IMAGE_BYTES:
+        raise ThumbnailError(f"Image too large: {image_url}")
+    return source
+
+
+async def create_thumbnails(url_hash, image_url):
+    """
+    Fetch the image of an article and render its thumbnails.
+
+    Failures are remembered for THUMBNAIL_FAILURE_TIMEOUT seconds.
+
+    Parameters:
+    url_hash (str): The pool key of the article.
+    image_url (str): The image URL of the article.
+
+    Raises:
+    ThumbnailError: If the thumbnails cannot be created.
+    """
+    try:
+        source = await fetch_source_image(image_url)
+        # Image processing is CPU-bound, so keep it off the event loop
+        await sync_to_async(render_thumbnails, thread_sensitive=False)(
+            url_hash, source
+        )
+    except ThumbnailError as e:
+        logger.warning(f"Thumbnail of {url_hash} failed: {e}")
+        await sync_to_async(cache.set)(
+            generate_cache_key('thumbnail_failed', url_hash), True,
+            timeout=THUMBNAIL_FAILURE_TIMEOUT
+        )
+        raise
+
+
+async def get_thumbnail(url_hash, width, extension):
+    """
+    Return a thumbnail of an article's image, creating it if needed.
+
+    This function:
+    - Serves the variant from the disk cache when it is there.
+    - Otherwise fetches the publisher image once, renders all variants
+      (see THUMBNAIL_WIDTHS and THUMBNAIL_FORMATS) and serves the
+      requested one. Concurrent requests for the thumbnails of an
+      article share one fetch and render.
+    - Remembers failed images for THUMBNAIL_FAILURE_TIMEOUT seconds, so
+      broken publisher images are not fetched on every page view.
+
+    Parameters:
+    url_hash (str): The pool key of the article.
+    width (int): The thumbnail width, one of THUMBNAIL_WIDTHS.
+    extension (str): The format key, see THUMBNAIL_FORMATS.
+
+    Returns:
+    bytes: The encoded thumbnail.
+
+    Raises:
+    ThumbnailError: If the article has no usable image.
+    """
+    if not URL_HASH.fullmatch(url_hash):
+        raise ThumbnailError(f"Invalid article key: {url_hash}")
+
+    path = get_thumbnail_path(url_hash, width, extension)
+    content = await sync_to_async(read_thumbnail)(path)
+    if content is not None:
+        return content
+
+    failure_key = generate_cache_key('thumbnail_failed', url_hash)
+    if await sync_to_async(cache.get)(failure_key):
+        raise ThumbnailError(f"Image of {url_hash} recently failed")
+
+    image_url = await sync_to_async(
+        NewsArticle.objects.filter(url_hash=url_hash).values_list(
+            'image_url', flat=True
+        ).first
+    )()
+    if not image_url:
+        raise ThumbnailError(f"No image for {url_hash}")
+
+    await asyncio.wrap_future(run_shared(
+        f'thumbnail_{url_hash}', create_thumbnails, url_hash, image_url
+    ))
+
+    content = await sync_to_async(read_thumbnail)(path)
+    if content is None:
+        raise ThumbnailError(f"Thumbnail of {url_hash} was evicted")
+    return content
+
+
+def enforce_thumbnail_cache_limit():
+    """
+    Evict the least recently used thumbnails beyond the size limit.
+
+    When the disk cache exceeds NEWS_THUMBNAIL_CACHE_SIZE bytes, the
+    thumbnails with the oldest modification (i.e. last use) times are
+    deleted until it holds THUMBNAIL_CLEANUP_TARGET of the limit.
+
+    Returns:
+    int: Number of deleted thumbnails.
+    """
+    entries = []
+    total_size = 0
+    for directory, _, files in os.walk(settings.NEWS_THUMBNAIL_ROOT):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+    if total_size <= settings.NEWS_THUMBNAIL_CACHE_SIZE:
+        return 0
+
+    target_size = settings.NEWS_THUMBNAIL_CACHE_SIZE * THUMBNAIL_CLEANUP_TARGET
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total_size <= target_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+        deleted += 1
+    return deleted
+
+
+async def _enforce_thumbnail_cache_limit():
+    """Run the size limit job from the background loop."""
+    deleted = await sync_to_async(
+        enforce_thumbnail_cache_limit, thread_sensitive=False
+    )()
+    if deleted:
+        logger.info(f"Evicted {deleted} news thumbnails")
+
+
+def ensure_thumbnail_cache_limit():
+    """
+    Start the periodic size limit job of the thumbnail cache in this
+    process.
+    """
+    schedule_periodic(
+        'news_thumbnail_cache', _enforce_thumbnail_cache_limit,
+        THUMBNAIL_CLEANUP_INTERVAL
+    )
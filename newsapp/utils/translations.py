@@ -119,6 +119,24 @@ translations = {
         'unable_to_fetch_exchange_rates': 'Unable to fetch exchange rates at this time. Please try again later.',
         'conversion_rate_not_found': 'Conversion rate not found.',
         'conversion_division_error': 'Error in conversion: Division by zero.',
+        'conversion_amount_too_large': 'The amount is too large to convert.',
+        'no_cities_provided': 'No cities provided.',
+        'too_many_cities': 'Too many cities requested (maximum %(limit)s).',
+        'invalid_data_type': 'Invalid weather data type.',
+        'favourite_cities': 'Favourite Cities',
+        'add_to_favourites': 'Add to Favourites',
+        'remove_from_favourites': 'Remove from favourites',
+        'no_favourite_cities': 'You have no favourite cities yet.',
+        'invalid_forecast_day': 'Invalid forecast day.',
+        'invalid_history_range': 'Invalid history range.',
+        'no_weather_history': "No weather history for '%(city)s'",
+        'invalid_conversion_request': 'Provide an amount, a source and a target currency for every conversion.',
+        'invalid_search_query': 'Enter a search query.',
+        'invalid_news_request': 'Invalid news category or page.',
+        'loading_more_news': 'Loading more news…',
+        'news_overview_title': 'Top News by Country',
+        'news_overview_link': 'News from all countries',
+        'news_overview_stale': 'Latest update unavailable, showing earlier headlines.',
     },
     'uk': {
         "title": "NexusSuite",
@@ -240,5 +258,23 @@ translations = {
         'unable_to_fetch_exchange_rates': 'Наразі не вдається отримати курси валют. Будь ласка, спробуйте пізніше.',
         'conversion_rate_not_found': 'Не знайдено курс конвертації.',
         'conversion_division_error': 'Помилка конвертації: ділення на нуль.',
+        'conversion_amount_too_large': 'Сума завелика для конвертації.',
+        'no_cities_provided': 'Не вказано жодного міста.',
+        'too_many_cities': 'Забагато міст у запиті (максимум %(limit)s).',
+        'invalid_data_type': 'Неправильний тип даних про погоду.',
+        'favourite_cities': 'Улюблені міста',
+        'add_to_favourites': 'Додати до улюблених',
+        'remove_from_favourites': 'Видалити з улюблених',
+        'no_favourite_cities': 'У вас ще немає улюблених міст.',
+        'invalid_forecast_day': 'Невірний день прогнозу.',
+        'invalid_history_range': 'Невірний період історії.',
+        'no_weather_history': "Немає історії погоди для '%(city)s'",
+        'invalid_conversion_request': 'Вкажіть суму, вихідну та цільову валюту для кожної конвертації.',
+        'invalid_search_query': 'Введіть пошуковий запит.',
+        'invalid_news_request': 'Невірна категорія або сторінка новин.',
+        'loading_more_news': 'Завантаження новин…',
+        'news_overview_title': 'Головні новини за країнами',
+        'news_overview_link': 'Новини всіх країн',
+        'news_overview_stale': 'Оновлення недоступне, показано попередні заголовки.',
     }
 }
@@ -1,11 +1,12 @@
 from django.core.cache import cache
-from django.http import JsonResponse
 from django.utils import timezone
 
 from urllib.parse import quote
 from datetime import datetime, timedelta
 import pytz
 
+from .preferences_utils import get_preference, set_preference
+
 DAYS_TRANSLATIONS = {
     'en': [
         'Monday', 'Tuesday', 'Wednesday', 'Thursday',
@@ -43,50 +44,87 @@ MONTHS_TRANSLATIONS = {
 
 def get_language(request):
     """
-    Gets the language from the request or session.
+    Gets the language from the request or the visitor's preferences.
 
     This function retrieves the language code from the GET parameters
-    or the session. If no language is found, it defaults to English ('en').
-    The retrieved language code is then stored in the session.
+    or the preferences cookie. If no language is found, it defaults to
+    English ('en'). The retrieved language code is then stored in the
+    preferences if it changed.
 
     Parameters:
     request (HttpRequest): The request object containing the GET parameters
-                           and session.
+                           and preferences.
 
     Returns:
     str: The language code.
     """
     language = request.GET.get('lang')
     if not language:
-        language = request.session.get('language', 'en')
-    request.session['language'] = language
+        language = get_preference(request, 'language', 'en')
+    set_preference(request, 'language', language)
     return language
 
 
-def set_timezone(request):
+def get_page_context(request):
+    """
+    Resolves the language, timezone and current date shown on every page.
+
+    This function only reads the request and the preferences, so it
+    never blocks and can run directly in async code.
+
+    Parameters:
+    request (HttpRequest): The request object containing the GET parameters
+                           and preferences.
+
+    Returns:
+    dict: The language code, the user's timezone and the translated
+          current date and time in that timezone.
+    """
+    language = get_language(request)
+    user_timezone = pytz.timezone(
+        get_preference(request, 'django_timezone', 'UTC')
+    )
+    now = timezone.now().astimezone(user_timezone)
+    translated_day, translated_month = get_translated_day_and_month(
+        now, language, 'full'
+    )
+    return {
+        'language': language,
+        'user_timezone': user_timezone,
+        'current_date': (
+            f"{translated_day}, {now.day} {translated_month} {now.year}"
+        ),
+        'current_time': now.strftime('%H:%M'),
+    }
+
+
+def get_user_context(request):
     """
-    Sets the user's timezone based on the request.
+    Resolves the current user and their avatar.
 
-    This function retrieves the 'timezone' parameter from the GET request,
-    activates the timezone if it is valid, and stores the timezone in the
-    user's session. It handles invalid timezone errors gracefully.
+    Loading the user and profile may query the session store and the
+    database, so async code has to call this function in a thread.
 
     Parameters:
-    request (HttpRequest): The request containing the 'timezone' parameter
-                           in the GET query string.
+    request (HttpRequest): The request object with the user.
 
     Returns:
-    JsonResponse: A response with a JSON object indicating the status
-                  of the operation.
-    """
-    timezone_str = request.GET.get('timezone')
-    if timezone_str:
-        try:
-            timezone.activate(pytz.timezone(timezone_str))
-            request.session['django_timezone'] = timezone_str
-        except pytz.UnknownTimeZoneError:
-            pass
-    return JsonResponse({'status': 'success'})
+    dict: The user, whether they are authenticated and their avatar URL
+          (None if they have no avatar).
+    """
+    user = request.user
+    avatar_url = None
+    if (
+        user.is_authenticated
+            and hasattr(user, 'profile')
+            and user.profile.avatar
+    ):
+        avatar_url = user.profile.avatar.url
+    return {
+        'user': user,
+        'is_authenticated': user.is_authenticated,
+        'avatar_url': avatar_url,
+    }
 
 
 def get_translated_day_and_month(date_obj, language='en', format_type='full'):
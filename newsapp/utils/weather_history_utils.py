@@ -0,0 +1,276 @@
+from django.db import DatabaseError
+from django.utils import timezone
+
+from asgiref.sync import sync_to_async
+from datetime import datetime, timedelta
+import numpy as np
+import logging
+import pytz
+
+from ..models import WeatherLocationName, WeatherObservation
+from .background import run_in_background, schedule_periodic
+from .location_utils import get_cached_geocode
+
+logger = logging.getLogger(__name__)
+
+# Observations older than this are deleted
+WEATHER_HISTORY_RETENTION_DAYS = 30
+
+# Interval in seconds between two runs of the retention job
+WEATHER_HISTORY_PRUNE_INTERVAL = 6 * 60 * 60
+
+# Numeric columns of an observation, in canonical metric units
+WEATHER_HISTORY_FIELDS = (
+    'temperature_c', 'feelslike_c', 'humidity', 'wind_kph',
+    'pressure_mb', 'visibility_km', 'uv_index',
+)
+
+# Upper limit of points returned by one history query
+MAX_HISTORY_POINTS = 500
+
+
+def get_location_key(lat, lon):
+    """
+    Build the canonical location key of a pair of coordinates.
+
+    Coordinates are rounded to two decimals (about 1 km), so every city
+    name that geocodes to the same place maps to the same key.
+
+    Parameters:
+    lat (float): Latitude of the location.
+    lon (float): Longitude of the location.
+
+    Returns:
+    str: The location key, e.g. '50.45,30.52'.
+    """
+    return f"{float(lat):.2f},{float(lon):.2f}"
+
+
+def build_observation(geo_data, weather_data):
+    """
+    Build an observation from processed current weather data.
+
+    Parameters:
+    geo_data (dict): Geocoded data including the coordinates.
+    weather_data (dict): Processed weather data with 'current' and 'tz_id'.
+
+    Returns:
+    WeatherObservation: The unsaved observation, or None if the weather
+                        data has no usable current conditions.
+    """
+    current = weather_data.get('current')
+    if not current:
+        return None
+
+    try:
+        local_time = datetime.strptime(
+            current['update_time'], '%Y-%m-%d %H:%M'
+        )
+        observed_at = pytz.timezone(
+            weather_data.get('tz_id', 'UTC')
+        ).localize(local_time)
+
+        return WeatherObservation(
+            location=get_location_key(geo_data['lat'], geo_data['lon']),
+            observed_at=observed_at,
+            **{field: current[field] for field in WEATHER_HISTORY_FIELDS}
+        )
+    except (KeyError, TypeError, ValueError, pytz.UnknownTimeZoneError):
+        return None
+
+
+def record_weather_observations(entries):
+    """
+    Store the current conditions of freshly fetched weather data.
+
+    An observation is stored once per location and update time, however
+    often and in however many languages the weather data is fetched.
+    The requested city name and the geocoded English name are mapped to
+    the location, see get_history_location. Storage errors are logged
+    and never affect the weather response.
+
+    Parameters:
+    entries (list): Triples of the requested city name, its geocoded
+                    data and the processed weather data.
+
+    Returns:
+    int: Number of observations passed to the database.
+    """
+    observations = []
+    names = {}
+    for city, geo_data, weather_data in entries:
+        observation = build_observation(geo_data, weather_data)
+        if observation is None:
+            continue
+        observations.append(observation)
+        for name in (city, geo_data.get('city_en')):
+            if name:
+                names[name.strip().lower()] = observation.location
+    if not observations:
+        return 0
+
+    try:
+        WeatherObservation.objects.bulk_create(
+            observations, ignore_conflicts=True
+        )
+        WeatherLocationName.objects.bulk_create(
+            [
+                WeatherLocationName(name=name, location=location)
+                for name, location in names.items()
+            ],
+            update_conflicts=True, unique_fields=['name'],
+            update_fields=['location']
+        )
+    except DatabaseError as e:
+        logger.error(f"Error storing weather observations: {e}")
+        return 0
+
+    ensure_weather_history_retention()
+    return len(observations)
+
+
+async def _record_weather_observations(entries):
+    """Store weather observations from the background loop."""
+    await sync_to_async(record_weather_observations)(entries)
+
+
+def schedule_weather_observations(entries):
+    """
+    Store the current conditions of fetched weather data in the background.
+
+    The weather response does not wait for the database writes of
+    record_weather_observations.
+
+    Parameters:
+    entries (list): Triples of the requested city name, its geocoded
+                    data and the processed weather data.
+    """
+    if entries:
+        run_in_background(_record_weather_observations(entries))
+
+
+def get_history_location(city):
+    """
+    Find the canonical location of a city's weather history.
+
+    Cities are resolved from the names recorded with their observations,
+    or else from the geocoding cache, so the geocoding API is never
+    called for them.
+
+    Parameters:
+    city (str): The city name, compared case-insensitively.
+
+    Returns:
+    str: The location key, or None if the city's weather was never shown.
+    """
+    location = WeatherLocationName.objects.filter(
+        name=city.strip().lower()
+    ).values_list('location', flat=True).first()
+    if location is not None:
+        return location
+
+    geo_data = get_cached_geocode(city)
+    if geo_data is None:
+        return None
+    return get_location_key(geo_data['lat'], geo_data['lon'])
+
+
+def prune_weather_history(days=WEATHER_HISTORY_RETENTION_DAYS):
+    """
+    Delete observations older than the retention period, and the city
+    names of locations that no longer have any observations.
+
+    Parameters:
+    days (int): Number of days of history to keep.
+
+    Returns:
+    int: Number of deleted observations.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = WeatherObservation.objects.filter(
+        observed_at__lt=cutoff
+    ).delete()
+    WeatherLocationName.objects.exclude(
+        location__in=WeatherObservation.objects.values('location')
+    ).delete()
+    return deleted
+
+
+async def _prune_weather_history():
+    """Run the retention job from the background loop."""
+    deleted = await sync_to_async(prune_weather_history)()
+    logger.info(f"Pruned {deleted} weather observations")
+
+
+def ensure_weather_history_retention():
+    """
+    Start the periodic retention job of the weather history in this process.
+    """
+    schedule_periodic(
+        'weather_history_retention', _prune_weather_history,
+        WEATHER_HISTORY_PRUNE_INTERVAL
+    )
+
+
+def get_weather_history(location, start, end, points):
+    """
+    Return the observations of a location in a time range.
+
+    This function:
+    - Loads the numeric columns of the range with one indexed query.
+    - Downsamples them on the server if the range holds more than `points`
+      observations: the range is split into `points` equal time buckets
+      and every non-empty bucket is reduced to the mean of its values.
+
+    Parameters:
+    location (str): Canonical location key, see get_location_key.
+    start (datetime): Start of the range (inclusive, timezone-aware).
+    end (datetime): End of the range (inclusive, timezone-aware).
+    points (int): Maximum number of points to return.
+
+    Returns:
+    dict: Lists of ISO 8601 UTC times and of every field in
+          WEATHER_HISTORY_FIELDS, one entry per point.
+    """
+    rows = list(
+        WeatherObservation.objects.filter(
+            location=location, observed_at__range=(start, end)
+        ).order_by('observed_at').values_list(
+            'observed_at', *WEATHER_HISTORY_FIELDS
+        )
+    )
+    history = {'time': []}
+    history.update({field: [] for field in WEATHER_HISTORY_FIELDS})
+    if not rows:
+        return history
+
+    times = np.array(
+        [row[0].timestamp() for row in rows], dtype=float
+    )
+    values = np.array([row[1:] for row in rows], dtype=float)
+
+    if len(rows) > points:
+        span = max(end.timestamp() - start.timestamp(), 1.0)
+        buckets = np.clip(
+            ((times - start.timestamp()) / span * points).astype(int),
+            0, points - 1
+        )
+        counts = np.bincount(buckets, minlength=points)
+        filled = counts > 0
+        times = (
+            np.bincount(buckets, weights=times, minlength=points)[filled]
+            / counts[filled]
+        )
+        values = np.column_stack([
+            np.bincount(buckets, weights=column, minlength=points)[filled]
+            / counts[filled]
+            for column in values.T
+        ])
+
+    history['time'] = [
+        datetime.fromtimestamp(round(moment), tz=pytz.utc).isoformat()
+        for moment in times
+    ]
+    for index, field in enumerate(WEATHER_HISTORY_FIELDS):
+        history[field] = np.round(values[:, index], 1).tolist()
+    return history
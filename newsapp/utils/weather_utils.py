@@ -2,16 +2,24 @@ from django.core.cache import cache
 
 from asgiref.sync import sync_to_async
 from datetime import datetime
+import numpy as np
 import logging
+import asyncio
+import math
 import aiohttp
+import pytz
 import os
 
-from .location_utils import get_country_name_by_code, geocode_city
+from .background import run_deduplicated
+from .location_utils import (
+    get_country_name_by_code, geocode_city, process_city_info
+)
 from .utils import generate_cache_key, get_translated_day_and_month
+from .weather_history_utils import schedule_weather_observations
 
 from .exceptions import (
     handle_weather_api_error,
-    GeocodingError, UnableToRetrieveWeatherError,
+    APIError, GeocodingError, UnableToRetrieveWeatherError,
     InvalidJSONResponseError, IncompleteWeatherDataError
 )
 
@@ -19,6 +27,45 @@ logger = logging.getLogger(__name__)
 
 WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 
+# Maximum number of locations in one bulk request to the weather API
+BULK_WEATHER_LIMIT = 50
+
+# Hours between two entries of the hourly forecast strip
+HOURLY_FORECAST_STEP = 3
+
+# Field name suffixes of the imperial duplicates in weather API data
+IMPERIAL_SUFFIXES = ('_f', '_mph', '_in', '_miles')
+
+# Conversions from the canonical metric values (°C, km/h, mb, km).
+# weather.js implements the same conversions and rounding.
+UNIT_CONVERSIONS = {
+    'c': lambda value: value,
+    'f': lambda value: value * 9 / 5 + 32,
+    'kph': lambda value: value,
+    'mps': lambda value: value / 3.6,
+    'mph': lambda value: value / 1.609344,
+    'mb': lambda value: value,
+    'mmhg': lambda value: value * 0.750062,
+    'in': lambda value: value * 0.02953,
+    'km': lambda value: value,
+    'miles': lambda value: value / 1.609344,
+}
+
+# Julian date of the J2000.0 epoch and of the Unix epoch
+J2000 = 2451545.0
+UNIX_EPOCH_JD = 2440587.5
+
+# Mean length of the lunar cycle and a reference new moon
+# (2000-01-06 18:14 UTC) as a Julian date
+SYNODIC_MONTH = 29.530588853
+REFERENCE_NEW_MOON_JD = 2451550.26
+
+# Moon phase names as returned by the weather API
+MOON_PHASES = [
+    'New Moon', 'Waxing Crescent', 'First Quarter', 'Waxing Gibbous',
+    'Full Moon', 'Waning Gibbous', 'Last Quarter', 'Waning Crescent'
+]
+
 
 async def fetch_weather_data(city, transl, language='en', data_type='both'):
     """
@@ -31,6 +78,8 @@ async def fetch_weather_data(city, transl, language='en', data_type='both'):
     - Fetches and processes weather data if not available in the cache.
     - Fetches and processes weather data from an external weather API if not
       available in the cache.
+    - Records freshly fetched current conditions in the weather history
+      from the background loop.
     - Stores the fetched weather data in the cache for future access.
 
     Parameters:
@@ -65,6 +114,7 @@ async def fetch_weather_data(city, transl, language='en', data_type='both'):
             weather_data = await fetch_and_process_weather_data(
                 geo_data, transl, language, data_type, default_value
             )
+            schedule_weather_observations([(city, geo_data, weather_data)])
             await sync_to_async(cache.set)(cache_key, weather_data, 3600)
         except Exception:
             raise UnableToRetrieveWeatherError(
@@ -74,6 +124,56 @@ async def fetch_weather_data(city, transl, language='en', data_type='both'):
     return weather_data
 
 
+def schedule_weather_page_prefetch(city, transl, language='en'):
+    """
+    Schedule a background prefetch of the weather page data for a city.
+
+    Prefetches for the same city and language are deduplicated while one
+    is in flight, and the number of background prefetches is bounded.
+
+    Parameters:
+    city (str): Name of the city shown to the user.
+    transl (dict): Dictionary containing translations for error messages.
+    language (str): Language code (default: 'en').
+
+    Returns:
+    bool: True if a prefetch was scheduled, otherwise False.
+    """
+    key = generate_cache_key('prefetch_weather_page', city.lower(), language)
+    return run_deduplicated(key, prefetch_weather_page, city, transl, language)
+
+
+async def prefetch_weather_page(city, transl, language='en'):
+    """
+    Warm the cache with the data the weather page needs for a city.
+
+    This function:
+    - Fetches current and forecast weather data ('both') unless cached.
+    - Resolves the Ukrainian place-name translations of the city, region
+      and country for the Ukrainian interface.
+
+    Parameters:
+    city (str): Name of the city.
+    transl (dict): Dictionary containing translations for error messages.
+    language (str): Language code (default: 'en').
+    """
+    weather_data = await fetch_weather_data(
+        city, transl, language, data_type='both'
+    )
+    if language == 'uk':
+        await process_city_info(
+            city,
+            weather_data['geo_city'],
+            weather_data['country_code'],
+            weather_data['geo_country'],
+            weather_data['geo_region'],
+            weather_data['api_country'],
+            weather_data['api_region'],
+            language,
+            transl
+        )
+
+
 async def fetch_and_process_weather_data(
         geo_data, transl, language, data_type, default_value
 ):
@@ -173,86 +273,275 @@ async def fetch_and_process_weather_data(
 
                 forecast_days = data.get('forecast', {}).get('forecastday', [])
                 if forecast_days:
-                    today_forecast = forecast_days[0]
-                    today_forecast['astro'] = {
-                        'sunrise': today_forecast['astro'].get('sunrise',
-                                                               default_value),
-                        'sunset': today_forecast['astro'].get('sunset',
-                                                              default_value),
-                        'moon_phase': today_forecast['astro'].get('moon_phase',
-                                                                  default_value
-                                                                  ),
-                    }
-                    for day in forecast_days:
-                        forecast_date_str = day.get('date')
-                        if forecast_date_str:
-                            forecast_date = datetime.strptime(
-                                forecast_date_str, '%Y-%m-%d'
-                            )
-                            translated_day, translated_month = (
-                                get_translated_day_and_month(forecast_date,
-                                                             language)
-                            )
-
-                            day['forecast_date'] = {
-                                'day': translated_day,
-                                'date': forecast_date.day,
-                                'month': translated_month,
-                            }
-                            day['max_temp_c'] = (
-                                round(day.get('day', {}).get('maxtemp_c', 0))
-                            )
-                            day['max_temp_f'] = (
-                                round(day.get('day', {}).get('maxtemp_f', 0))
-                            )
-                            day['min_temp_c'] = (
-                                round(day.get('day', {}).get('mintemp_c', 0))
-                            )
-                            day['min_temp_f'] = (
-                                round(day.get('day', {}).get('mintemp_f', 0))
-                            )
-                            day['condition'] = (
-                                day.get('day', {}).get('condition',
-                                                       default_value)
-                            )
-
-                            for hour in day.get('hour', []):
-                                hour_time_str = hour.get('time')
-                                if hour_time_str:
-                                    hour['time'] = (
-                                        datetime.strptime(hour_time_str,
-                                                          '%Y-%m-%d %H:%M')
-                                    )
-                                    hour['temp_c'] = (
-                                        round(hour.get('temp_c', 0))
-                                    )
-                                    hour['temp_f'] = (
-                                        round(hour.get('temp_f', 0))
-                                    )
-                                    hour['wind_mps'] = (
-                                        round(hour.get('wind_kph', 0) / 3.6)
-                                    )
-                                    hour['pressure_mb'] = (
-                                        round(hour.get('pressure_mb', 0))
-                                    )
-                                    hour['pressure_mm'] = (
-                                        round(hour.get('pressure_mb', 0)
-                                              * 0.750062)
-                                    )
-                    weather_data['forecast'] = forecast_days
-
-        weather_data.update({
-            'geo_city': geo_data['city_en'],
-            'geo_region': geo_data['region'],
-            'geo_country': geo_data['country_name'],
-            'country_code': geo_data['country_code'],
-            'country': get_country_name_by_code(geo_data['country_code'])
-        })
+                    weather_data['forecast'] = await sync_to_async(
+                        process_forecast_weather_data
+                    )(forecast_days, language, default_value)
+
+    add_location_data(weather_data, geo_data, default_value)
 
     await sync_to_async(cache.set)(cache_key, weather_data, 3600)
     return weather_data
 
 
+async def fetch_weather_data_bulk(
+        cities, transl, language='en', data_type='current', refresh=False
+):
+    """
+    Fetch weather data for several cities at once.
+
+    This function:
+    - Looks up the weather data of all cities in the cache with one query.
+    - Looks up the geocoded data of the remaining cities in the cache and
+      geocodes the misses concurrently.
+    - Fetches the weather data of all still missing cities with the bulk
+      request mode of the weather API.
+    - Stores the fetched weather data in the cache for future access.
+
+    Parameters:
+    cities (list): Names of the cities for which weather data is fetched.
+    transl (dict): Dictionary containing translations for error messages.
+    language (str): Language code (default: 'en').
+    data_type (str): Type of weather data to fetch
+                     ('current', 'forecast', or 'both').
+    refresh (bool): If True, cached weather data is ignored and fetched
+                    again (default: False).
+
+    Returns:
+    list: A dictionary per city with the 'city', its 'status'
+          ('ok', 'not_found' or 'error') and either the 'weather' data
+          or an 'error' message.
+    """
+    cities = list(dict.fromkeys(cities))
+    default_value = 'N/A' if language == 'en' else 'н/д'
+    results = {}
+
+    weather_keys = {
+        city: generate_cache_key('weather_data', city, language, data_type)
+        for city in cities
+    }
+    cached_weather = {} if refresh else await sync_to_async(cache.get_many)(
+        list(weather_keys.values())
+    )
+    for city, key in weather_keys.items():
+        if key in cached_weather:
+            results[city] = _bulk_result(city, 'ok', cached_weather[key])
+
+    pending = [city for city in cities if city not in results]
+    geo_keys = {city: generate_cache_key('geocode', city) for city in pending}
+    cached_geo = await sync_to_async(cache.get_many)(list(geo_keys.values()))
+    geo_by_city = {
+        city: cached_geo[key] for city, key in geo_keys.items()
+        if key in cached_geo
+    }
+
+    misses = [city for city in pending if city not in geo_by_city]
+    responses = await asyncio.gather(
+        *(geocode_city(city, transl=transl) for city in misses),
+        return_exceptions=True
+    )
+    for city, response in zip(misses, responses):
+        if isinstance(response, GeocodingError):
+            results[city] = _bulk_result(
+                city, 'not_found',
+                error=transl['could_not_geocode'] % {'city': city}
+            )
+        elif isinstance(response, Exception):
+            logger.error(f"Geocoding error for {city}: {response}")
+            results[city] = _bulk_result(
+                city, 'error', error=transl['unable_to_retrieve_weather']
+            )
+        else:
+            geo_by_city[city] = response
+
+    # Cities that share a geocoded location share one cache entry
+    canonical_keys = {
+        city: generate_cache_key(
+            'weather_data', geo_data['city_en'], language, data_type
+        )
+        for city, geo_data in geo_by_city.items()
+    }
+    cached_canonical = {} if refresh else await sync_to_async(
+        cache.get_many
+    )(list(canonical_keys.values()))
+    to_fetch = {}
+    for city, geo_data in geo_by_city.items():
+        key = canonical_keys[city]
+        if key in cached_canonical:
+            results[city] = _bulk_result(city, 'ok', cached_canonical[key])
+        else:
+            to_fetch[city] = geo_data
+
+    if to_fetch:
+        fetched = await fetch_and_process_weather_data_bulk(
+            to_fetch, transl, language, data_type, default_value
+        )
+        new_entries = {}
+        for city, weather_data in fetched.items():
+            if weather_data is None:
+                results[city] = _bulk_result(
+                    city, 'error', error=transl['unable_to_retrieve_weather']
+                )
+                continue
+            results[city] = _bulk_result(city, 'ok', weather_data)
+            new_entries[weather_keys[city]] = weather_data
+            new_entries[canonical_keys[city]] = weather_data
+        await sync_to_async(cache.set_many)(new_entries, 3600)
+
+    return [results[city] for city in cities]
+
+
+async def fetch_and_process_weather_data_bulk(
+        geo_by_city, transl, language, data_type, default_value
+):
+    """
+    Fetch and process weather data for several locations in one request.
+
+    This function:
+    - Sends the coordinates of all locations to the bulk request mode
+      of the weather API, once per required endpoint.
+    - Processes the current and forecast data of every location the same
+      way as for a single location, including the weather history.
+
+    Parameters:
+    geo_by_city (dict): Geocoded data of every city, keyed by city name.
+    transl (dict): Dictionary containing translations for error messages.
+    language (str): Language code for data localization.
+    data_type (str): Type of weather data to fetch
+                     ('current', 'forecast', or 'both').
+    default_value (str): Default value for missing or unavailable data.
+
+    Returns:
+    dict: Processed weather data keyed by city name, or None for the cities
+          whose weather data could not be retrieved.
+    """
+    cities = list(geo_by_city)
+    locations = [
+        {
+            'q': f"{geo_by_city[city]['lat']},{geo_by_city[city]['lon']}",
+            'custom_id': str(index),
+        }
+        for index, city in enumerate(cities)
+    ]
+    weather_by_city = {city: {} for city in cities}
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            if data_type in ('current', 'both'):
+                queries = await _fetch_bulk_weather(
+                    session, 'current', locations, language, transl
+                )
+                for index, city in enumerate(cities):
+                    query = queries.get(str(index))
+                    if not query or not query.get('current'):
+                        weather_by_city[city] = None
+                        continue
+                    weather_by_city[city].update(
+                        process_current_weather_data(query, default_value)
+                    )
+
+            if data_type in ('forecast', 'both'):
+                queries = await _fetch_bulk_weather(
+                    session, 'forecast', locations, language, transl,
+                    extra_params='&days=3'
+                )
+                for index, city in enumerate(cities):
+                    if weather_by_city[city] is None:
+                        continue
+                    query = queries.get(str(index)) or {}
+                    forecast_days = (
+                        query.get('forecast', {}).get('forecastday', [])
+                    )
+                    if not forecast_days:
+                        weather_by_city[city] = None
+                        continue
+                    weather_by_city[city]['forecast'] = await sync_to_async(
+                        process_forecast_weather_data
+                    )(forecast_days, language, default_value)
+    except (APIError, aiohttp.ClientError) as e:
+        logger.error(f"Bulk weather request failed: {e}")
+        return {city: None for city in cities}
+
+    fetched = [
+        (city, geo_by_city[city], weather_data)
+        for city, weather_data in weather_by_city.items()
+        if weather_data is not None
+    ]
+    for city, geo_data, weather_data in fetched:
+        add_location_data(weather_data, geo_data, default_value)
+    schedule_weather_observations(fetched)
+
+    return weather_by_city
+
+
+async def _fetch_bulk_weather(
+        session, endpoint, locations, language, transl, extra_params=''
+):
+    """
+    Send one bulk request to the weather API.
+
+    Returns:
+    dict: The 'query' object of every location, keyed by its custom_id.
+          Locations the API reported an error for are left out.
+    """
+    url = (
+        f"http://api.weatherapi.com/v1/{endpoint}.json"
+        f"?key={WEATHER_API_KEY}&q=bulk&lang={language}{extra_params}"
+    )
+    async with session.post(url, json={'locations': locations}) as response:
+        if response.status != 200:
+            await handle_weather_api_error(response, transl)
+        try:
+            data = await response.json()
+        except (ValueError, aiohttp.ContentTypeError):
+            raise InvalidJSONResponseError(transl['invalid_JSON_response'])
+
+    queries = {}
+    for item in data.get('bulk', []):
+        query = item.get('query', {})
+        if 'error' in query:
+            logger.error(
+                f"Weather error for {query.get('q')}: {query['error']}"
+            )
+            continue
+        queries[query.get('custom_id')] = query
+    return queries
+
+
+def _bulk_result(city, status, weather=None, error=None):
+    """Build the per-city entry of a bulk weather response."""
+    result = {'city': city, 'status': status}
+    if weather is not None:
+        result['weather'] = weather
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+def add_location_data(weather_data, geo_data, default_value):
+    """
+    Add geocoded location details and local astro data to weather data.
+
+    Parameters:
+    weather_data (dict): Processed weather data, updated in place.
+    geo_data (dict): Geocoded data including city name, coordinates, etc.
+    default_value (str): Default value for missing or unavailable data.
+    """
+    if 'current' in weather_data:
+        local_date = weather_data['current']['localtime'].split(' ')[0]
+        weather_data['astro'] = calculate_astro_data(
+            geo_data['lat'], geo_data['lon'], [local_date],
+            weather_data['tz_id'], default_value
+        )[0]
+
+    weather_data.update({
+        'geo_city': geo_data['city_en'],
+        'geo_region': geo_data['region'],
+        'geo_country': geo_data['country_name'],
+        'country_code': geo_data['country_code'],
+        'country': get_country_name_by_code(geo_data['country_code'])
+    })
+
+
 def process_current_weather_data(data, default_value):
     """
     Process current weather data to extract and format information.
@@ -260,6 +549,8 @@ def process_current_weather_data(data, default_value):
     This function:
     - Extracts temperature, pressure, wind speed, visibility, and other details
       from the API response.
+    - Keeps one canonical metric value per measurement (°C, km/h, mb, km);
+      other units are derived with convert_unit and in weather.js.
     - Handles any missing data using a provided default value.
     - Prepares the data for easy access and display.
 
@@ -280,28 +571,18 @@ def process_current_weather_data(data, default_value):
         'api_country': api_country,
         'tz_id': data['location'].get('tz_id', 'UTC'),
         'current': {
-            'temperature_c': round(data['current'].get('temp_c', 0)),
-            'temperature_f': round(data['current'].get('temp_f', 0)),
-            'feelslike_c': round(data['current'].get('feelslike_c', 0)),
-            'feelslike_f': round(data['current'].get('feelslike_f', 0)),
-            'dewpoint_c': round(data['current'].get('dewpoint_c', 0)),
-            'dewpoint_f': round(data['current'].get('dewpoint_f', 0)),
+            'temperature_c': data['current'].get('temp_c', 0),
+            'feelslike_c': data['current'].get('feelslike_c', 0),
+            'dewpoint_c': data['current'].get('dewpoint_c', 0),
             'condition': (
                 data['current']['condition'].get('text', default_value)
             ),
             'icon_url': f"http:{data['current']['condition'].get('icon', '')}",
             'humidity': data['current'].get('humidity', 0),
-            'wind_mps': round(data['current'].get('wind_kph', 0) / 3.6),  # m/s
-            'wind_kph': round(data['current'].get('wind_kph', 0)),
-            'wind_mph': round(data['current'].get('wind_mph', 0)),
+            'wind_kph': data['current'].get('wind_kph', 0),
             'wind_dir': data['current'].get('wind_dir', 'Unknown'),
-            'pressure_mb': round(data['current'].get('pressure_mb', 0)),
-            'pressure_in': round(data['current'].get('pressure_in', 0)),
-            'pressure_mm': (
-                round(data['current'].get('pressure_mb', 0) * 0.750062)
-            ),  # mmHg
+            'pressure_mb': data['current'].get('pressure_mb', 0),
             'visibility_km': data['current'].get('vis_km', 0),
-            'visibility_miles': data['current'].get('vis_miles', 0),
             'uv_index': data['current'].get('uv', 0),
             'update_time': data['current'].get(
                 'last_updated', '1970-01-01 00:00:00'
@@ -313,3 +594,222 @@ def process_current_weather_data(data, default_value):
     }
 
     return current_data
+
+
+def process_forecast_weather_data(forecast_days, language, default_value):
+    """
+    Process forecast weather data with bulk timestamp parsing.
+
+    This function:
+    - Keeps only sunrise, sunset and moon phase in today's astro data.
+    - Parses all forecast dates and hourly timestamps in bulk with NumPy.
+    - Keeps the canonical metric values (°C, km/h, mb) of every day and
+      hour as floats and drops the imperial duplicates, which are
+      derived with convert_unit and in weather.js instead.
+
+    Parameters:
+    forecast_days (list): The 'forecastday' list from the weather API.
+    language (str): Language code for translating day and month names.
+    default_value (str): Default value for missing or unavailable data.
+
+    Returns:
+    list: The forecast days with processed daily and hourly values.
+    """
+    today_forecast = forecast_days[0]
+    astro = today_forecast.get('astro', {})
+    today_forecast['astro'] = {
+        'sunrise': astro.get('sunrise', default_value),
+        'sunset': astro.get('sunset', default_value),
+        'moon_phase': astro.get('moon_phase', default_value),
+    }
+
+    days = [day for day in forecast_days if day.get('date')]
+    if not days:
+        return forecast_days
+
+    forecast_dates = np.array(
+        [day['date'] for day in days], dtype='datetime64[D]'
+    ).astype(object)
+    day_totals = [_metric_only(day.get('day', {})) for day in days]
+
+    for index, day in enumerate(days):
+        forecast_date = forecast_dates[index]
+        translated_day, translated_month = (
+            get_translated_day_and_month(forecast_date, language)
+        )
+        day['forecast_date'] = {
+            'day': translated_day,
+            'date': forecast_date.day,
+            'month': translated_month,
+        }
+        day['max_temp_c'] = float(day_totals[index].get('maxtemp_c', 0))
+        day['min_temp_c'] = float(day_totals[index].get('mintemp_c', 0))
+        day['day'] = day_totals[index]
+        day['condition'] = day_totals[index].get('condition', default_value)
+
+    hours = [
+        hour for day in days for hour in day.get('hour', [])
+        if hour.get('time')
+    ]
+    if not hours:
+        return forecast_days
+
+    hour_times = np.array(
+        [hour['time'] for hour in hours], dtype='datetime64[m]'
+    ).astype(object)
+
+    for index, hour in enumerate(hours):
+        for key in [key for key in hour if key.endswith(IMPERIAL_SUFFIXES)]:
+            del hour[key]
+        hour['time'] = hour_times[index]
+        for key in ('temp_c', 'wind_kph', 'pressure_mb'):
+            hour[key] = float(hour.get(key, 0))
+
+    return forecast_days
+
+
+def _metric_only(values):
+    """Return a copy of a dictionary without its imperial unit fields."""
+    return {
+        key: value for key, value in values.items()
+        if not key.endswith(IMPERIAL_SUFFIXES)
+    }
+
+
+def calculate_astro_data(lat, lon, dates, tz_id='UTC', default_value='N/A'):
+    """
+    Calculate sunrise, sunset and moon phase locally for several days.
+
+    This function:
+    - Solves the sunrise equation for all dates at once with NumPy.
+    - Converts the sunrise and sunset times to the location's timezone.
+    - Determines the moon phase from the age of the moon at local noon.
+    - Formats the results like the 'astro' data of the weather API.
+
+    Parameters:
+    lat (float): Latitude of the location in degrees.
+    lon (float): Longitude of the location in degrees (east is positive).
+    dates (list): Dates as 'YYYY-MM-DD' strings or date objects.
+    tz_id (str): Timezone identifier of the location (default: 'UTC').
+    default_value (str): Value used when the sun does not rise or set.
+
+    Returns:
+    list: A dictionary with 'sunrise', 'sunset' and 'moon_phase'
+          for every date.
+    """
+    local_timezone = pytz.timezone(tz_id)
+    days = np.array(dates, dtype='datetime64[D]')
+    day_numbers = (days - np.datetime64('2000-01-01')).astype(float)
+
+    # Sunrise equation (solar transit and hour angle)
+    mean_solar_time = day_numbers - lon / 360.0
+    mean_anomaly = np.radians((357.5291 + 0.98560028 * mean_solar_time) % 360)
+    center = (
+        1.9148 * np.sin(mean_anomaly)
+        + 0.02 * np.sin(2 * mean_anomaly)
+        + 0.0003 * np.sin(3 * mean_anomaly)
+    )
+    ecliptic_longitude = np.radians(
+        (np.degrees(mean_anomaly) + center + 180.0 + 102.9372) % 360
+    )
+    solar_transit = (
+        J2000 + mean_solar_time
+        + 0.0053 * np.sin(mean_anomaly)
+        - 0.0069 * np.sin(2 * ecliptic_longitude)
+    )
+    sin_declination = np.sin(ecliptic_longitude) * np.sin(np.radians(23.4397))
+    cos_declination = np.cos(np.arcsin(sin_declination))
+    latitude = np.radians(lat)
+    cos_hour_angle = (
+        (np.sin(np.radians(-0.833)) - np.sin(latitude) * sin_declination)
+        / (np.cos(latitude) * cos_declination)
+    )
+    has_sunrise = np.abs(cos_hour_angle) <= 1
+    hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1, 1)))
+    sunrise_jd = solar_transit - hour_angle / 360.0
+    sunset_jd = solar_transit + hour_angle / 360.0
+
+    # Moon age in days, taken at solar noon
+    moon_age = (solar_transit - REFERENCE_NEW_MOON_JD) % SYNODIC_MONTH
+    phase_index = np.floor(moon_age / SYNODIC_MONTH * 8 + 0.5).astype(int) % 8
+
+    sunrise_ts = (sunrise_jd - UNIX_EPOCH_JD) * 86400
+    sunset_ts = (sunset_jd - UNIX_EPOCH_JD) * 86400
+
+    astro_data = []
+    for index in range(len(days)):
+        if has_sunrise[index]:
+            sunrise = _format_astro_time(sunrise_ts[index], local_timezone)
+            sunset = _format_astro_time(sunset_ts[index], local_timezone)
+        else:
+            sunrise = sunset = default_value
+        astro_data.append({
+            'sunrise': sunrise,
+            'sunset': sunset,
+            'moon_phase': MOON_PHASES[phase_index[index]],
+        })
+
+    return astro_data
+
+
+def _format_astro_time(timestamp, local_timezone):
+    """Format a Unix timestamp as 'hh:mm AM' in the given timezone."""
+    return datetime.fromtimestamp(
+        round(float(timestamp)), local_timezone
+    ).strftime('%I:%M %p')
+
+
+def build_hourly_forecast(forecast_day, language):
+    """
+    Build the compact hourly forecast of one day for the forecast strip.
+
+    This function:
+    - Keeps every HOURLY_FORECAST_STEP-th hour of the day.
+    - Formats the hour in the language's clock format.
+    - Returns the values as columns of canonical metric values, which
+      weather.js renders and converts to the selected units.
+
+    Parameters:
+    forecast_day (dict): A processed day from the weather data forecast.
+    language (str): Language code for the time format.
+
+    Returns:
+    dict: Lists of times, icons, conditions, temperatures (°C),
+          pressures (mb), humidities (%), wind speeds (km/h)
+          and wind directions.
+    """
+    time_format = '%H:%M' if language == 'uk' else '%I:%M %p'
+    hours = forecast_day.get('hour', [])[::HOURLY_FORECAST_STEP]
+
+    return {
+        'time': [hour['time'].strftime(time_format) for hour in hours],
+        'icon': [
+            f"http:{hour.get('condition', {}).get('icon', '')}"
+            for hour in hours
+        ],
+        'condition': [
+            hour.get('condition', {}).get('text', '') for hour in hours
+        ],
+        'temp_c': [hour.get('temp_c', 0) for hour in hours],
+        'pressure_mb': [hour.get('pressure_mb', 0) for hour in hours],
+        'humidity': [hour.get('humidity', 0) for hour in hours],
+        'wind_kph': [hour.get('wind_kph', 0) for hour in hours],
+        'wind_dir': [hour.get('wind_dir', 'Unknown') for hour in hours],
+    }
+
+
+def convert_unit(value, unit):
+    """
+    Convert a canonical metric value to a display unit and round it.
+
+    Halves are rounded up, like Math.round in weather.js, so the server
+    and the browser render the same numbers.
+
+    Parameters:
+    value (float): Value in °C, km/h, mb or km.
+    unit (str): Target unit, one of UNIT_CONVERSIONS.
+
+    Returns:
+    int: The converted and rounded value.
+    """
+    return math.floor(UNIT_CONVERSIONS[unit](float(value)) + 0.5)
@@ -1,27 +1,59 @@
+from django.conf import settings
 from django.views import View
-from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponse, HttpResponseNotFound, JsonResponse, StreamingHttpResponse
+)
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
 
 from asgiref.sync import sync_to_async
+from datetime import datetime, timedelta
 import logging
-import pytz
+import math
 
 from .utils.translations import translations
-from .utils.utils import (
-    get_translated_day_and_month, get_language,
-    set_timezone, get_update_times
-)
+from .utils.utils import format_time, get_update_times, get_user_context
+from .utils.preferences_utils import get_preference, set_preference
 from .utils.location_utils import (
     COUNTRIES, COUNTRIES_UA, COUNTRIES_GENITIVE_UA
 )
-from .utils.weather_utils import fetch_weather_data
+from .utils.weather_utils import (
+    BULK_WEATHER_LIMIT, build_hourly_forecast, fetch_weather_data,
+    fetch_weather_data_bulk, schedule_weather_page_prefetch
+)
 from .utils.exchanger_utils import (
-    CURRENCY_MAP, fetch_exchange_rates, convert_currency
+    CURRENCY_MAP, fetch_exchange_rates, get_kyiv_today, get_rate_matrix,
+    convert_currency
+)
+from .utils.news_utils import (
+    CATEGORY_MAP, decode_news_cursor, get_articles_hash, get_news_overview,
+    get_news_page
+)
+from .utils.news_search_utils import MAX_NEWS_SEARCH_RESULTS, search_news
+from .utils.thumbnail_utils import (
+    THUMBNAIL_FORMATS, THUMBNAIL_MAX_AGE, THUMBNAIL_WIDTHS, get_thumbnail
 )
-from .utils.news_utils import CATEGORY_MAP, fetch_news_by_category
 from .utils.location_utils import process_city_info
-from .utils.exceptions import (APIError, UnableToRetrieveWeatherError)
+from .utils.exchange_history_utils import (
+    MAX_EXCHANGE_HISTORY_DAYS, MAX_EXCHANGE_HISTORY_POINTS,
+    get_exchange_rate_history
+)
+from .utils.rate_stream_utils import (
+    RATE_STREAM_RETRY, format_rate_event, get_rate_rows, stream_rate_events
+)
+from .utils.weather_history_utils import (
+    MAX_HISTORY_POINTS, WEATHER_HISTORY_RETENTION_DAYS,
+    get_history_location, get_weather_history
+)
+from .utils.favourites_utils import (
+    ensure_favourite_weather_refresh, get_cached_favourites_weather
+)
+from .utils.exceptions import (
+    APIError, ThumbnailError, UnableToRetrieveWeatherError
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,74 +64,39 @@ class BaseView(View):
     and translations, to be used across various views.
     """
 
-    def get_user(self, request):
-        """Return the current user."""
-        return request.user
-
-    @sync_to_async
-    def is_authenticated(self, request):
-        """Check if the user is authenticated."""
-        return request.user.is_authenticated
-
-    def get_avatar_url(self, user):
+    def get_favourite_cities(self, user):
         """
-        Retrieves the avatar URL for a user.
+        Retrieves the favourite weather cities of a user.
         """
-        if (
-            user.is_authenticated
-                and hasattr(user, 'profile')
-                and user.profile.avatar
-        ):
-            return user.profile.avatar.url
-        return None
+        if user.is_authenticated and hasattr(user, 'profile'):
+            return list(user.profile.favourite_cities)
+        return []
 
     async def get_common_context(self, request):
         """
         Forms and returns a common context dictionary for all views.
 
+        The shared data is resolved once per request by
+        RequestContextMiddleware; this adds the user and the translations.
+        The user is only loaded in a thread when the request carries a
+        session cookie, since without one the visitor is anonymous.
+
         Parameters:
-        request: User's session request object containing session data.
+        request: User's request object with the common context.
 
         Returns:
         dict: Dictionary with general data such as language, timezone,
-              current date and time, and translations.
+              current date and time, user, and translations.
         """
-        language = await sync_to_async(get_language)(request)
-        transl = translations.get(language, translations['en'])
-
-        await sync_to_async(set_timezone)(request)
-
-        # Get user's timezone and current time
-        timezone_str = (
-            await sync_to_async(request.session.get)('django_timezone', 'UTC')
-        )
-        user_timezone = pytz.timezone(timezone_str)
-        now = timezone.now().astimezone(user_timezone)
-
-        # Translate the date and time
-        translated_day, translated_month = (
-            await sync_to_async(get_translated_day_and_month)(
-                now, language, 'full'
-            )
-        )
-        current_time = now.strftime('%H:%M')
-        current_date = (
-            f"{translated_day}, {now.day} {translated_month} {now.year}"
+        context = dict(request.common_context)
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            context.update(await sync_to_async(get_user_context)(request))
+        else:
+            context.update(get_user_context(request))
+        context['translations'] = translations.get(
+            context['language'], translations['en']
         )
-
-        # Retrieve user's avatar URL
-        user = await sync_to_async(self.get_user)(request)
-        avatar_url = await sync_to_async(self.get_avatar_url)(request.user)
-
-        return {
-            'language': language,
-            'translations': transl,
-            'current_date': current_date,
-            'current_time': current_time,
-            'user_timezone': user_timezone,
-            'user': user,
-            'avatar_url': avatar_url,
-        }
+        return context
 
 
 class MainView(BaseView):
@@ -128,35 +125,18 @@ class MainView(BaseView):
         exchange_rate_error_message = None
 
         default_city = 'Kyiv' if language == 'en' else 'Київ'
-        current_city = request.session.get('selected_city', default_city)
+        current_city = get_preference(request, 'selected_city', default_city)
 
         # Update city to default when language is switched
         if 'language' in request.GET:
-            request.session['selected_city'] = default_city
             city = default_city
         else:
             city = request.GET.get('city', current_city)
-            if city != current_city:
-                await sync_to_async(request.session.__setitem__)(
-                    'selected_city', city
-                )
+        set_preference(request, 'selected_city', city)
 
-        country = request.GET.get(
-            'country', await sync_to_async(request.session.get)(
-                'selected_country', 'us' if language == 'en' else 'ua'
-            )
-        )
-
-        if language == 'en':
-            await sync_to_async(request.session.__setitem__)(
-                'selected_country', 'us'
-            )
-            country = 'us'
-        else:
-            await sync_to_async(request.session.__setitem__)(
-                'selected_country', 'ua'
-            )
-            country = 'ua'
+        # The homepage always shows the news of the language's country
+        country = 'us' if language == 'en' else 'ua'
+        set_preference(request, 'selected_country', country)
 
         displayed_country_name = (
             COUNTRIES_UA.get(country, 'Unknown') if language == 'uk'
@@ -180,8 +160,10 @@ class MainView(BaseView):
             weather_data = None
 
         if weather_data is None:
-            await sync_to_async(request.session.__setitem__)('selected_city',
-                                                             default_city)
+            set_preference(request, 'selected_city', default_city)
+        else:
+            # The weather page is the usual next click, so warm it up
+            schedule_weather_page_prefetch(city, transl, language)
 
         # Fetch exchange rates
         try:
@@ -197,9 +179,7 @@ class MainView(BaseView):
 
         # Fetch news articles for the main page
         try:
-            general_news = await fetch_news_by_category('general',
-                                                        country, transl)
-            articles = general_news[:10]
+            articles, _ = await get_news_page('general', country, transl)
         except APIError as e:
             logger.error(f"Error fetching general news: {str(e)}")
             context['error_message'] = transl['unable_to_fetch_news']
@@ -225,7 +205,6 @@ class MainView(BaseView):
             'user_update_time': formatted_user_update_time,
             'countries': COUNTRIES if language == 'en' else COUNTRIES_UA,
             'exchange_rate_error_message': exchange_rate_error_message,
-            'is_authenticated': await self.is_authenticated(request),
         })
 
         return render(request, 'newsapp/index.html', context)
@@ -254,11 +233,11 @@ class WeatherView(BaseView):
 
         error_message = None
         default_city = 'Kyiv' if language == 'en' else 'Київ'
-        city = request.session.get('selected_city', default_city)
+        city = get_preference(request, 'selected_city', default_city)
         if 'city' in request.GET:
             city = request.GET['city']
-            await sync_to_async(request.session.__setitem__)('selected_city',
-                                                             city)
+            set_preference(request, 'selected_city', city)
+        requested_city = city
 
         try:
             weather_data = await fetch_weather_data(
@@ -281,9 +260,18 @@ class WeatherView(BaseView):
             formatted_local_update_time, formatted_user_update_time = \
                 get_update_times(weather_data, user_timezone, transl)
 
+            # Only today's hours are embedded, other days are loaded
+            # on demand from WeatherForecastView
+            forecast = weather_data.get('forecast') or []
+            hourly_forecast = (
+                build_hourly_forecast(forecast[0], language)
+                if forecast else None
+            )
+
         except UnableToRetrieveWeatherError:
             error_message = transl['could_not_geocode'] % {'city': city}
             weather_data = None
+            hourly_forecast = None
             country_name = None
             region = None
             weather_in_text = transl['weather_in']
@@ -291,12 +279,28 @@ class WeatherView(BaseView):
             formatted_user_update_time = 'N/A'
 
             # Set default city if weather data cannot be retrieved
-            await sync_to_async(request.session.__setitem__)('selected_city',
-                                                             default_city)
+            set_preference(request, 'selected_city', default_city)
+
+        # Favourite cities are rendered from the cache only
+        favourite_cities = await sync_to_async(self.get_favourite_cities)(
+            request.user
+        )
+        if favourite_cities:
+            ensure_favourite_weather_refresh()
+        favourites = await sync_to_async(get_cached_favourites_weather)(
+            favourite_cities, language
+        )
+        is_favourite = requested_city.lower() in {
+            fav.lower() for fav in favourite_cities
+        }
 
         context.update({
             'error_message': error_message,
             'weather_data': weather_data,
+            'hourly_forecast': hourly_forecast,
+            'requested_city': requested_city,
+            'favourites': favourites,
+            'is_favourite': is_favourite,
             'city': city,
             'country_name': country_name,
             'region': region,
@@ -305,11 +309,183 @@ class WeatherView(BaseView):
             'user_update_time': formatted_user_update_time,
         })
 
-        await sync_to_async(request.session.__setitem__)('language', language)
+        set_preference(request, 'language', language)
 
         return render(request, 'newsapp/weather.html', context)
 
 
+class WeatherForecastView(BaseView):
+    """
+    View to return the hourly forecast of one day as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the hourly forecast of a forecast day.
+
+        Parameters:
+        request: User's request with an optional 'city' (defaults to the
+                 selected city) and 'day' index (defaults to today).
+
+        Returns:
+        JsonResponse: The day's date and its compact hourly forecast.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        default_city = 'Kyiv' if language == 'en' else 'Київ'
+        city = request.GET.get('city') or get_preference(
+            request, 'selected_city', default_city
+        )
+
+        try:
+            day_index = int(request.GET.get('day', 0))
+        except ValueError:
+            day_index = -1
+
+        try:
+            weather_data = await fetch_weather_data(
+                city, transl, language, data_type='both'
+            )
+        except UnableToRetrieveWeatherError:
+            return JsonResponse(
+                {'error': transl['could_not_geocode'] % {'city': city}},
+                status=404
+            )
+
+        forecast = weather_data.get('forecast') or []
+        if not 0 <= day_index < len(forecast):
+            return JsonResponse(
+                {'error': transl['invalid_forecast_day']}, status=400
+            )
+
+        return JsonResponse({
+            'city': city,
+            'language': language,
+            'day': day_index,
+            'date': forecast[day_index]['forecast_date'],
+            'hours': build_hourly_forecast(forecast[day_index], language),
+        })
+
+
+class WeatherHistoryView(BaseView):
+    """
+    View to return stored weather observations of a city as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the recent weather history of a city.
+
+        The history is read from the local observation store only, and
+        the city from the geocoding cache, so it never causes requests to
+        the weather or geocoding APIs.
+
+        Parameters:
+        request: User's request with an optional 'city' (defaults to the
+                 selected city), 'hours' to look back (default 24) and
+                 maximum number of 'points' (default 48).
+
+        Returns:
+        JsonResponse: The downsampled observations as columns.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        default_city = 'Kyiv' if language == 'en' else 'Київ'
+        city = request.GET.get('city') or get_preference(
+            request, 'selected_city', default_city
+        )
+
+        try:
+            hours = int(request.GET.get('hours', 24))
+            points = int(request.GET.get('points', 48))
+        except ValueError:
+            hours = points = 0
+        if not (
+            0 < hours <= WEATHER_HISTORY_RETENTION_DAYS * 24
+            and 0 < points <= MAX_HISTORY_POINTS
+        ):
+            return JsonResponse(
+                {'error': transl['invalid_history_range']}, status=400
+            )
+
+        location = await sync_to_async(get_history_location)(city)
+        if location is None:
+            return JsonResponse(
+                {'error': transl['no_weather_history'] % {'city': city}},
+                status=404
+            )
+
+        end = timezone.now()
+        start = end - timedelta(hours=hours)
+        history = await sync_to_async(get_weather_history)(
+            location, start, end, points
+        )
+
+        return JsonResponse({
+            'city': city,
+            'location': location,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'history': history,
+        })
+
+
+class WeatherBulkView(BaseView):
+    """
+    View to return weather data for several cities as one JSON document.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for fetching weather data of several cities.
+
+        Parameters:
+        request: User's request with one or more 'city' parameters
+                 (repeated or comma-separated) and an optional 'data_type'.
+
+        Returns:
+        JsonResponse: Weather data and status for every requested city.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        cities = [
+            city.strip()
+            for value in request.GET.getlist('city')
+            for city in value.split(',')
+            if city.strip()
+        ]
+        data_type = request.GET.get('data_type', 'current')
+
+        if not cities:
+            return JsonResponse(
+                {'error': transl['no_cities_provided']}, status=400
+            )
+        if len(cities) > BULK_WEATHER_LIMIT:
+            return JsonResponse(
+                {'error': transl['too_many_cities'] % {
+                    'limit': BULK_WEATHER_LIMIT
+                }},
+                status=400
+            )
+        if data_type not in ('current', 'forecast', 'both'):
+            return JsonResponse(
+                {'error': transl['invalid_data_type']}, status=400
+            )
+
+        results = await fetch_weather_data_bulk(
+            cities, transl, language, data_type
+        )
+
+        return JsonResponse({
+            'language': language,
+            'data_type': data_type,
+            'cities': results,
+        })
+
+
 class ExchangeRatesView(BaseView):
     """
     View to handle requests for displaying current exchange rates.
@@ -332,13 +508,15 @@ class ExchangeRatesView(BaseView):
         filter_currencies = {'USD', 'EUR', 'GBP', 'PLN', 'CHF', 'CZK'}
 
         try:
-            exchange_rates = await fetch_exchange_rates(
-                filter_currencies=filter_currencies
-            )
+            rate_matrix = await get_rate_matrix()
+            exchange_rates = rate_matrix.table(filter_currencies)
+            # Lets the converter run in the browser without a round trip
+            rate_table = rate_matrix.compact()
             error_message = None
         except APIError as e:
             logger.error(f"Error fetching exchange rates: {str(e)}")
             exchange_rates = []
+            rate_table = None
             error_message = transl['unable_to_fetch_exchange_rates']
 
         converted_amount = request.session.pop('converted_amount', '-')
@@ -351,6 +529,7 @@ class ExchangeRatesView(BaseView):
 
         context.update({
             'exchange_rates': exchange_rates,
+            'rate_table': rate_table,
             'currency_names': CURRENCY_MAP[language],
             'amount': amount,
             'converted_amount': converted_amount,
@@ -385,14 +564,10 @@ class ConvertCurrencyView(BaseView):
             amount = float(request.POST.get('amount'))
             from_currency = request.POST.get('from_currency')
             to_currency = request.POST.get('to_currency')
-            exchange_rates = await fetch_exchange_rates(
-                filter_currencies={
-                    'USD', 'EUR', 'GBP', 'CHF', 'PLN', 'CZK', 'UAH'
-                }
-            )
+            rate_matrix = await get_rate_matrix()
 
             conversion_result, error_message = await convert_currency(
-                amount, from_currency, to_currency, exchange_rates, transl
+                amount, from_currency, to_currency, rate_matrix, transl
             )
 
             if error_message:
@@ -427,6 +602,196 @@ class ConvertCurrencyView(BaseView):
         return redirect('newsapp:exchange_rates')
 
 
+class ConvertCurrencyApiView(BaseView):
+    """
+    View to convert currencies and return the result as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for converting one or more amounts.
+
+        Parameters:
+        request: User's request with 'amount', 'from_currency' and
+                 'to_currency', each repeated once per conversion.
+
+        Returns:
+        JsonResponse: The converted amounts and the version of the rates.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        from_currencies = request.GET.getlist('from_currency')
+        to_currencies = request.GET.getlist('to_currency')
+        try:
+            amounts = [float(value) for value in request.GET.getlist('amount')]
+        except ValueError:
+            amounts = []
+        if not amounts or not (
+            len(amounts) == len(from_currencies) == len(to_currencies)
+            and all(math.isfinite(amount) for amount in amounts)
+        ):
+            return JsonResponse(
+                {'error': transl['invalid_conversion_request']}, status=400
+            )
+
+        try:
+            rate_matrix = await get_rate_matrix()
+        except APIError as e:
+            logger.error(f"Error fetching exchange rates: {str(e)}")
+            return JsonResponse(
+                {'error': transl['unable_to_fetch_exchange_rates']},
+                status=503
+            )
+
+        converted_amounts = rate_matrix.convert_many(
+            amounts, from_currencies, to_currencies
+        ).tolist()
+
+        conversions = []
+        for amount, from_currency, to_currency, converted_amount in zip(
+                amounts, from_currencies, to_currencies, converted_amounts
+        ):
+            conversion = {
+                'amount': amount,
+                'from_currency': from_currency,
+                'to_currency': to_currency,
+                'converted_amount': converted_amount,
+            }
+            if not math.isfinite(converted_amount):
+                rate = rate_matrix.cross_rate(from_currency, to_currency)
+                conversion['converted_amount'] = None
+                if rate is None:
+                    conversion['error'] = transl['conversion_rate_not_found']
+                elif math.isinf(rate):
+                    conversion['error'] = transl['conversion_division_error']
+                else:
+                    conversion['error'] = transl['conversion_amount_too_large']
+            conversions.append(conversion)
+
+        return JsonResponse({
+            'version': rate_matrix.version,
+            'conversions': conversions,
+        })
+
+
+class ExchangeRatesStreamView(BaseView):
+    """
+    View to push exchange rate changes to the browser as server-sent events.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the live exchange rates stream.
+
+        Under ASGI the connection stays open: all clients share one
+        subscription to rate changes and receive a compact diff per change
+        and heartbeats in between. Under WSGI, where an open stream would
+        block a worker, one event is sent and the browser reconnects later.
+
+        Parameters:
+        request: User's request with the 'version' of the rates it has.
+
+        Returns:
+        StreamingHttpResponse: The 'text/event-stream' response.
+        """
+        client_version = request.GET.get('version', '')
+
+        if isinstance(request, ASGIRequest):
+            events = stream_rate_events(client_version)
+        else:
+            try:
+                rate_matrix = await get_rate_matrix()
+                events = [f"retry: {RATE_STREAM_RETRY * 1000}\n\n"]
+                if rate_matrix.version != client_version:
+                    events.append(format_rate_event(
+                        rate_matrix.version, {}, get_rate_rows(rate_matrix)
+                    ))
+            except APIError as e:
+                logger.error(f"Error fetching exchange rates: {str(e)}")
+                events = [f"retry: {RATE_STREAM_RETRY * 1000}\n\n"]
+
+        response = StreamingHttpResponse(
+            events, content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class ExchangeRateHistoryView(BaseView):
+    """
+    View to return the stored daily exchange rates as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the exchange rate history.
+
+        The history is read from the local rate store only, so it never
+        causes requests to the PrivatBank API.
+
+        Parameters:
+        request: User's request with optional 'currency' codes (repeated
+                 or comma-separated), a 'start' and 'end' date
+                 (YYYY-MM-DD) or a number of 'days' up to today
+                 (default 30), and a maximum number of 'points'
+                 (default 60).
+
+        Returns:
+        JsonResponse: The downsampled rates as columns per currency.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        currencies = [
+            currency.strip().upper()
+            for value in request.GET.getlist('currency')
+            for currency in value.split(',')
+            if currency.strip()
+        ] or ['USD', 'EUR', 'GBP', 'CHF', 'PLN', 'CZK']
+        currencies = list(dict.fromkeys(currencies))
+
+        try:
+            end = (
+                datetime.strptime(request.GET['end'], '%Y-%m-%d').date()
+                if 'end' in request.GET else get_kyiv_today()
+            )
+            if 'start' in request.GET:
+                start = datetime.strptime(
+                    request.GET['start'], '%Y-%m-%d'
+                ).date()
+            else:
+                # Bounded first, as timedelta overflows for huge values
+                days = int(request.GET.get('days', 30))
+                start = end - timedelta(days=days - 1) if (
+                    0 < days <= MAX_EXCHANGE_HISTORY_DAYS
+                ) else None
+            points = int(request.GET.get('points', 60))
+        except (ValueError, OverflowError):
+            # OverflowError: the range starts before the first date
+            start = end = None
+            points = 0
+        if not (
+            start and start <= end
+            and (end - start).days < MAX_EXCHANGE_HISTORY_DAYS
+            and 0 < points <= MAX_EXCHANGE_HISTORY_POINTS
+        ):
+            return JsonResponse(
+                {'error': transl['invalid_history_range']}, status=400
+            )
+
+        history = await sync_to_async(get_exchange_rate_history)(
+            currencies, start, end, points
+        )
+
+        return JsonResponse({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            **history,
+        })
+
+
 class NewsView(BaseView):
     """
     View to handle requests for displaying news articles by category.
@@ -447,17 +812,15 @@ class NewsView(BaseView):
         language = context['language']
         transl = context['translations']
 
-        # Get the country from the request or session
-        country = request.GET.get(
-            'country', await sync_to_async(request.session.get)(
-                'selected_country', 'us' if language == 'en' else 'ua'
+        # Get the country from the request or preferences
+        country = request.GET.get('country')
+        if country not in COUNTRIES:
+            country = get_preference(
+                request, 'selected_country', 'us' if language == 'en' else 'ua'
             )
-        )
 
-        # Update the session with the selected country
-        await sync_to_async(request.session.__setitem__)(
-            'selected_country', country
-        )
+        # Update the preferences with the selected country
+        set_preference(request, 'selected_country', country)
 
         displayed_country_name = (
             COUNTRIES_UA.get(country, 'Unknown') if language == 'uk'
@@ -468,29 +831,17 @@ class NewsView(BaseView):
             else COUNTRIES.get(country, 'Unknown')
         )
 
-        # Clear session news data for a country
-        news_session_key = f'news_data_{country}'
-        await sync_to_async(request.session.pop)(news_session_key, None)
-
-        # Download news
-        news_data = await sync_to_async(cache.get)(news_session_key)
-        if not news_data:
-            news_data = {}
+        articles = []
+        next_cursor = None
+        if category in CATEGORY_MAP:
             try:
-                for cat in CATEGORY_MAP.keys():
-                    articles = await fetch_news_by_category(
-                        cat, country, transl
-                    )
-                    news_data[cat] = articles
-                await sync_to_async(request.session.__setitem__)(
-                    news_session_key, news_data
+                articles, next_cursor = await get_news_page(
+                    category, country, transl
                 )
-            except APIError:
-                news_data = {cat: [] for cat in CATEGORY_MAP.keys()}
+            except APIError as e:
+                logger.error(f"Error fetching {category} news: {str(e)}")
                 context['error_message'] = transl['unable_to_fetch_news']
 
-        articles = news_data.get(category, [])
-
         category_titles = {
             'general': transl['general_title'],
             'business': transl['business_title'],
@@ -513,7 +864,227 @@ class NewsView(BaseView):
                 k: transl[k] for k in CATEGORY_MAP.keys()
             },
             'articles': articles,
+            'articles_hash': get_articles_hash(articles) if articles else '',
+            'next_cursor': next_cursor,
             'category_title': category_title
         })
 
         return render(request, 'newsapp/category_news.html', context)
+
+
+class NewsSearchView(BaseView):
+    """
+    View to search the headlines of all collected news as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for searching news headlines.
+
+        The search runs over the local news store for every country and
+        category, so it never causes requests to the NewsAPI.
+
+        Parameters:
+        request: User's request with the search query 'q', optional
+                 'country' and 'category' filters and a 'limit' of results
+                 (default 20).
+
+        Returns:
+        JsonResponse: The matching articles, newest first.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        query = request.GET.get('q', '').strip()
+        country = request.GET.get('country') or None
+        category = request.GET.get('category') or None
+        try:
+            limit = int(request.GET.get('limit', 20))
+        except ValueError:
+            limit = 0
+        if not query or not 0 < limit <= MAX_NEWS_SEARCH_RESULTS:
+            return JsonResponse(
+                {'error': transl['invalid_search_query']}, status=400
+            )
+
+        results = await sync_to_async(search_news)(
+            query, country, category, limit
+        )
+
+        return JsonResponse({'query': query, 'results': results})
+
+
+class NewsOverviewView(BaseView):
+    """
+    View to display the top general headlines of every country.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the news overview of all countries.
+
+        Parameters:
+        request: User's request object.
+
+        Returns:
+        HttpResponse: Rendered page with the headlines per country.
+        """
+        context = await self.get_common_context(request)
+        language = context['language']
+        transl = context['translations']
+
+        countries = COUNTRIES if language == 'en' else COUNTRIES_UA
+        overview = await get_news_overview(list(countries), transl)
+        for entry in overview:
+            entry['name'] = countries[entry['country']]
+
+        context.update({
+            'overview': overview,
+        })
+
+        return render(request, 'newsapp/news_overview.html', context)
+
+
+class NewsOverviewApiView(BaseView):
+    """
+    View to return the top general headlines of every country as JSON.
+    """
+
+    async def get(self, request):
+        """
+        Handles the GET request for the news overview of all countries.
+
+        Parameters:
+        request: User's request object.
+
+        Returns:
+        JsonResponse: Per country, its code, headlines and whether they
+                      are stale.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        overview = await get_news_overview(list(COUNTRIES), transl)
+        for entry in overview:
+            for article in entry['articles']:
+                article['published_at'] = format_time(
+                    article['published_at'], language
+                )
+                article.pop('thumbnail', None)
+
+        return JsonResponse({'countries': overview})
+
+
+class NewsPageView(BaseView):
+    """
+    View to return further pages of a news category as JSON.
+    """
+
+    async def get(self, request, category):
+        """
+        Handles the GET request for a page of news articles.
+
+        Pages are read from the news store; NewsAPI pages are only fetched
+        when a user scrolls past the stored articles.
+
+        Parameters:
+        request: User's request with an optional 'country' (defaults to the
+                 selected country) and the opaque 'cursor' returned with
+                 the previous page.
+        category (str): The news category.
+
+        Returns:
+        JsonResponse: The articles of the page and the cursor of the next
+                      page, which is null on the last page.
+        """
+        language = request.common_context['language']
+        transl = translations.get(language, translations['en'])
+
+        country = request.GET.get('country') or get_preference(
+            request, 'selected_country', 'us' if language == 'en' else 'ua'
+        )
+        cursor = request.GET.get('cursor')
+
+        if category not in CATEGORY_MAP or country not in COUNTRIES:
+            return JsonResponse(
+                {'error': transl['invalid_news_request']}, status=400
+            )
+
+        try:
+            after = decode_news_cursor(cursor) if cursor else None
+        except ValueError:
+            return JsonResponse(
+                {'error': transl['invalid_news_request']}, status=400
+            )
+
+        try:
+            articles, next_cursor = await get_news_page(
+                category, country, transl, after
+            )
+        except APIError as e:
+            logger.error(f"Error fetching {category} news: {str(e)}")
+            return JsonResponse(
+                {'error': transl['unable_to_fetch_news']}, status=502
+            )
+
+        for article in articles:
+            article['published_at'] = format_time(
+                article['published_at'], language
+            )
+            thumbnail = article.pop('thumbnail')
+            article['thumbnail_url'] = reverse(
+                'newsapp:news_thumbnail', args=[thumbnail]
+            ) if thumbnail else None
+
+        return JsonResponse({
+            'articles': articles,
+            'next_cursor': next_cursor,
+        })
+
+
+class NewsThumbnailView(View):
+    """
+    View to serve small thumbnails of the images of stored news articles.
+    """
+
+    async def get(self, request, url_hash):
+        """
+        Handles the GET request for the thumbnail of an article's image.
+
+        Only images of stored articles are served, so the view cannot be
+        used to proxy arbitrary URLs. The thumbnail is sent as WebP to
+        browsers that accept it and as JPEG otherwise.
+
+        Parameters:
+        request: User's request with an optional width 'w' (one of
+                 THUMBNAIL_WIDTHS, defaults to the smallest).
+        url_hash (str): The pool key of the article.
+
+        Returns:
+        HttpResponse: The thumbnail with long-lived cache headers, or a
+                      404 response if the article has no usable image.
+        """
+        try:
+            width = int(request.GET.get('w', THUMBNAIL_WIDTHS[0]))
+        except ValueError:
+            width = None
+        if width not in THUMBNAIL_WIDTHS:
+            return HttpResponseNotFound()
+
+        extension = (
+            'webp' if 'image/webp' in request.headers.get('Accept', '')
+            else 'jpg'
+        )
+        try:
+            content = await get_thumbnail(url_hash, width, extension)
+        except ThumbnailError:
+            return HttpResponseNotFound()
+
+        response = HttpResponse(
+            content, content_type=THUMBNAIL_FORMATS[extension][1]
+        )
+        patch_cache_control(
+            response, public=True, max_age=THUMBNAIL_MAX_AGE, immutable=True
+        )
+        patch_vary_headers(response, ['Accept'])
+        return response
@@ -70,8 +70,10 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'newsapp.middleware.PreferencesMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'newsapp.middleware.RequestContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -171,6 +173,10 @@ STATICFILES_DIRS = [
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Local disk cache of the resized news images and its size limit in bytes
+NEWS_THUMBNAIL_ROOT = BASE_DIR / 'thumbnails'
+NEWS_THUMBNAIL_CACHE_SIZE = 200 * 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -181,9 +187,35 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-    }
+        'OPTIONS': {
+            # The news article pool caches every article as its own entry
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Sessions need a cache shared by all worker processes: Redis when
+    # REDIS_URL is set (requires the redis package), otherwise files on
+    # the local disk, which all workers of one host share
+    'sessions': (
+        {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+        if os.getenv('REDIS_URL') else
+        {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'session_cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 100000,
+            },
+        }
+    ),
 }
 
+# Sessions are served from the cache and written to the database in the
+# background, see users.utils.session_store
+SESSION_ENGINE = 'users.utils.session_store'
+SESSION_CACHE_ALIAS = 'sessions'
+
 # Configuration for Cloudinary, a cloud storage service
 CLOUDINARY_STORAGE = {
     'CLOUD_NAME': os.getenv('CLOUDINARY_NAME'),
@@ -7,3 +7,6 @@ class UsersConfig(AppConfig):
 
     def ready(self):
         import users.signals
+        from users.utils.session_store import check_session_cache
+
+        check_session_cache()
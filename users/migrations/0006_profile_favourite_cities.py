@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_profile_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='favourite_cities',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
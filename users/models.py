@@ -10,6 +10,9 @@ from cloudinary.models import CloudinaryField
 from PIL import Image
 from io import BytesIO
 
+# Maximum number of favourite cities a user can save
+MAX_FAVOURITE_CITIES = 10
+
 
 class Profile(models.Model):
     """
@@ -27,6 +30,7 @@ class Profile(models.Model):
     :param bio: A short biography of the user, optional.
     :param avatar: The user's avatar image stored in Cloudinary,
                    with a default if none is provided.
+    :param favourite_cities: Names of the user's saved weather cities.
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     first_name = models.CharField(max_length=30, blank=True)
@@ -50,6 +54,7 @@ class Profile(models.Model):
         folder='nexussuiteapp/profile_images',
         blank=True,
     )
+    favourite_cities = models.JSONField(default=list, blank=True)
 
     def __str__(self):
         """
@@ -62,6 +67,52 @@ class Profile(models.Model):
         """
         return f"{self.user.username} ({self.first_name} {self.last_name})"
 
+    def has_favourite_city(self, city):
+        """
+        Check whether a city is among the user's favourite cities.
+
+        :param city: The city name, compared case-insensitively.
+        :type city: str
+        :return: True if the city is saved, otherwise False.
+        :rtype: bool
+        """
+        city = city.strip().lower()
+        return any(fav.lower() == city for fav in self.favourite_cities)
+
+    def add_favourite_city(self, city):
+        """
+        Add a city to the user's favourite cities and save the profile.
+
+        :param city: The city name to add.
+        :type city: str
+        :return: False if the favourites limit is reached, otherwise True.
+        :rtype: bool
+        """
+        city = city.strip()
+        if not city or self.has_favourite_city(city):
+            return True
+        if len(self.favourite_cities) >= MAX_FAVOURITE_CITIES:
+            return False
+        self.favourite_cities = self.favourite_cities + [city]
+        self.save(update_fields=['favourite_cities'])
+        return True
+
+    def remove_favourite_city(self, city):
+        """
+        Remove a city from the user's favourite cities and save the profile.
+
+        :param city: The city name to remove, compared case-insensitively.
+        :type city: str
+        :return: None
+        """
+        city = city.strip().lower()
+        favourites = [
+            fav for fav in self.favourite_cities if fav.lower() != city
+        ]
+        if favourites != self.favourite_cities:
+            self.favourite_cities = favourites
+            self.save(update_fields=['favourite_cities'])
+
     def save(self, *args, **kwargs):
         """
         Save the profile instance, handling avatar upload
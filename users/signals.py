@@ -1,5 +1,6 @@
 from django.db.models.signals import post_save
 from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
 from django.dispatch import receiver
 
 from .models import Profile
@@ -52,3 +53,27 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
         profile.last_name = instance.last_name
         instance.profile.email = instance.email
         profile.save()
+
+
+@receiver(user_logged_in)
+def persist_session_on_login(sender, request, user, **kwargs):
+    """
+    Writes the session of a user who just logged in to the database.
+
+    The write-behind session engine would otherwise only store the
+    authentication data at its next flush, so a restart in between
+    would log the user out again.
+
+    :param sender: The class of the user who logged in.
+    :type sender: type
+    :param request: The login request.
+    :type request: HttpRequest
+    :param user: The user who logged in.
+    :type user: User
+    :param kwargs: Arbitrary keyword arguments.
+    :type kwargs: dict
+    :return: None
+    """
+    persist = getattr(request.session, 'persist', None)
+    if persist is not None:
+        persist()
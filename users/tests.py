@@ -1,3 +1,191 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from unittest import mock
+
+from .models import MAX_FAVOURITE_CITIES
+from .utils import session_store
+from .utils.session_store import (
+    SessionStore, check_session_cache, flush_sessions
+)
+
+
+class SessionStoreTests(TestCase):
+    """
+    Changes to existing sessions are queued and written in batches,
+    while logins and deletions reach the database right away.
+    """
+
+    def setUp(self):
+        # Flush explicitly instead of from the background loop
+        patcher = mock.patch.object(session_store, 'ensure_session_flush')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        session_store._dirty.clear()
+        self.addCleanup(session_store._dirty.clear)
+
+    def create_session(self):
+        """
+        Create a session in the database.
+
+        :return: The session.
+        :rtype: SessionStore
+        """
+        session = SessionStore()
+        session['visits'] = 1
+        session.create()
+        self.addCleanup(session._cache.delete, session.cache_key)
+        return session
+
+    def stored_data(self, session_key):
+        """
+        Return the session data stored in the database.
+
+        :param session_key: The key of the session.
+        :type session_key: str
+        :return: The decoded session data.
+        :rtype: dict
+        """
+        session = Session.objects.get(session_key=session_key)
+        return session.get_decoded()
+
+    def test_change_is_queued_without_database_write(self):
+        session = self.create_session()
+        session['visits'] = 2
+        with self.assertNumQueries(0):
+            session.save()
+        self.assertIn(session.session_key, session_store._dirty)
+        self.assertEqual(self.stored_data(session.session_key)['visits'], 1)
+        self.assertEqual(SessionStore(session.session_key)['visits'], 2)
+
+    def test_flush_writes_queued_changes(self):
+        session = self.create_session()
+        session['visits'] = 2
+        session.save()
+        self.assertEqual(flush_sessions(), 1)
+        self.assertEqual(session_store._dirty, {})
+        self.assertEqual(self.stored_data(session.session_key)['visits'], 2)
+        self.assertEqual(flush_sessions(), 0)
+
+    def test_flush_writes_the_latest_cached_version(self):
+        session = self.create_session()
+        session['visits'] = 2
+        session.save()
+        # Another worker changes the session after this one queued it
+        session._cache.set(session.cache_key, {'visits': 3})
+        flush_sessions()
+        self.assertEqual(self.stored_data(session.session_key)['visits'], 3)
+
+    def test_evicted_session_is_loaded_from_the_queue(self):
+        session = self.create_session()
+        session['visits'] = 2
+        session.save()
+        session._cache.delete(session.cache_key)
+        self.assertEqual(SessionStore(session.session_key)['visits'], 2)
+
+    def test_delete_removes_the_queued_change(self):
+        session = self.create_session()
+        session['visits'] = 2
+        session.save()
+        SessionStore().delete(session.session_key)
+        self.assertEqual(session_store._dirty, {})
+        self.assertFalse(SessionStore().exists(session.session_key))
+        flush_sessions()
+        self.assertFalse(
+            Session.objects.filter(session_key=session.session_key).exists()
+        )
+
+    def test_login_persists_the_session(self):
+        user = User.objects.create_user('reader', password='secret-123')
+        self.assertTrue(
+            self.client.login(username='reader', password='secret-123')
+        )
+        session_key = self.client.session.session_key
+        self.addCleanup(SessionStore().delete, session_key)
+        self.assertEqual(
+            self.stored_data(session_key)['_auth_user_id'], str(user.pk)
+        )
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }, SESSION_CACHE_ALIAS='default')
+    def test_process_local_cache_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_session_cache()
+
+
+class FavouriteCityTests(TestCase):
+    """
+    Logged-in users can save up to MAX_FAVOURITE_CITIES distinct cities
+    and remove them again.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('reader', password='secret-123')
+        self.url = reverse('users:favourite_city')
+        self.client.force_login(self.user)
+
+    def post(self, city, remove=False):
+        """
+        Submit the favourite city form.
+
+        :param city: The city to add or remove.
+        :type city: str
+        :param remove: Whether the city is removed instead of added.
+        :type remove: bool
+        :return: The response of the view.
+        :rtype: HttpResponse
+        """
+        data = {'city': city}
+        if remove:
+            data['remove_favourite'] = '1'
+        return self.client.post(self.url, data)
+
+    def get_favourites(self):
+        """
+        Return the favourite cities stored for the user.
+
+        :return: The saved city names.
+        :rtype: list
+        """
+        self.user.profile.refresh_from_db()
+        return self.user.profile.favourite_cities
+
+    def test_add_and_remove(self):
+        response = self.post(' Kyiv ')
+        self.assertRedirects(
+            response, reverse('newsapp:weather'), fetch_redirect_response=False
+        )
+        self.post('Lviv')
+        self.assertEqual(self.get_favourites(), ['Kyiv', 'Lviv'])
+        self.post('KYIV', remove=True)
+        self.assertEqual(self.get_favourites(), ['Lviv'])
+
+    def test_duplicate_is_saved_once(self):
+        self.post('Kyiv')
+        self.post('kyiv')
+        self.assertEqual(self.get_favourites(), ['Kyiv'])
+
+    def test_limit_is_enforced(self):
+        for index in range(MAX_FAVOURITE_CITIES):
+            self.post(f'City {index}')
+        response = self.post('Kyiv')
+        self.assertEqual(len(self.get_favourites()), MAX_FAVOURITE_CITIES)
+        self.assertNotIn('Kyiv', self.get_favourites())
+        messages = [
+            str(message) for message in response.wsgi_request._messages
+        ]
+        self.assertIn(str(MAX_FAVOURITE_CITIES), messages[-1])
+
+    def test_anonymous_user_is_redirected_to_login(self):
+        self.client.logout()
+        response = self.client.post(self.url, {'city': 'Kyiv'})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(settings.LOGIN_URL))
+        self.assertEqual(self.get_favourites(), [])
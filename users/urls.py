@@ -8,6 +8,11 @@ urlpatterns = [
     path('login/', views.LoginUserView.as_view(), name='login'),
     path('logout/', views.LogoutUserView.as_view(), name='logout'),
     path('profile/', views.UpdateUserProfileView.as_view(), name='profile'),
+    path(
+        'favourites/',
+        views.FavouriteCityView.as_view(),
+        name='favourite_city'
+    ),
     # path(
     #     'password_reset/',
     #     views.CustomPasswordResetRequestView.as_view(),
@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore
+)
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError
+
+from asgiref.sync import sync_to_async
+import atexit
+import logging
+import threading
+
+from newsapp.utils.background import schedule_periodic
+
+logger = logging.getLogger(__name__)
+
+# Interval in seconds between two writes of the changed sessions
+SESSION_FLUSH_INTERVAL = 5
+
+# Maximum number of sessions written by one query
+SESSION_FLUSH_BATCH_SIZE = 500
+
+# Changed sessions that are not written to the database yet, by key
+_dirty = {}
+_dirty_lock = threading.Lock()
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cache-backed session engine with write-behind persistence.
+
+    Sessions are read from the cache and only loaded from the database
+    when they are missing there, as with the cached_db engine. Changes
+    to an existing session are written to the cache right away but
+    queued for the database, which receives all changed sessions in one
+    batch every SESSION_FLUSH_INTERVAL seconds and when the process
+    exits.
+
+    Creating and deleting a session, i.e. logging in, cycling the key
+    and logging out, still reach the database immediately, so a session
+    can never be resurrected or lost between two flushes.
+
+    The cache (SESSION_CACHE_ALIAS) must be shared by all worker
+    processes, so that a change or logout in one worker is seen by the
+    others; process-local caches are refused at startup, see
+    check_session_cache. The flush writes the shared cache's current
+    version of every queued session, so a worker never overwrites a
+    newer change of another worker with its own older one.
+    """
+
+    cache_key_prefix = 'users.session_store'
+
+    def load(self):
+        """
+        Load the session from the cache, falling back to changes that
+        are not flushed yet and then to the database when the cache
+        entry was evicted.
+
+        :return: The session data.
+        :rtype: dict
+        """
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            data = None
+        if data is not None:
+            return data
+
+        with _dirty_lock:
+            queued = _dirty.get(self.session_key)
+        if queued is not None:
+            return self.decode(queued.session_data)
+        return super().load()
+
+    def save(self, must_create=False):
+        """
+        Save the session to the cache and queue it for the database.
+
+        New sessions are created in the database right away, which
+        guarantees that their key is unique.
+
+        :param must_create: Whether the session must be a new one.
+        :type must_create: bool
+        """
+        if must_create or self.session_key is None:
+            super().save(must_create)
+            return
+
+        data = self._get_session()
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        with _dirty_lock:
+            _dirty[self.session_key] = Session(
+                session_key=self.session_key,
+                session_data=self.encode(data),
+                expire_date=self.get_expiry_date()
+            )
+        ensure_session_flush()
+
+    def persist(self):
+        """
+        Write the session to the database now instead of at the next
+        flush.
+        """
+        with _dirty_lock:
+            _dirty.pop(self.session_key, None)
+        super().save()
+
+    def delete(self, session_key=None):
+        """
+        Delete a session from the cache, the database and the flush queue.
+
+        :param session_key: The session to delete (default: this one).
+        :type session_key: str
+        """
+        with _dirty_lock:
+            _dirty.pop(session_key or self.session_key, None)
+        super().delete(session_key)
+
+
+def flush_sessions():
+    """
+    Write all queued session changes to the database in batches.
+
+    Each session is written in its current version from the shared
+    cache, which may include changes queued by other workers; the
+    queued version is only used if the cache entry was evicted. Sessions
+    deleted in the meantime are not recreated. If the database cannot
+    be reached, the changes stay queued for the next flush.
+
+    :return: Number of written sessions.
+    :rtype: int
+    """
+    global _dirty
+    with _dirty_lock:
+        sessions, _dirty = _dirty, {}
+    if not sessions:
+        return 0
+
+    store = SessionStore()
+    try:
+        cached = store._cache.get_many([
+            store.cache_key_prefix + session_key for session_key in sessions
+        ])
+    except Exception:
+        cached = {}
+    for session_key, session in sessions.items():
+        data = cached.get(store.cache_key_prefix + session_key)
+        if data is not None:
+            session.session_data = store.encode(data)
+
+    try:
+        Session.objects.bulk_update(
+            sessions.values(), ['session_data', 'expire_date'],
+            batch_size=SESSION_FLUSH_BATCH_SIZE
+        )
+    except DatabaseError as e:
+        logger.error(f"Error flushing {len(sessions)} sessions: {e}")
+        with _dirty_lock:
+            # Changes queued during the flush are newer than the failed ones
+            _dirty = {**sessions, **_dirty}
+        return 0
+    return len(sessions)
+
+
+async def _flush_sessions():
+    """Run the session flush from the background loop."""
+    await sync_to_async(flush_sessions)()
+
+
+def ensure_session_flush():
+    """
+    Start the periodic session flush of this process and flush the
+    remaining changes when the process exits.
+    """
+    if schedule_periodic(
+        'session_flush', _flush_sessions, SESSION_FLUSH_INTERVAL
+    ):
+        atexit.register(flush_sessions)
+
+
+def check_session_cache():
+    """
+    Refuse to run this engine with a cache that is local to one process.
+
+    With such a cache every worker would keep its own copy of a session,
+    so e.g. a logout handled by one worker would not end the session in
+    the others.
+
+    :raises ImproperlyConfigured: If this engine is used with a local
+                                  memory or dummy cache.
+    """
+    if settings.SESSION_ENGINE != __name__:
+        return
+    cache = caches[settings.SESSION_CACHE_ALIAS]
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        raise ImproperlyConfigured(
+            f"{__name__} needs a cache shared by all processes, but "
+            f"SESSION_CACHE_ALIAS '{settings.SESSION_CACHE_ALIAS}' uses "
+            f"{type(cache).__name__}."
+        )
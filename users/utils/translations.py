@@ -100,6 +100,9 @@ translations = {
         "password_reset_complete_message": "Your password has been successfully reset. You can now log in with your new password.",
         "email_send_error": "There was an error sending the password reset email. Please try again later.",
         "password_reset_no_account": "No account found with the provided credentials.",
+        "favourites_limit_reached": "You can save up to %(limit)s favourite cities.",
+        "favourite_added": "City added to favourites.",
+        "favourite_removed": "City removed from favourites.",
     },
     'uk': {
         "sign_up": "Зареєструватися",
@@ -202,5 +205,8 @@ translations = {
         "password_reset_complete_message": "Ваш пароль успішно скинуто. Тепер ви можете увійти з новим паролем.",
         "email_send_error": "Сталася помилка при відправці листа для скидання паролю. Спробуйте ще раз пізніше.",
         "password_reset_no_account": "Акаунт із вказаними даними не знайдено.",
+        "favourites_limit_reached": "Можна зберегти не більше %(limit)s улюблених міст.",
+        "favourite_added": "Місто додано до улюблених.",
+        "favourite_removed": "Місто видалено з улюблених.",
     }
 }
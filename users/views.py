@@ -3,16 +3,12 @@ from django.contrib import messages
 from django.contrib.auth import login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
-from django.utils import timezone
 from django.shortcuts import render, redirect
 
 from cloudinary.exceptions import Error as CloudinaryError
 
-import pytz
-
-from newsapp.utils.utils import (
-    get_translated_day_and_month, get_language, set_timezone
-)
+from newsapp.utils.utils import get_language, get_user_context
+from .models import MAX_FAVOURITE_CITIES
 from .utils.translations import translations
 
 from .forms import (
@@ -29,22 +25,10 @@ class BaseUserView(TemplateView):
     context for various views.
 
     Methods:
-    - get_user: Retrieve the user from the current request.
     - is_authenticated: Check if the user is authenticated.
     - get_common_context: Gather shared context data for rendering templates.
     """
 
-    def get_user(self, request):
-        """
-        Returns the user from the current request.
-
-        :param request: The user request.
-        :type request: HttpRequest
-        :return: The user from the request.
-        :rtype: User
-        """
-        return request.user
-
     def is_authenticated(self, request):
         """
         Checks if the user is authenticated.
@@ -56,66 +40,26 @@ class BaseUserView(TemplateView):
         """
         return request.user.is_authenticated
 
-    def get_avatar_url(self, user):
-        """
-        Retrieves the avatar URL for the user, if available.
-
-        :param user: The user object.
-        :type user: User
-        :return: The avatar URL or None if no avatar is set.
-        :rtype: Optional[str]
-        """
-        if (
-            user.is_authenticated
-                and hasattr(user, 'profile')
-                and user.profile.avatar
-        ):
-            return user.profile.avatar.url
-        return None
-
     def get_common_context(self, request):
         """
         Constructs shared context for all user views, including current time,
         date, and language-specific translations.
 
+        The shared data is resolved once per request by
+        RequestContextMiddleware; this adds the user and the users
+        translations.
+
         :param request: The user request.
         :type request: HttpRequest
         :return: A dictionary containing context data for the template.
         :rtype: dict
         """
-        language = get_language(request)
-        transl = translations.get(language, translations['en'])
-
-        set_timezone(request)
-
-        # Retrieve user timezone and current time
-        timezone_str = request.session.get('django_timezone', 'UTC')
-        user_timezone = pytz.timezone(timezone_str)
-        now = timezone.now().astimezone(user_timezone)
-
-        # Translate the date and time
-        translated_day, translated_month = get_translated_day_and_month(
-            now, language, 'full'
+        context = dict(request.common_context)
+        context.update(get_user_context(request))
+        context['translations'] = translations.get(
+            context['language'], translations['en']
         )
-        current_time = now.strftime('%H:%M')
-        current_date = (
-            f"{translated_day}, {now.day} {translated_month} {now.year}"
-        )
-
-        # Retrieve user's avatar URL
-        user = self.get_user(request)
-        avatar_url = self.get_avatar_url(request.user)
-
-        return {
-            'language': language,
-            'translations': transl,
-            'current_date': current_date,
-            'current_time': current_time,
-            'user_timezone': user_timezone,
-            'user': user,
-            'avatar_url': avatar_url,
-            'is_authenticated': self.is_authenticated(request),
-        }
+        return context
 
 
 class SignupUserView(BaseUserView):
@@ -318,7 +262,6 @@ class LogoutUserView(BaseUserView):
 
         # Display a success message after logout
         messages.success(request, transl['logout_success'])
-        request.session['language'] = language
 
         return redirect(self.success_url)
 
@@ -482,3 +425,49 @@ class UpdateUserProfileView(BaseUserView):
         )
 
         return render(request, self.template_name, context)
+
+
+class FavouriteCityView(BaseUserView):
+    """
+    Handles saving and removing the user's favourite weather cities.
+
+    Processes:
+    - POST: Adds the given city to the user's favourites, or removes it
+      when 'remove_favourite' is submitted.
+    """
+
+    success_url = 'newsapp:weather'
+
+    @method_decorator(login_required)
+    def post(self, request):
+        """
+        Handles POST request to add or remove a favourite city.
+
+        :param request: The user request with the 'city' to add or remove.
+        :type request: HttpRequest
+        :return: Redirects back to the weather page.
+        :rtype: HttpResponse
+        """
+        language = get_language(request)
+        transl = translations.get(language, translations['en'])
+
+        city = request.POST.get('city', '').strip()
+        profile = request.user.profile
+
+        if not city:
+            return redirect(self.success_url)
+
+        if "remove_favourite" in request.POST:
+            profile.remove_favourite_city(city)
+            messages.success(request, transl['favourite_removed'])
+        elif profile.add_favourite_city(city):
+            messages.success(request, transl['favourite_added'])
+        else:
+            messages.error(
+                request,
+                transl['favourites_limit_reached'] % {
+                    'limit': MAX_FAVOURITE_CITIES
+                }
+            )
+
+        return redirect(self.success_url)